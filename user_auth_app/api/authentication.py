@@ -0,0 +1,78 @@
+from datetime import timedelta
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+
+
+def get_token_cache_key(key):
+    return f'auth_credentials:{key}'
+
+
+def invalidate_cached_tokens(*keys):
+    cache.delete_many([get_token_cache_key(key) for key in keys])
+
+
+def invalidate_user_tokens(user_id):
+    invalidate_cached_tokens(*Token.objects.filter(user_id=user_id).values_list('key', flat=True))
+
+
+def is_token_expired(token):
+    lifetime = settings.AUTH_TOKEN_LIFETIME
+    return bool(lifetime) and timezone.now() - token.created > timedelta(seconds=lifetime)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    ``TokenAuthentication`` that keeps what it needs of a resolved token in
+    the cache for ``AUTH_TOKEN_CACHE_TIMEOUT`` seconds instead of joining
+    Token and User on every request. Only the user id, ``is_active`` and the
+    token's creation time are cached, never the user row with its password
+    hash. The entry is dropped when the token is deleted (logout, password
+    reset) or the user is saved (e.g. deactivated), see
+    ``user_auth_app.signals``. Tokens older than ``AUTH_TOKEN_LIFETIME``
+    seconds are rejected and deleted; 0 keeps them valid forever.
+    """
+
+    def get_cached_credentials(self, key):
+        """
+        The ``(user, token)`` of a valid cached token, or ``None``. Only reads
+        the cache, so async callers can run it off the database thread.
+        """
+        cached = cache.get(get_token_cache_key(key))
+        if cached is None:
+            return None
+        credentials = self.build_credentials(key, cached)
+        if not cached['is_active'] or is_token_expired(credentials[1]):
+            return None
+        return credentials
+
+    def build_credentials(self, key, cached):
+        """
+        A user and token from a cache entry. The user only has its id and
+        ``is_active`` loaded; other fields are read from the database on
+        first access.
+        """
+        user = get_user_model().from_db(None, ['id', 'is_active'], [cached['user_id'], cached['is_active']])
+        token = Token.from_db(None, ['key', 'user_id', 'created'], [key, cached['user_id'], cached['created']])
+        token.user = user
+        return user, token
+
+    def authenticate_credentials(self, key):
+        cache_key = get_token_cache_key(key)
+        cached = cache.get(cache_key)
+        if cached is None:
+            user, token = super().authenticate_credentials(key)
+            cached = {'user_id': user.id, 'is_active': user.is_active, 'created': token.created}
+            cache.set(cache_key, cached, settings.AUTH_TOKEN_CACHE_TIMEOUT)
+        else:
+            user, token = self.build_credentials(key, cached)
+            if not user.is_active:
+                raise AuthenticationFailed('User inactive or deleted.')
+        if is_token_expired(token):
+            Token.objects.filter(key=key).delete()
+            raise AuthenticationFailed('Token has expired.')
+        return user, token
@@ -1,7 +1,7 @@
 from rest_framework import serializers
-from django.contrib.auth import authenticate
 from rest_framework.authtoken.models import Token
 from django.contrib.auth.models import User
+from .authentication import is_token_expired
 
 
 class RegistrationSerializer(serializers.Serializer):
@@ -12,7 +12,7 @@ class RegistrationSerializer(serializers.Serializer):
         write_only=True, required=True, min_length=6)
 
     def validate_email(self, value):
-        if User.objects.filter(email=value).exists():
+        if User.objects.filter(email__iexact=value).exists():
             raise serializers.ValidationError(
                 "Diese E-Mail-Adresse wird bereits verwendet.")
         return value
@@ -34,23 +34,29 @@ class LoginSerializer(serializers.Serializer):
         if not email or not password:
             raise serializers.ValidationError(
                 {"detail": ["Benutzername und Passwort sind erforderlich."]})
-        try:
-            user = User.objects.get(email=email)
-            if not user.is_active:
-                raise serializers.ValidationError(
-                    {"detail": ["Bitte bestätige zuerst deine E-Mail-Adresse."]}
-                )
-            user = authenticate(username=user.username, password=password)
-        except User.DoesNotExist:
+        # One query for user and token; the lookup matches the UPPER(email)
+        # index of migration 0001.
+        user = User.objects.select_related('auth_token').filter(email__iexact=email).first()
+        if user is None:
+            # Hash anyway, so response times do not reveal unknown addresses.
+            User().set_password(password)
             raise serializers.ValidationError(
                 {"detail": ["Ungültige Anmeldeinformationen."]})
-        if user is None:
+        if not user.is_active:
+            raise serializers.ValidationError(
+                {"detail": ["Bitte bestätige zuerst deine E-Mail-Adresse."]}
+            )
+        if not user.check_password(password):
             raise serializers.ValidationError(
                 {"detail": ["Ungültige Anmeldeinformationen."]})
-        token, created = Token.objects.get_or_create(user=user)
+        token = getattr(user, 'auth_token', None)
+        if token is not None and is_token_expired(token):
+            token.delete()
+            token = None
+        if token is None:
+            token = Token.objects.create(user=user)
         return {
-            "token": token.key,  
+            "token": token.key,
             "user_id": user.id,
             "email": user.email
         }
-
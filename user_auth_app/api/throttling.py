@@ -0,0 +1,89 @@
+import hashlib
+import time
+import uuid
+from django_redis import get_redis_connection
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+THROTTLE_KEY = 'videoflix:throttle:{}:{}'
+
+
+class RedisSlidingWindowThrottle(SimpleRateThrottle):
+    """
+    Sliding window limit kept in a Redis sorted set of request timestamps,
+    so a burst cannot double the rate at a window boundary. The rate comes
+    from ``DEFAULT_THROTTLE_RATES['<view.throttle_scope>_<scope_suffix>']``;
+    views or scopes without a rate are not throttled. Rejected requests do
+    not count towards the limit.
+    """
+    scope_suffix = None
+
+    def __init__(self):
+        # The scope depends on the view, so the rate is resolved per request.
+        pass
+
+    def get_rate(self):
+        # Read at call time instead of the class attribute DRF binds at import.
+        return api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+
+    def get_ident_value(self, request):
+        raise NotImplementedError('.get_ident_value() must be overridden')
+
+    def get_cache_key(self, request, view):
+        ident = self.get_ident_value(request)
+        if ident is None:
+            return None
+        return THROTTLE_KEY.format(self.scope, ident)
+
+    def allow_request(self, request, view):
+        view_scope = getattr(view, 'throttle_scope', None)
+        if not view_scope:
+            return True
+        self.scope = f'{view_scope}_{self.scope_suffix}'
+        self.rate = self.get_rate()
+        if self.rate is None:
+            return True
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        connection = get_redis_connection('default')
+        self.now = time.time()
+        member = uuid.uuid4().hex
+        pipe = connection.pipeline()
+        pipe.zremrangebyscore(self.key, 0, self.now - self.duration)
+        pipe.zadd(self.key, {member: self.now})
+        pipe.zcard(self.key)
+        pipe.expire(self.key, self.duration)
+        count = pipe.execute()[2]
+        if count <= self.num_requests:
+            return True
+        connection.zrem(self.key, member)
+        oldest = connection.zrange(self.key, 0, 0, withscores=True)
+        self.oldest = oldest[0][1] if oldest else self.now
+        return False
+
+    def wait(self):
+        return max(self.oldest + self.duration - self.now, 0)
+
+
+class IPSlidingWindowThrottle(RedisSlidingWindowThrottle):
+    scope_suffix = 'ip'
+
+    def get_ident_value(self, request):
+        return self.get_ident(request)
+
+
+class EmailSlidingWindowThrottle(RedisSlidingWindowThrottle):
+    """
+    Limits attempts per target address, however many IPs they come from.
+    The address is hashed so no emails end up in Redis.
+    """
+    scope_suffix = 'email'
+
+    def get_ident_value(self, request):
+        email = request.data.get('email') if hasattr(request.data, 'get') else None
+        if not isinstance(email, str) or not email.strip():
+            return None
+        return hashlib.sha256(email.strip().lower().encode()).hexdigest()
@@ -1,6 +1,6 @@
 from django.template.loader import render_to_string
-from django.core.mail import send_mail
 from django.conf import settings
+from user_auth_app.tasks import queue_email
 
 
 def send_activation_email(user, activation_link, email, mail_subject="Confirm your email"):
@@ -9,17 +9,28 @@ def send_activation_email(user, activation_link, email, mail_subject="Confirm yo
         "activation_link": activation_link
     })
 
-    send_mail(
+    queue_email(
         subject=mail_subject,
-        message="",
-        from_email=settings.EMAIL_HOST_USER,
+        html_message=message,
         recipient_list=[email],
+        from_email=settings.EMAIL_HOST_USER,
+    )
+
+
+def send_password_reset_email(user, reset_link, email, mail_subject="Reset password"):
+    message = render_to_string("user_auth_app/password_reset_email.html", {
+        "user": user,
+        "reset_link": reset_link
+    })
+
+    queue_email(
+        subject=mail_subject,
         html_message=message,
-        fail_silently=False,
+        recipient_list=[email],
+        from_email="no-reply@videoflix.com",
     )
 
 
 def generate_activation_link(user):
     token = user.token
     return f"http://localhost:4200/login?activate={user.id}&token={token}"
-
@@ -1,23 +1,28 @@
 from django.contrib.auth.models import User
 from .serializers import RegistrationSerializer, LoginSerializer
 from rest_framework.views import APIView
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.authtoken.models import Token
 from rest_framework.response import Response
 from rest_framework import status
-from django.core.mail import send_mail
 from django.utils.http import urlsafe_base64_encode
 from django.utils.encoding import force_bytes
 from django.contrib.sites.shortcuts import get_current_site
 from django.urls import reverse
-from django.template.loader import render_to_string
 from django.contrib.auth.tokens import default_token_generator as token_generator
 from django.utils.http import urlsafe_base64_decode
 from django.shortcuts import get_object_or_404, redirect
-from user_auth_app.api.utils import send_activation_email, generate_activation_link
+from user_auth_app.api.throttling import EmailSlidingWindowThrottle, IPSlidingWindowThrottle
+from user_auth_app.api.utils import send_activation_email, send_password_reset_email, generate_activation_link
 
 
 class RegistrationView(APIView):
     permission_classes = [AllowAny]
+    # No authentication and throttles first: rejected requests cost no
+    # database query and no password hash.
+    authentication_classes = []
+    throttle_classes = [IPSlidingWindowThrottle, EmailSlidingWindowThrottle]
+    throttle_scope = 'registration'
 
     def post(self, request):
         serializer = RegistrationSerializer(data=request.data)
@@ -64,20 +69,30 @@ class ActivationView(APIView):
 
 class LoginView(APIView):
     permission_classes = [AllowAny]
+    authentication_classes = []
+    throttle_classes = [IPSlidingWindowThrottle, EmailSlidingWindowThrottle]
+    throttle_scope = 'login'
 
     def post(self, request):
         serializer = LoginSerializer(data=request.data)
         if serializer.is_valid():
-            email = serializer.validated_data["email"]
-            user = User.objects.get(email=email)
-            if not user.is_active:
-                return Response({"detail": "Please confirm your e-mail address first."}, status=status.HTTP_403_FORBIDDEN)
             return Response(serializer.validated_data, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+class LogoutView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        Token.objects.filter(user=request.user).delete()
+        return Response({"message": "Successfully logged out."}, status=status.HTTP_200_OK)
+
+
 class PasswordResetRequestView(APIView):
     permission_classes = [AllowAny]
+    authentication_classes = []
+    throttle_classes = [IPSlidingWindowThrottle, EmailSlidingWindowThrottle]
+    throttle_scope = 'password_reset'
 
     def post(self, request):
         email = request.data.get('email')
@@ -90,18 +105,7 @@ class PasswordResetRequestView(APIView):
             current_site = get_current_site(request).domain
             reset_link = f"http://localhost:4200/reset-password/{uid}/{token}/"
             mail_subject = "Reset password"
-            message = render_to_string("user_auth_app/password_reset_email.html", {
-                "user": user,
-                "reset_link": reset_link
-            })
-            send_mail(
-                subject=mail_subject,
-                message="",
-                from_email="no-reply@videoflix.com",
-                recipient_list=[email],
-                html_message=message,
-                fail_silently=False,
-            )
+            send_password_reset_email(user, reset_link, email, mail_subject)
         except User.DoesNotExist:
             pass
         return Response({"message": "A password reset email has been sent to the provided email address."}, status=status.HTTP_200_OK)
@@ -120,6 +124,8 @@ class PasswordResetConfirmView(APIView):
                     return Response({"message": "New password is required."}, status=status.HTTP_400_BAD_REQUEST)
                 user.set_password(new_password)
                 user.save()
+                # Log out every device that used the old password.
+                Token.objects.filter(user=user).delete()
                 return Response({"message": "Password successfully reset. You can log in now."}, status=status.HTTP_200_OK)
             else:
                 return Response({"message": "Invalid or expired link."}, status=status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,32 @@
+from django.db import migrations
+
+INDEX_NAME = 'auth_user_email_upper_idx'
+
+
+def create_email_index(apps, schema_editor):
+    # email__iexact compiles to UPPER("email"::text) = UPPER(%s) on
+    # PostgreSQL, which only an expression index can serve. auth_user belongs
+    # to django.contrib.auth, so the index cannot live in a model Meta.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {INDEX_NAME} ON auth_user (UPPER("email"::text))')
+
+
+def drop_email_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {INDEX_NAME}')
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_email_index, drop_email_index),
+    ]
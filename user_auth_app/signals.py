@@ -0,0 +1,16 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+from .api.authentication import invalidate_cached_tokens, invalidate_user_tokens
+
+
+@receiver(post_delete, sender=Token)
+def token_cache_invalidation_handler(sender, instance, **kwargs):
+    invalidate_cached_tokens(instance.key)
+
+
+@receiver(post_save, sender=User)
+def user_token_cache_invalidation_handler(sender, instance, created, **kwargs):
+    if not created:
+        invalidate_user_tokens(instance.id)
@@ -0,0 +1,147 @@
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+import json
+import logging
+import smtplib
+from datetime import timedelta
+import django_rq
+from django_redis import get_redis_connection
+from rq import Retry, get_current_job
+
+logger = logging.getLogger(__name__)
+
+# Rendered messages waiting for the next send_queued_emails run.
+MAIL_OUTBOX_KEY = 'videoflix:mail_outbox'
+# Set while a send_queued_emails job is queued, so a burst of registrations
+# enqueues one job instead of one per message.
+MAIL_SCHEDULED_KEY = 'videoflix:mail_scheduled'
+# A queued job that never runs must not block delivery forever.
+MAIL_SCHEDULED_TIMEOUT = 600
+
+
+def queue_email(subject, html_message, recipient_list, from_email=None):
+    """
+    Store a rendered message in the outbox and make sure a ``mail`` worker
+    picks it up. Nothing talks to the mail server inside the request.
+    """
+    connection = get_redis_connection('default')
+    connection.rpush(MAIL_OUTBOX_KEY, json.dumps({
+        'subject': subject,
+        'html_message': html_message,
+        'recipient_list': list(recipient_list),
+        'from_email': from_email,
+    }))
+    schedule_send(connection)
+
+
+def schedule_send(connection, delay=0):
+    """
+    Enqueue a ``send_queued_emails`` job that starts after ``delay`` seconds,
+    unless one is queued already.
+    """
+    if not connection.set(MAIL_SCHEDULED_KEY, 1, nx=True, ex=MAIL_SCHEDULED_TIMEOUT + delay):
+        return
+    queue = django_rq.get_queue('mail')
+    retry = Retry(max=len(settings.MAIL_RETRY_INTERVALS), interval=settings.MAIL_RETRY_INTERVALS)
+    if delay:
+        queue.enqueue_in(timedelta(seconds=delay), send_queued_emails, retry=retry)
+    else:
+        queue.enqueue(send_queued_emails, retry=retry)
+
+
+def is_retryable_error(error):
+    """
+    Whether sending may succeed later: connection errors and temporary (4xx)
+    replies such as relay rate limits. Permanent (5xx) rejections would fail
+    on every retry. SMTPException is an OSError as well, so it is excluded
+    from the socket errors explicitly.
+    """
+    if isinstance(error, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError)):
+        return True
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return any(400 <= code < 500 for code, _ in error.recipients.values())
+    return isinstance(error, OSError) and not isinstance(error, smtplib.SMTPException)
+
+
+def build_message(payload, connection):
+    data = json.loads(payload)
+    message = EmailMultiAlternatives(
+        subject=data['subject'],
+        body='',
+        from_email=data['from_email'],
+        to=data['recipient_list'],
+        connection=connection,
+    )
+    message.attach_alternative(data['html_message'], 'text/html')
+    return message
+
+
+def send_queued_emails():
+    """
+    Drain the outbox in batches of ``MAIL_BATCH_SIZE``, each sent with one
+    ``send_messages`` call over one SMTP connection. On a connection error or
+    a temporary rejection the unsent batches go back to the front of the
+    outbox and the job fails, so RQ retries it with backoff; once the retries
+    are used up, a new job is scheduled after the last retry interval, so the
+    outbox does not wait for the next queued email. Returns the number of
+    sent messages.
+    """
+    connection = get_redis_connection('default')
+    # Cleared before draining: a message queued from now on either gets
+    # popped below or schedules a new job.
+    connection.delete(MAIL_SCHEDULED_KEY)
+    try:
+        sent = drain_outbox(connection)
+    except Exception:
+        job = get_current_job()
+        if job is None or not job.retries_left:
+            intervals = settings.MAIL_RETRY_INTERVALS
+            schedule_send(connection, intervals[-1] if intervals else MAIL_SCHEDULED_TIMEOUT)
+        raise
+    logger.info(f"Sent {sent} queued emails")
+    return sent
+
+
+def drain_outbox(connection):
+    sent = 0
+    with get_connection(fail_silently=False) as mail_connection:
+        while True:
+            payloads = connection.lpop(MAIL_OUTBOX_KEY, settings.MAIL_BATCH_SIZE)
+            if not payloads:
+                break
+            try:
+                sent += mail_connection.send_messages(
+                    [build_message(payload, mail_connection) for payload in payloads])
+            except Exception as e:
+                if is_retryable_error(e):
+                    # Messages of the batch sent before the error go out
+                    # again on the retry.
+                    connection.lpush(MAIL_OUTBOX_KEY, *reversed(payloads))
+                    logger.exception(f"Sending email failed, {len(payloads)} messages requeued")
+                    raise
+                # The error does not say which message was rejected.
+                sent += send_individually(connection, mail_connection, payloads)
+    return sent
+
+
+def send_individually(connection, mail_connection, payloads):
+    """
+    Send a batch that was rejected permanently one message at a time, so
+    only the rejected messages are dropped.
+    """
+    sent = 0
+    for index, payload in enumerate(payloads):
+        try:
+            sent += mail_connection.send_messages([build_message(payload, mail_connection)])
+        except Exception as e:
+            if not is_retryable_error(e):
+                # Retrying cannot fix a permanently rejected message,
+                # and keeping it would block the outbox.
+                logger.error(f"Dropping email rejected by the mail server: {e!r}")
+                continue
+            connection.lpush(MAIL_OUTBOX_KEY, *reversed(payloads[index:]))
+            logger.exception(f"Sending email failed, {len(payloads) - index} messages requeued")
+            raise
+    return sent
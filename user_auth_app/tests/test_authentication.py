@@ -0,0 +1,98 @@
+from datetime import timedelta
+from django.contrib.auth.models import User
+from django.contrib.auth.tokens import default_token_generator
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIRequestFactory, APITestCase
+from user_auth_app.api.authentication import CachedTokenAuthentication, get_token_cache_key
+from user_auth_app.tests.utils import clear_throttles
+
+
+class CachedTokenAuthenticationTestCase(APITestCase):
+
+    def setUp(self):
+        """ Vorbereitungen für Tests """
+        clear_throttles()
+        self.user = User.objects.create_user(
+            username="testuser@example.com", email="testuser@example.com", password="password123")
+        self.token = Token.objects.create(user=self.user)
+        self.factory = APIRequestFactory()
+
+    def authenticate(self, key=None):
+        request = self.factory.get('/', HTTP_AUTHORIZATION=f"Token {key or self.token.key}")
+        return CachedTokenAuthentication().authenticate(request)
+
+    def test_cached_lookup(self):
+        """ Test, dass ein bekanntes Token ohne Datenbankabfrage aufgelöst wird """
+        with self.assertNumQueries(1):
+            user, token = self.authenticate()
+        with self.assertNumQueries(0):
+            cached_user, cached_token = self.authenticate()
+        self.assertEqual(cached_user, self.user)
+        self.assertEqual(cached_token.key, self.token.key)
+
+    def test_no_password_hash_cached(self):
+        """ Test, dass nur die für die Anmeldung nötigen Daten im Cache landen """
+        self.authenticate()
+        cached = cache.get(get_token_cache_key(self.token.key))
+        self.assertEqual(set(cached), {'user_id', 'is_active', 'created'})
+        self.assertNotIn(self.user.password, str(cached))
+        user, token = self.authenticate()
+        self.assertEqual(user.id, self.user.id)
+        with self.assertNumQueries(1):
+            self.assertEqual(user.email, self.user.email)
+
+    def test_invalid_token(self):
+        """ Test für ein ungültiges Token """
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate("invalid")
+
+    def test_logout_invalidates_token(self):
+        """ Test, dass das Token nach dem Logout nicht mehr gilt """
+        self.authenticate()
+        response = self.client.post(
+            reverse('logout'), HTTP_AUTHORIZATION=f"Token {self.token.key}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(Token.objects.filter(user=self.user).exists())
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_deactivation_invalidates_token(self):
+        """ Test, dass ein deaktivierter Benutzer nicht aus dem Cache angemeldet wird """
+        self.authenticate()
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_password_reset_invalidates_token(self):
+        """ Test, dass die Passwort-Zurücksetzung alle Tokens ungültig macht """
+        self.authenticate()
+        uid = urlsafe_base64_encode(force_bytes(self.user.pk))
+        reset_token = default_token_generator.make_token(self.user)
+        response = self.client.post(
+            reverse('password_reset_confirm', kwargs={'uid': uid, 'token': reset_token}),
+            {"password": "newpassword123"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    @override_settings(AUTH_TOKEN_LIFETIME=3600)
+    def test_expired_token(self):
+        """ Test, dass abgelaufene Tokens abgelehnt und beim Login ersetzt werden """
+        Token.objects.filter(key=self.token.key).update(created=timezone.now() - timedelta(hours=2))
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+        self.assertFalse(Token.objects.filter(key=self.token.key).exists())
+
+        response = self.client.post(reverse('login'), {
+            "email": "testuser@example.com", "password": "password123"}, format='json')
+        self.assertNotEqual(response.data['token'], self.token.key)
+        self.authenticate(response.data['token'])
@@ -0,0 +1,190 @@
+import json
+import smtplib
+from datetime import timedelta
+from unittest.mock import Mock, patch
+from django.core import mail
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.contrib.auth.models import User
+from django_redis import get_redis_connection
+from user_auth_app.tests.utils import clear_throttles
+from user_auth_app.tasks import (
+    MAIL_OUTBOX_KEY, MAIL_SCHEDULED_KEY, queue_email, send_queued_emails,
+)
+
+
+class MailQueueTestCase(TestCase):
+
+    def setUp(self):
+        """ Vorbereitungen für Tests """
+        self.connection = get_redis_connection('default')
+        self.connection.delete(MAIL_OUTBOX_KEY, MAIL_SCHEDULED_KEY)
+        clear_throttles()
+        patcher = patch('user_auth_app.tasks.django_rq.get_queue')
+        self.get_queue = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def queue(self, count):
+        for i in range(count):
+            queue_email(f"Subject {i}", f"<p>Mail {i}</p>", [f"user{i}@example.com"], "no-reply@videoflix.com")
+
+    def test_burst_enqueues_one_job(self):
+        """ Test, dass viele E-Mails nur einen Versand-Job auslösen """
+        self.queue(3)
+        self.assertEqual(self.connection.llen(MAIL_OUTBOX_KEY), 3)
+        self.get_queue.assert_called_once_with('mail')
+        self.assertEqual(self.get_queue.return_value.enqueue.call_count, 1)
+        self.assertEqual(mail.outbox, [])
+
+    def test_send_in_batches(self):
+        """ Test für den Versand in Batches über eine Verbindung """
+        self.queue(5)
+        send_messages = mail.get_connection().__class__.send_messages
+        batches = []
+
+        def record_send(backend, messages):
+            batches.append(len(messages))
+            return send_messages(backend, messages)
+
+        with override_settings(MAIL_BATCH_SIZE=2), \
+                patch('user_auth_app.tasks.get_connection', wraps=mail.get_connection) as get_connection, \
+                patch('django.core.mail.backends.locmem.EmailBackend.send_messages', record_send):
+            self.assertEqual(send_queued_emails(), 5)
+        get_connection.assert_called_once()
+        self.assertEqual(batches, [2, 2, 1])
+        self.assertEqual([message.subject for message in mail.outbox], [f"Subject {i}" for i in range(5)])
+        self.assertEqual(mail.outbox[0].alternatives[0][0], "<p>Mail 0</p>")
+        self.assertEqual(self.connection.llen(MAIL_OUTBOX_KEY), 0)
+        self.assertFalse(self.connection.exists(MAIL_SCHEDULED_KEY))
+
+    def test_failure_requeues_unsent(self):
+        """ Test, dass nicht versendete E-Mails bei einem Fehler zurückgelegt werden """
+        self.queue(3)
+        send_messages = mail.get_connection().__class__.send_messages
+        calls = []
+
+        def flaky_send(backend, messages):
+            calls.append(messages)
+            if len(calls) == 2:
+                raise smtplib.SMTPServerDisconnected("connection lost")
+            return send_messages(backend, messages)
+
+        with override_settings(MAIL_BATCH_SIZE=2), \
+                patch('django.core.mail.backends.locmem.EmailBackend.send_messages', flaky_send):
+            with self.assertRaises(smtplib.SMTPServerDisconnected):
+                send_queued_emails()
+        self.assertEqual(len(mail.outbox), 2)
+        remaining = [json.loads(payload)['subject'] for payload in self.connection.lrange(MAIL_OUTBOX_KEY, 0, -1)]
+        self.assertEqual(remaining, ["Subject 2"])
+
+        self.assertEqual(send_queued_emails(), 1)
+        self.assertEqual(len(mail.outbox), 3)
+
+    def test_refused_recipient_dropped(self):
+        """ Test, dass abgelehnte Empfänger den Versand nicht blockieren """
+        self.queue(2)
+        send_messages = mail.get_connection().__class__.send_messages
+
+        def refuse_first(backend, messages):
+            if any(message.to == ["user0@example.com"] for message in messages):
+                raise smtplib.SMTPRecipientsRefused({"user0@example.com": (550, b"unknown")})
+            return send_messages(backend, messages)
+
+        with patch('django.core.mail.backends.locmem.EmailBackend.send_messages', refuse_first):
+            self.assertEqual(send_queued_emails(), 1)
+        self.assertEqual(mail.outbox[0].to, ["user1@example.com"])
+        self.assertEqual(self.connection.llen(MAIL_OUTBOX_KEY), 0)
+
+    def test_rejected_message_dropped(self):
+        """ Test, dass eine abgelehnte E-Mail die Outbox nicht blockiert """
+        self.queue(3)
+        send_messages = mail.get_connection().__class__.send_messages
+
+        def reject_second(backend, messages):
+            if any(message.to == ["user1@example.com"] for message in messages):
+                raise smtplib.SMTPDataError(554, b"message rejected")
+            return send_messages(backend, messages)
+
+        with patch('django.core.mail.backends.locmem.EmailBackend.send_messages', reject_second):
+            self.assertEqual(send_queued_emails(), 2)
+        self.assertEqual([message.to for message in mail.outbox], [["user0@example.com"], ["user2@example.com"]])
+        self.assertEqual(self.connection.llen(MAIL_OUTBOX_KEY), 0)
+
+    def test_socket_error_requeues(self):
+        """ Test, dass Netzwerkfehler die E-Mails für einen neuen Versuch zurücklegen """
+        self.queue(2)
+        with patch('django.core.mail.backends.locmem.EmailBackend.send_messages',
+                   side_effect=ConnectionResetError("connection reset")):
+            with self.assertRaises(ConnectionResetError):
+                send_queued_emails()
+        self.assertEqual(self.connection.llen(MAIL_OUTBOX_KEY), 2)
+
+    def test_final_failure_schedules_send(self):
+        """ Test, dass nach dem letzten Versuch ein verzögerter Versand-Job eingeplant wird """
+        self.queue(2)
+        queue = self.get_queue.return_value
+        queue.reset_mock()
+        with override_settings(MAIL_RETRY_INTERVALS=[10, 60]), \
+                patch('user_auth_app.tasks.get_current_job', return_value=Mock(retries_left=0)), \
+                patch('django.core.mail.backends.locmem.EmailBackend.send_messages',
+                      side_effect=ConnectionResetError("connection reset")):
+            with self.assertRaises(ConnectionResetError):
+                send_queued_emails()
+        self.assertEqual(self.connection.llen(MAIL_OUTBOX_KEY), 2)
+        queue.enqueue_in.assert_called_once()
+        self.assertEqual(queue.enqueue_in.call_args.args[:2], (timedelta(seconds=60), send_queued_emails))
+        self.assertTrue(self.connection.exists(MAIL_SCHEDULED_KEY))
+
+        self.queue(1)
+        queue.enqueue.assert_not_called()
+
+    def test_retried_failure_not_rescheduled(self):
+        """ Test, dass vor dem letzten Versuch kein zusätzlicher Job eingeplant wird """
+        self.queue(2)
+        queue = self.get_queue.return_value
+        with patch('user_auth_app.tasks.get_current_job', return_value=Mock(retries_left=2)), \
+                patch('django.core.mail.backends.locmem.EmailBackend.send_messages',
+                      side_effect=ConnectionResetError("connection reset")):
+            with self.assertRaises(ConnectionResetError):
+                send_queued_emails()
+        queue.enqueue_in.assert_not_called()
+        self.assertFalse(self.connection.exists(MAIL_SCHEDULED_KEY))
+
+    def test_temporary_rejection_requeues(self):
+        """ Test, dass vorübergehende Ablehnungen (4xx) die E-Mails für einen neuen Versuch zurücklegen """
+        errors = [
+            smtplib.SMTPDataError(451, b"rate limit exceeded, try again later"),
+            smtplib.SMTPSenderRefused(421, b"too many messages", "no-reply@videoflix.com"),
+            smtplib.SMTPRecipientsRefused({"user0@example.com": (450, b"mailbox busy")}),
+        ]
+        for error in errors:
+            with self.subTest(error=type(error).__name__):
+                self.connection.delete(MAIL_OUTBOX_KEY)
+                self.queue(2)
+                with patch('django.core.mail.backends.locmem.EmailBackend.send_messages', side_effect=error):
+                    with self.assertRaises(type(error)):
+                        send_queued_emails()
+                self.assertEqual(self.connection.llen(MAIL_OUTBOX_KEY), 2)
+        self.assertEqual(mail.outbox, [])
+
+    def test_registration_queues_email(self):
+        """ Test, dass die Registrierung die E-Mail nicht selbst versendet """
+        response = self.client.post(reverse('registration'), {
+            "email": "testuser@example.com",
+            "password": "password123",
+            "repeated_password": "password123"
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(mail.outbox, [])
+        payload = json.loads(self.connection.lindex(MAIL_OUTBOX_KEY, 0))
+        self.assertEqual(payload['recipient_list'], ["testuser@example.com"])
+        self.assertIn("/api/activate/", payload['html_message'])
+
+    def test_password_reset_queues_email(self):
+        """ Test, dass die Passwort-Zurücksetzung die E-Mail über die Queue versendet """
+        User.objects.create_user(username="reset@example.com", email="reset@example.com", password="password123")
+        self.client.post(reverse('password_reset_request'), {"email": "reset@example.com"}, content_type='application/json')
+        send_queued_emails()
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].from_email, "no-reply@videoflix.com")
+        self.assertEqual(mail.outbox[0].to, ["reset@example.com"])
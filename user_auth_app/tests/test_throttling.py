@@ -0,0 +1,116 @@
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.urls import reverse
+from django_redis import get_redis_connection
+from rest_framework import status
+from rest_framework.settings import api_settings
+from rest_framework.test import APITestCase
+from user_auth_app.api.throttling import THROTTLE_KEY
+from user_auth_app.tests.utils import clear_throttles
+
+THROTTLE_RATES = {
+    'login_ip': '5/min',
+    'login_email': '2/min',
+    'registration_ip': '1/hour',
+    'password_reset_email': '1/hour',
+}
+
+
+@override_settings(REST_FRAMEWORK={**api_settings.user_settings, 'DEFAULT_THROTTLE_RATES': THROTTLE_RATES})
+class AuthThrottlingTestCase(APITestCase):
+
+    def setUp(self):
+        """ Vorbereitungen für Tests """
+        clear_throttles()
+        User.objects.create_user(
+            username="testuser@example.com", email="testuser@example.com", password="password123")
+
+    def login(self, email="testuser@example.com", ip="10.0.0.1"):
+        return self.client.post(reverse('login'), {
+            "email": email, "password": "wrongpassword"}, format='json', REMOTE_ADDR=ip)
+
+    def test_login_email_limit(self):
+        """ Test für das Limit pro E-Mail-Adresse über mehrere IPs """
+        self.assertEqual(self.login(ip="10.0.0.1").status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.login(ip="10.0.0.2").status_code, status.HTTP_400_BAD_REQUEST)
+        with self.assertNumQueries(0):
+            response = self.login(ip="10.0.0.3")
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', response)
+        self.assertEqual(self.login(email="other@example.com").status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_login_email_case_insensitive(self):
+        """ Test, dass das Limit pro E-Mail-Adresse die Schreibweise ignoriert """
+        self.login(email="testuser@example.com")
+        self.login(email="TestUser@Example.com")
+        response = self.login(email=" TESTUSER@example.com ")
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_login_ip_limit(self):
+        """ Test für das Limit pro IP über mehrere E-Mail-Adressen """
+        for i in range(5):
+            self.assertEqual(self.login(email=f"user{i}@example.com").status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.login(email="user5@example.com")
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(self.login(email="user5@example.com", ip="10.0.0.2").status_code,
+                         status.HTTP_400_BAD_REQUEST)
+
+    def test_spoofed_forwarded_for_ignored(self):
+        """ Test, dass ein gefälschter X-Forwarded-For-Header das Limit pro IP nicht umgeht """
+        for i in range(5):
+            self.client.post(reverse('login'), {"email": f"user{i}@example.com", "password": "wrongpassword"},
+                             format='json', REMOTE_ADDR="10.0.0.1", HTTP_X_FORWARDED_FOR=f"192.0.2.{i}")
+        response = self.client.post(reverse('login'), {"email": "user5@example.com", "password": "wrongpassword"},
+                                    format='json', REMOTE_ADDR="10.0.0.1", HTTP_X_FORWARDED_FOR="192.0.2.99")
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    @override_settings(REST_FRAMEWORK={
+        **api_settings.user_settings, 'DEFAULT_THROTTLE_RATES': THROTTLE_RATES, 'NUM_PROXIES': 1})
+    def test_spoofed_forwarded_for_behind_proxy(self):
+        """ Test, dass hinter einem Proxy gefälschte X-Forwarded-For-Werte ein gemeinsames Limit teilen """
+        for i in range(5):
+            response = self.client.post(
+                reverse('login'), {"email": f"user{i}@example.com", "password": "wrongpassword"}, format='json',
+                REMOTE_ADDR="127.0.0.1", HTTP_X_FORWARDED_FOR=f"192.0.2.{i}, 10.0.0.1")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(
+            reverse('login'), {"email": "user5@example.com", "password": "wrongpassword"}, format='json',
+            REMOTE_ADDR="127.0.0.1", HTTP_X_FORWARDED_FOR="192.0.2.99, 10.0.0.1")
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        response = self.client.post(
+            reverse('login'), {"email": "user5@example.com", "password": "wrongpassword"}, format='json',
+            REMOTE_ADDR="127.0.0.1", HTTP_X_FORWARDED_FOR="192.0.2.99, 10.0.0.2")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_rejected_requests_not_counted(self):
+        """ Test, dass abgelehnte Anfragen das Fenster nicht verlängern """
+        for i in range(4):
+            self.login()
+        key = THROTTLE_KEY.format('login_email', '*')
+        connection = get_redis_connection('default')
+        self.assertEqual(connection.zcard(next(connection.scan_iter(key))), 2)
+
+    def test_registration_ip_limit(self):
+        """ Test für das Limit der Registrierung pro IP """
+        data = {"email": "new@example.com", "password": "password123", "repeated_password": "password123"}
+        self.assertEqual(self.client.post(reverse('registration'), data, format='json').status_code,
+                         status.HTTP_201_CREATED)
+        data["email"] = "new2@example.com"
+        response = self.client.post(reverse('registration'), data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertFalse(User.objects.filter(email="new2@example.com").exists())
+
+    def test_password_reset_email_limit(self):
+        """ Test für das Limit der Passwort-Zurücksetzung pro E-Mail-Adresse """
+        url = reverse('password_reset_request')
+        self.assertEqual(self.client.post(url, {"email": "testuser@example.com"}, format='json').status_code,
+                         status.HTTP_200_OK)
+        response = self.client.post(url, {"email": "testuser@example.com"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_unconfigured_scope(self):
+        """ Test, dass Bereiche ohne Rate nicht begrenzt werden """
+        url = reverse('password_reset_request')
+        for i in range(3):
+            response = self.client.post(url, {"email": f"user{i}@example.com"}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
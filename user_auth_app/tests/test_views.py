@@ -3,12 +3,14 @@ from rest_framework.test import APITestCase
 from rest_framework import status
 from django.contrib.auth.models import User
 from rest_framework.authtoken.models import Token
+from user_auth_app.tests.utils import clear_throttles
 
 
 class RegistrationViewTestCase(APITestCase):
 
     def setUp(self):
         """ Vorbereitungen für Tests """
+        clear_throttles()
         self.url = reverse('registration')
 
     def test_successful_registration(self):
@@ -96,3 +98,58 @@ class RegistrationViewTestCase(APITestCase):
         response = self.client.post(self.url, data, format='json')
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn('password', response.data)
+
+
+class LoginViewTestCase(APITestCase):
+
+    def setUp(self):
+        """ Vorbereitungen für Tests """
+        clear_throttles()
+        self.url = reverse('login')
+        self.user = User.objects.create_user(
+            username="testuser@example.com", email="testuser@example.com", password="password123")
+
+    def login(self, email="testuser@example.com", password="password123"):
+        return self.client.post(self.url, {"email": email, "password": password}, format='json')
+
+    def test_successful_login(self):
+        """ Test für einen erfolgreichen Login """
+        response = self.login()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['token'], Token.objects.get(user=self.user).key)
+        self.assertEqual(response.data['user_id'], self.user.id)
+        self.assertEqual(response.data['email'], "testuser@example.com")
+
+    def test_login_query_count(self):
+        """ Test für die Anzahl der Datenbankabfragen beim Login """
+        with self.assertNumQueries(2):
+            first = self.login()
+        with self.assertNumQueries(1):
+            second = self.login()
+        self.assertEqual(first.data['token'], second.data['token'])
+
+    def test_email_case_insensitive(self):
+        """ Test, dass die Groß- und Kleinschreibung der E-Mail-Adresse egal ist """
+        response = self.login(email="TestUser@Example.com")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['user_id'], self.user.id)
+
+    def test_wrong_password(self):
+        """ Test für ein falsches Passwort """
+        response = self.login(password="wrongpassword")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Token.objects.exists())
+
+    def test_unknown_email(self):
+        """ Test für eine unbekannte E-Mail-Adresse """
+        response = self.login(email="unknown@example.com")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_inactive_user(self):
+        """ Test für einen noch nicht aktivierten Benutzer """
+        self.user.is_active = False
+        self.user.save()
+        response = self.login()
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.data['detail'][0], "Bitte bestätige zuerst deine E-Mail-Adresse.")
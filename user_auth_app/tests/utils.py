@@ -0,0 +1,9 @@
+from django_redis import get_redis_connection
+from user_auth_app.api.throttling import THROTTLE_KEY
+
+
+def clear_throttles():
+    """Remove all throttle windows between tests."""
+    connection = get_redis_connection('default')
+    for key in connection.scan_iter(THROTTLE_KEY.format('*', '*')):
+        connection.delete(key)
@@ -1,15 +1,38 @@
 from django.contrib import admin
-from video_app.models import UserVideoProgress, Video
+from video_app.models import UploadSession, UserVideoProgress, Video, VideoSource
+
+
+class VideoSourceInline(admin.TabularInline):
+    model = VideoSource
+    extra = 0
 
 
 class VideoAdmin(admin.ModelAdmin):
     list_display = ('title', 'description', 'video_file',
-                    'category', 'created_at')
-    list_filter = ('category', 'created_at')
+                    'category', 'processing_status', 'created_at')
+    list_filter = ('category', 'processing_status', 'created_at')
     search_fields = ('title', 'description', 'category')
     ordering = ('-created_at',)
+    inlines = [VideoSourceInline]
 
 
 admin.site.register(Video, VideoAdmin)
 
-admin.site.register(UserVideoProgress)
+
+class UserVideoProgressAdmin(admin.ModelAdmin):
+    list_display = ('user', 'video', 'last_viewed_position', 'viewed', 'last_viewed_at')
+    list_filter = ('viewed',)
+    list_select_related = ('user', 'video')
+    search_fields = ('user__username', 'video__title')
+    ordering = ('-last_viewed_at',)
+
+
+admin.site.register(UserVideoProgress, UserVideoProgressAdmin)
+
+
+class UploadSessionAdmin(admin.ModelAdmin):
+    list_display = ('filename', 'user', 'offset', 'size', 'status', 'video', 'created_at')
+    ordering = ('-created_at',)
+
+
+admin.site.register(UploadSession, UploadSessionAdmin)
@@ -1,21 +1,34 @@
+from django.conf import settings
 from rest_framework import serializers
-from video_app.models import Video, UserVideoProgress
+from video_app.models import Video, UserVideoProgress, UploadSession
+from video_app.serializers import MediaModelSerializer, SparseFieldsMixin, VideoCompactSerializer, VideoSourcesField
 from rest_framework import generics
 from django.contrib.auth.models import User
 from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
 
 
-class VideoSerializer(serializers.ModelSerializer):
+class VideoSerializer(SparseFieldsMixin, MediaModelSerializer):
+    sources = VideoSourcesField()
+
     class Meta:
         model = Video
-        fields = '__all__'
+        # Listed explicitly so internal fields (probe metadata, source hash,
+        # processing errors) never show up in the public catalogue.
+        fields = ['id', 'title', 'description', 'video_file',
+                  'thumbnail', 'thumbnail_320', 'thumbnail_640', 'thumbnail_webp',
+                  'category', 'created_at',
+                  'video_120p', 'video_360p', 'video_720p', 'video_1080p',
+                  'hls_playlist', 'dash_manifest', 'trickplay_vtt', 'duration',
+                  'processing_status', 'sources']
 
-        read_only_fields = ['thumbnail',
-                            'video_120p', 'video_360p', 'video_720p', 'video_1080p']
+        read_only_fields = ['thumbnail', 'thumbnail_320', 'thumbnail_640', 'thumbnail_webp',
+                            'video_120p', 'video_360p', 'video_720p', 'video_1080p',
+                            'hls_playlist', 'dash_manifest', 'trickplay_vtt', 'duration',
+                            'processing_status']
 
 
-class UserVideoProgressSerializer(serializers.ModelSerializer):
+class UserVideoProgressSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     user = serializers.PrimaryKeyRelatedField(read_only=True)
     permission_classes = [IsAuthenticated]
 
@@ -25,3 +38,39 @@ class UserVideoProgressSerializer(serializers.ModelSerializer):
                   'last_viewed_position', 'viewed', 'last_viewed_at']
 
 
+class ContinueWatchingSerializer(serializers.ModelSerializer):
+    video = VideoCompactSerializer(read_only=True)
+
+    class Meta:
+        model = UserVideoProgress
+        fields = ['id', 'video', 'last_viewed_position', 'last_viewed_at']
+
+
+class ProgressHeartbeatSerializer(serializers.Serializer):
+    video = serializers.IntegerField(min_value=1)
+    last_viewed_position = serializers.FloatField(min_value=0)
+    # Optional; a heartbeat without it leaves the stored flag alone.
+    viewed = serializers.BooleanField(required=False, allow_null=True)
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = UploadSession
+        fields = ['id', 'title', 'description', 'category', 'filename',
+                  'size', 'offset', 'checksum', 'status', 'error', 'video', 'created_at']
+        read_only_fields = ['offset', 'status', 'error', 'video', 'created_at']
+
+    def validate_size(self, value):
+        if value <= 0:
+            raise serializers.ValidationError("Size must be greater than zero.")
+        if value > settings.VIDEO_MAX_SIZE:
+            raise serializers.ValidationError(
+                f"Size must not exceed {settings.VIDEO_MAX_SIZE} bytes.")
+        return value
+
+    def validate_checksum(self, value):
+        value = value.lower()
+        if len(value) != 64 or any(char not in '0123456789abcdef' for char in value):
+            raise serializers.ValidationError(
+                "Checksum must be a hex encoded SHA-256 digest.")
+        return value
@@ -1,13 +1,24 @@
 from django.urls import path
-from .views import VideoListView, VideoDetailView, UserVideoProgressListView, UserVideoProgressDetailView
+from .views import VideoListView, VideoDetailView, VideoStatusView, UserVideoProgressListView, UserVideoProgressDetailView, ContinueWatchingView, ProgressHeartbeatView, UploadSessionCreateView, UploadSessionDetailView, UploadSessionFinalizeView
 
 
 urlpatterns = [
     path('videos/', VideoListView.as_view(), name='video-list'),
     path('videos/<int:pk>/', VideoDetailView.as_view(),
          name='video-detail'),
+    path('videos/<int:pk>/status/', VideoStatusView.as_view(),
+         name='video-status'),
     path('progress/', UserVideoProgressListView.as_view(), name='progress-list'),
     path('progress/<int:pk>/', UserVideoProgressDetailView.as_view(),
          name='progress-detail'),
+    path('progress/continue-watching/', ContinueWatchingView.as_view(),
+         name='continue-watching'),
+    path('progress/heartbeat/', ProgressHeartbeatView.as_view(),
+         name='progress-heartbeat'),
+    path('uploads/', UploadSessionCreateView.as_view(), name='upload-list'),
+    path('uploads/<uuid:pk>/', UploadSessionDetailView.as_view(),
+         name='upload-detail'),
+    path('uploads/<uuid:pk>/finalize/', UploadSessionFinalizeView.as_view(),
+         name='upload-finalize'),
 
 ]
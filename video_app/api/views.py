@@ -1,11 +1,19 @@
 
+import os
 from django.conf import settings
+from django.core.cache import cache
 from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.db.models import F
+from django.urls import reverse
+from django.utils import timezone
 from rest_framework import generics
-from .serializers import UserVideoProgressSerializer, VideoSerializer
-from video_app.models import Video, UserVideoProgress
-from django.views.decorators.cache import cache_page
-from django.utils.decorators import method_decorator
+from .serializers import ContinueWatchingSerializer, ProgressHeartbeatSerializer, UploadSessionSerializer, UserVideoProgressSerializer, VideoSerializer
+from .pagination import VideoCursorPagination
+from video_app.cache import get_catalogue_cache_key, get_continue_watching_cache_key
+from video_app.models import Video, UserVideoProgress, UploadSession
+from video_app.progress import buffer_progress
+from video_app.status import get_processing_status
+from video_app.tasks import finalize_upload, get_video_queue
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from rest_framework.response import Response
@@ -15,18 +23,55 @@ from django.core.exceptions import PermissionDenied
 
 CACHE_TTL = getattr(settings, 'CACHE_TTL', DEFAULT_TIMEOUT)
 
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+CONTINUE_WATCHING_LIMIT = 20
+
 
 
 class VideoListView(generics.ListCreateAPIView):
-    queryset = Video.objects.all().order_by('-created_at')
     serializer_class = VideoSerializer
+    pagination_class = VideoCursorPagination
+
+    def get_queryset(self):
+        queryset = Video.objects.prefetch_related('sources')
+        category = self.request.query_params.get('category')
+        if category:
+            queryset = queryset.filter(category=category)
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        cache_key = get_catalogue_cache_key(request)
+        data = cache.get(cache_key)
+        if data is not None:
+            return Response(data)
+        response = super().list(request, *args, **kwargs)
+        cache.set(cache_key, response.data, CACHE_TTL)
+        return response
+
+    def perform_create(self, serializer):
+        video_file = serializer.validated_data['video_file']
+        serializer.save(source_sha256=getattr(video_file, 'sha256', ''))
 
 
 class VideoDetailView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Video.objects.all()
+    queryset = Video.objects.prefetch_related('sources')
     serializer_class = VideoSerializer
 
 
+class VideoStatusView(APIView):
+    """
+    Lightweight processing state for polling clients. Running pipelines are
+    answered from Redis, finished ones with a single-column query.
+    """
+
+    def get(self, request, pk):
+        data = get_processing_status(pk)
+        if data is None:
+            return Response(status=status.HTTP_404_NOT_FOUND)
+        return Response(data)
+
+
 class UserVideoProgressListView(generics.ListCreateAPIView):
     serializer_class = UserVideoProgressSerializer
     permission_classes = [IsAuthenticated]
@@ -61,7 +106,157 @@ class UserVideoProgressDetailView(generics.RetrieveUpdateDestroyAPIView):
         return UserVideoProgress.objects.filter(user=self.request.user)
 
     def perform_update(self, serializer):
-        if serializer.instance.user != self.request.user:
+        if serializer.instance.user_id != self.request.user.id:
             raise PermissionDenied(
                 "You can only update your own progress.")
         serializer.save()
+
+
+class ContinueWatchingView(APIView):
+    """
+    The user's most recently watched, unfinished videos. Cached per user and
+    invalidated whenever one of their progress rows is written.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        cache_key = get_continue_watching_cache_key(request.user.id)
+        base_url = request.build_absolute_uri('/')
+        cached = cache.get(cache_key)
+        if cached is not None and cached['base_url'] == base_url:
+            return Response(cached['data'])
+
+        queryset = UserVideoProgress.objects.filter(
+            user=request.user, viewed=False, last_viewed_position__gt=0
+        ).select_related('video').order_by('-last_viewed_at')[:CONTINUE_WATCHING_LIMIT]
+        data = ContinueWatchingSerializer(
+            queryset, many=True, context={'request': request}).data
+        cache.set(cache_key, {'base_url': base_url, 'data': data}, CACHE_TTL)
+        return Response(data)
+
+
+class ProgressHeartbeatView(APIView):
+    """
+    High-frequency progress updates from players. Heartbeats are buffered in
+    Redis and written to the database in batches by ``flush_progress``.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = ProgressHeartbeatSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        buffer_progress(
+            request.user.id,
+            serializer.validated_data['video'],
+            serializer.validated_data['last_viewed_position'],
+            serializer.validated_data.get('viewed'),
+        )
+        return Response(status=status.HTTP_202_ACCEPTED)
+
+
+class UploadSessionCreateView(generics.CreateAPIView):
+    serializer_class = UploadSessionSerializer
+    permission_classes = [IsAuthenticated]
+
+    def perform_create(self, serializer):
+        session = serializer.save(user=self.request.user)
+        os.makedirs(os.path.dirname(session.temp_path), exist_ok=True)
+        open(session.temp_path, 'wb').close()
+
+    def create(self, request, *args, **kwargs):
+        response = super().create(request, *args, **kwargs)
+        response['Location'] = reverse(
+            'upload-detail', kwargs={'pk': response.data['id']})
+        response['Upload-Offset'] = 0
+        return response
+
+
+class UploadSessionDetailView(APIView):
+    """
+    ``HEAD``/``GET`` report how many bytes were received, ``PATCH`` appends the
+    request body at ``Upload-Offset``. The body is streamed to disk in chunks
+    and never loaded into memory as a whole. ``GET`` also reports the status
+    of a finalized upload and its video.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get_object(self, **filters):
+        return get_object_or_404(
+            UploadSession, pk=self.kwargs['pk'], user=self.request.user, **filters)
+
+    def get(self, request, pk):
+        session = self.get_object()
+        response = Response(UploadSessionSerializer(session).data)
+        response['Upload-Offset'] = session.offset
+        return response
+
+    def head(self, request, pk):
+        response = Response()
+        response['Upload-Offset'] = self.get_object(status='uploading').offset
+        return response
+
+    def patch(self, request, pk):
+        session = self.get_object(status='uploading')
+        try:
+            offset = int(request.headers.get('Upload-Offset', ''))
+        except ValueError:
+            return Response({"detail": "Upload-Offset header is required."}, status=status.HTTP_400_BAD_REQUEST)
+        if offset != session.offset:
+            return Response({"detail": "Upload-Offset does not match the received bytes.", "offset": session.offset}, status=status.HTTP_409_CONFLICT)
+        try:
+            length = int(request.headers.get('Content-Length') or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            return Response({"detail": "Content-Length header is invalid."}, status=status.HTTP_400_BAD_REQUEST)
+        if offset + length > session.size:
+            return Response({"detail": "Chunk exceeds the announced upload size."}, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+        received = 0
+        stream = request.stream
+        with open(session.temp_path, 'r+b') as f:
+            f.seek(offset)
+            while stream is not None and received < length:
+                chunk = stream.read(min(UPLOAD_CHUNK_SIZE, length - received))
+                if not chunk:
+                    break
+                f.write(chunk)
+                received += len(chunk)
+            f.truncate()
+
+        updated = UploadSession.objects.filter(
+            pk=session.pk, offset=offset, status='uploading',
+        ).update(offset=offset + received, updated_at=timezone.now())
+        if not updated:
+            return Response({"detail": "Upload was modified concurrently."}, status=status.HTTP_409_CONFLICT)
+        response = Response(status=status.HTTP_204_NO_CONTENT)
+        response['Upload-Offset'] = offset + received
+        return response
+
+
+class UploadSessionFinalizeView(APIView):
+    """
+    Hand a complete upload to a worker, which verifies the checksum and
+    creates the video. Clients poll the session until its status is
+    ``complete`` or ``failed``.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, pk):
+        session = get_object_or_404(UploadSession, pk=pk, user=request.user)
+        # Conditional UPDATE, so concurrent finalize calls enqueue one job.
+        claimed = UploadSession.objects.filter(
+            pk=session.pk, status='uploading', offset=F('size'),
+        ).update(status='verifying', updated_at=timezone.now())
+        if not claimed:
+            session.refresh_from_db()
+            if session.status != 'uploading':
+                return Response({"detail": "Upload is already finalized.", "status": session.status}, status=status.HTTP_409_CONFLICT)
+            return Response({"detail": "Upload is incomplete.", "offset": session.offset}, status=status.HTTP_409_CONFLICT)
+
+        get_video_queue('upload').enqueue(
+            finalize_upload, str(session.pk), job_timeout=settings.VIDEO_JOB_TIMEOUT)
+        session.refresh_from_db()
+        response = Response(UploadSessionSerializer(session).data, status=status.HTTP_202_ACCEPTED)
+        response['Location'] = reverse('upload-detail', kwargs={'pk': session.pk})
+        return response
@@ -0,0 +1,8 @@
+from django.urls import path
+from .async_views import progress_heartbeat_async, serve_media_async, video_status_stream
+
+urlpatterns = [
+    path('media/<path:path>', serve_media_async, name='stream-media'),
+    path('api/progress/heartbeat/', progress_heartbeat_async, name='stream-progress-heartbeat'),
+    path('api/videos/<int:pk>/status/', video_status_stream, name='stream-video-status'),
+]
@@ -0,0 +1,167 @@
+"""
+Async views for long-lived connections: media streaming, progress
+heartbeats and the processing status stream. They are routed under
+``/stream/`` and meant to be served by an ASGI server (``videoflix.asgi``
+with uvicorn), next to the WSGI app for the rest of the site.
+"""
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST, require_safe
+from rest_framework.authentication import get_authorization_header
+from rest_framework.exceptions import AuthenticationFailed
+from user_auth_app.api.authentication import CachedTokenAuthentication
+from .api.serializers import ProgressHeartbeatSerializer
+from .progress import buffer_progress
+from .status import FAILED, READY, get_live_processing_status, get_processing_status
+from .streaming import build_media_response
+
+STREAM_CHUNK_SIZE = 256 * 1024
+
+STATUS_POLL_SECONDS = 1
+STATUS_KEEPALIVE_SECONDS = 15
+# EventSource clients reconnect on their own once the stream ends.
+STATUS_STREAM_MAX_SECONDS = 600
+
+# sync_to_async calls share one thread per process by default, so every
+# poll and heartbeat of every connection would queue behind each other.
+# Redis-only calls run on this pool instead; database fallbacks stay on the
+# shared thread, where Django manages their connections.
+REDIS_EXECUTOR = ThreadPoolExecutor(
+    max_workers=settings.STREAM_REDIS_THREADS, thread_name_prefix='stream-redis')
+
+
+def redis_to_async(func):
+    return sync_to_async(func, thread_sensitive=False, executor=REDIS_EXECUTOR)
+
+
+async def iter_file_range(full_path, start, length, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Read ``length`` bytes from ``start`` without blocking the event loop;
+    every read runs in a thread.
+    """
+    file = await asyncio.to_thread(open, full_path, 'rb')
+    try:
+        await asyncio.to_thread(file.seek, start)
+        remaining = length
+        while remaining > 0:
+            chunk = await asyncio.to_thread(file.read, min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        file.close()
+
+
+def async_file_response(full_path, start, length, status, content_type):
+    return StreamingHttpResponse(
+        iter_file_range(full_path, start, length), status=status, content_type=content_type)
+
+
+@require_safe
+async def serve_media_async(request, path):
+    """
+    Async counterpart of ``serve_media``, sharing its range, ETag and
+    proxy offload handling. The stat and header handling run in a thread,
+    like the reads of the body.
+    """
+    return await asyncio.to_thread(build_media_response, request, path, async_file_response)
+
+
+async def authenticate_token(request):
+    """
+    Resolve ``Authorization: Token <key>`` to a user, or ``None``. Cached
+    tokens are resolved from Redis alone; only a cache miss goes to the
+    database.
+    """
+    auth = get_authorization_header(request).split()
+    if len(auth) != 2 or auth[0].lower() != b'token':
+        return None
+    authentication = CachedTokenAuthentication()
+    try:
+        key = auth[1].decode()
+        credentials = await redis_to_async(authentication.get_cached_credentials)(key)
+        if credentials is None:
+            credentials = await sync_to_async(authentication.authenticate_credentials)(key)
+    except (AuthenticationFailed, UnicodeError):
+        return None
+    return credentials[0]
+
+
+@csrf_exempt
+@require_POST
+async def progress_heartbeat_async(request):
+    """
+    Async counterpart of ``ProgressHeartbeatView``. Only token
+    authentication is supported, so the view does not need CSRF protection.
+    """
+    user = await authenticate_token(request)
+    if user is None:
+        return JsonResponse(
+            {"detail": "Authentication credentials were not provided."}, status=401)
+    try:
+        data = json.loads(request.body)
+    except ValueError:
+        return JsonResponse({"detail": "Invalid JSON."}, status=400)
+    serializer = ProgressHeartbeatSerializer(data=data)
+    if not serializer.is_valid():
+        return JsonResponse(serializer.errors, status=400)
+    await redis_to_async(buffer_progress)(
+        user.id,
+        serializer.validated_data['video'],
+        serializer.validated_data['last_viewed_position'],
+        serializer.validated_data.get('viewed'),
+    )
+    return HttpResponse(status=202)
+
+
+async def get_status(video_id):
+    state = await redis_to_async(get_live_processing_status)(video_id)
+    if state is None:
+        state = await sync_to_async(get_processing_status)(video_id)
+    return state
+
+
+async def iter_status_events(video_id, state):
+    """
+    Send the processing status as server-sent events whenever it changes,
+    until the video is ready or failed.
+    """
+    started_at = last_event_at = time.monotonic()
+    yield f"data: {json.dumps(state)}\n\n"
+    while state['status'] not in (READY, FAILED):
+        if time.monotonic() - started_at > STATUS_STREAM_MAX_SECONDS:
+            break
+        await asyncio.sleep(STATUS_POLL_SECONDS)
+        current = await get_status(video_id)
+        if current is None:
+            break
+        if current != state:
+            state = current
+            last_event_at = time.monotonic()
+            yield f"data: {json.dumps(state)}\n\n"
+        elif time.monotonic() - last_event_at > STATUS_KEEPALIVE_SECONDS:
+            last_event_at = time.monotonic()
+            yield ": keepalive\n\n"
+
+
+@require_safe
+async def video_status_stream(request, pk):
+    """
+    Server-sent events version of ``VideoStatusView`` for clients that would
+    otherwise poll.
+    """
+    state = await get_status(pk)
+    if state is None:
+        return JsonResponse({"detail": "Not found."}, status=404)
+    response = StreamingHttpResponse(
+        iter_status_events(pk, state), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
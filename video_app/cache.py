@@ -0,0 +1,42 @@
+import hashlib
+import time
+from django.core.cache import cache
+
+CATALOGUE_VERSION_KEY = 'video_catalogue:version'
+
+
+def get_catalogue_version():
+    version = cache.get(CATALOGUE_VERSION_KEY)
+    if version is None:
+        # Seed with the current time so entries cached under an evicted
+        # version can never be served again.
+        cache.add(CATALOGUE_VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(CATALOGUE_VERSION_KEY)
+    return version
+
+
+def invalidate_catalogue():
+    """
+    Bump the catalogue version. Cached pages are keyed by version, so they all
+    become unreachable at once and expire on their own.
+    """
+    try:
+        cache.incr(CATALOGUE_VERSION_KEY)
+    except ValueError:
+        cache.set(CATALOGUE_VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def get_catalogue_cache_key(request):
+    params = sorted(request.query_params.lists())
+    fingerprint = hashlib.md5(
+        f"{request.build_absolute_uri('/')}|{params}".encode()).hexdigest()
+    return f'video_catalogue:{get_catalogue_version()}:{fingerprint}'
+
+
+def get_continue_watching_cache_key(user_id):
+    # The catalogue version is part of the key so edited videos show up too.
+    return f'continue_watching:{user_id}:{get_catalogue_version()}'
+
+
+def invalidate_continue_watching(*user_ids):
+    cache.delete_many([get_continue_watching_cache_key(user_id) for user_id in user_ids])
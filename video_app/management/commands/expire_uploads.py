@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from video_app.tasks import expire_upload_sessions
+
+
+class Command(BaseCommand):
+    help = 'Remove unfinished uploads that received no chunk for UPLOAD_SESSION_EXPIRY seconds'
+
+    def handle(self, *args, **options):
+        count = expire_upload_sessions()
+        self.stdout.write(f"Removed {count} expired upload sessions")
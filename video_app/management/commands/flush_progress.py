@@ -0,0 +1,21 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from video_app.progress import flush_progress_buffer
+
+
+class Command(BaseCommand):
+    help = 'Write buffered watch progress from Redis to the database'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep running and flush every PROGRESS_FLUSH_INTERVAL seconds')
+
+    def handle(self, *args, **options):
+        while True:
+            count = flush_progress_buffer()
+            self.stdout.write(f"Flushed {count} progress entries")
+            if not options['loop']:
+                break
+            time.sleep(settings.PROGRESS_FLUSH_INTERVAL)
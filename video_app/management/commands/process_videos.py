@@ -1,19 +1,133 @@
-from django.core.management.base import BaseCommand
+import os
+import time
+import django
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 from video_app.models import Video
-from video_app.services import convert_video_to_qualities, generate_thumbnail
+from video_app.services import has_missing_outputs
+from video_app.tasks import enqueue_video_processing, process_video
+
+
+def process_video_in_worker(video_id):
+    """
+    Run in a pool process. Errors are returned instead of raised, so one
+    broken video does not stop the run.
+    """
+    try:
+        return video_id, process_video(video_id, fanout=False), None
+    except Exception as e:
+        return video_id, False, str(e)
+
+
+def parse_since(value):
+    parsed = parse_datetime(value)
+    if parsed is None:
+        date = parse_date(value)
+        if date is None:
+            raise CommandError(f"Invalid --since value '{value}', use YYYY-MM-DD or an ISO datetime")
+        parsed = datetime(date.year, date.month, date.day)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
 
 class Command(BaseCommand):
     help = 'Process all videos to generate different quality versions'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--ids', nargs='+', type=int,
+            help='Only process the videos with these ids')
+        parser.add_argument(
+            '--since',
+            help='Only process videos created at or after this date (YYYY-MM-DD or ISO datetime)')
+        parser.add_argument(
+            '--only-missing', action='store_true',
+            help='Skip videos that already have every rendition of the current pipeline')
+        parser.add_argument(
+            '--workers', type=int, default=1,
+            help='Number of videos processed in parallel in local processes')
+        parser.add_argument(
+            '--enqueue', action='store_true',
+            help='Enqueue the videos for the RQ workers instead of processing them here')
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Only list the videos that would be processed')
+        parser.add_argument(
+            '--checkpoint',
+            help='File recording finished video ids; an interrupted run resumes from it')
+
     def handle(self, *args, **options):
-        videos = Video.objects.all()
-        self.stdout.write(f"Found {videos.count()} videos to process")
-        
-        for video in videos:
-            self.stdout.write(f"Processing video {video.id}: {video.title}")
-            try:
-                convert_video_to_qualities(video)
-                generate_thumbnail(video)
-                self.stdout.write(self.style.SUCCESS(f"Successfully processed video {video.id}"))
-            except Exception as e:
-                self.stdout.write(self.style.ERROR(f"Error processing video {video.id}: {str(e)}")) 
\ No newline at end of file
+        if options['workers'] < 1:
+            raise CommandError("--workers must be at least 1")
+        videos = Video.objects.order_by('id')
+        if options['ids']:
+            videos = videos.filter(id__in=options['ids'])
+        if options['since']:
+            videos = videos.filter(created_at__gte=parse_since(options['since']))
+        if options['only_missing']:
+            videos = [
+                video for video in videos.prefetch_related('sources')
+                if has_missing_outputs(video)]
+
+        checkpoint = options['checkpoint']
+        done = self.read_checkpoint(checkpoint) if checkpoint else set()
+        videos = [video for video in videos if video.id not in done]
+        if done:
+            self.stdout.write(f"Resuming, {len(done)} videos already done according to {checkpoint}")
+        self.stdout.write(f"Found {len(videos)} videos to process")
+
+        if options['dry_run']:
+            for video in videos:
+                self.stdout.write(f"Would process video {video.id}: {video.title}")
+            return
+
+        self.total = len(videos)
+        self.finished = 0
+        self.started_at = time.monotonic()
+        if options['enqueue']:
+            for video in videos:
+                enqueue_video_processing(video.id)
+                self.report(video.id, True, None, checkpoint, action='Enqueued')
+        elif options['workers'] > 1:
+            self.process_in_pool(videos, options['workers'], checkpoint)
+        else:
+            for video in videos:
+                self.report(*process_video_in_worker(video.id), checkpoint)
+
+    def process_in_pool(self, videos, workers, checkpoint):
+        # Forked workers must not share the parent's database connection.
+        connections.close_all()
+        # Spawned workers (macOS, Windows) start without a set up Django.
+        # django.setup is the initializer, not a function of this module, so
+        # the worker can unpickle it before the models can be imported.
+        with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as executor:
+            futures = [executor.submit(process_video_in_worker, video.id) for video in videos]
+            for future in as_completed(futures):
+                self.report(*future.result(), checkpoint)
+
+    def report(self, video_id, processed, error, checkpoint, action='Processed'):
+        self.finished += 1
+        elapsed = time.monotonic() - self.started_at
+        remaining = elapsed / self.finished * (self.total - self.finished)
+        prefix = f"[{self.finished}/{self.total}, ~{remaining:.0f}s left]"
+        if error:
+            self.stdout.write(self.style.ERROR(f"{prefix} Error processing video {video_id}: {error}"))
+            return
+        if not processed:
+            self.stdout.write(self.style.WARNING(f"{prefix} Video {video_id} is already being processed, skipped"))
+            return
+        self.stdout.write(self.style.SUCCESS(f"{prefix} {action} video {video_id}"))
+        if checkpoint:
+            with open(checkpoint, 'a') as f:
+                f.write(f"{video_id}\n")
+
+    def read_checkpoint(self, path):
+        if not os.path.exists(path):
+            return set()
+        with open(path) as f:
+            return {int(line) for line in f if line.strip()}
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.7 on 2026-10-18 18:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('video_app', '0012_alter_uservideoprogress_user_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='video',
+            name='dash_manifest',
+            field=models.FileField(blank=True, max_length=255, null=True, upload_to='videos/dash/'),
+        ),
+        migrations.AddField(
+            model_name='video',
+            name='hls_playlist',
+            field=models.FileField(blank=True, max_length=255, null=True, upload_to='videos/hls/'),
+        ),
+    ]
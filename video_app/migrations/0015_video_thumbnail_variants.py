@@ -0,0 +1,28 @@
+# Generated by Django 5.1.7 on 2026-10-18 18:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('video_app', '0014_video_source_metadata'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='video',
+            name='thumbnail_320',
+            field=models.ImageField(blank=True, max_length=255, null=True, upload_to='thumbnails/'),
+        ),
+        migrations.AddField(
+            model_name='video',
+            name='thumbnail_640',
+            field=models.ImageField(blank=True, max_length=255, null=True, upload_to='thumbnails/'),
+        ),
+        migrations.AddField(
+            model_name='video',
+            name='thumbnail_webp',
+            field=models.ImageField(blank=True, max_length=255, null=True, upload_to='thumbnails/'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-18 18:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('video_app', '0015_video_thumbnail_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='video',
+            name='trickplay_vtt',
+            field=models.FileField(blank=True, max_length=255, null=True, upload_to='videos/trickplay/'),
+        ),
+    ]
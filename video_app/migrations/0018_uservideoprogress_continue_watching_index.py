@@ -0,0 +1,19 @@
+# Generated by Django 5.1.7 on 2026-10-18 18:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('video_app', '0017_uploadsession'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='uservideoprogress',
+            index=models.Index(fields=['user', 'viewed', '-last_viewed_at'], name='progress_continue_watching'),
+        ),
+    ]
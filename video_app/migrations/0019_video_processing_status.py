@@ -0,0 +1,38 @@
+# Generated by Django 5.1.7 on 2026-10-18 18:20
+
+from django.db import migrations, models
+from django.db.models import Q
+
+RENDITION_FIELDS = ('video_120p', 'video_360p', 'video_720p', 'video_1080p')
+
+
+def backfill_processing_status(apps, schema_editor):
+    # Videos from before the status existed were processed already; only
+    # those without any rendition did not make it through the pipeline.
+    Video = apps.get_model('video_app', 'Video')
+    has_rendition = Q()
+    for field in RENDITION_FIELDS:
+        has_rendition |= Q(**{f'{field}__gt': ''})
+    Video.objects.filter(has_rendition).update(processing_status='ready')
+    Video.objects.exclude(has_rendition).update(processing_status='failed')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('video_app', '0018_uservideoprogress_continue_watching_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='video',
+            name='processing_error',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='video',
+            name='processing_status',
+            field=models.CharField(choices=[('queued', 'queued'), ('probing', 'probing'), ('encoding', 'encoding'), ('packaging', 'packaging'), ('ready', 'ready'), ('failed', 'failed')], default='queued', max_length=16),
+        ),
+        migrations.RunPython(backfill_processing_status, migrations.RunPython.noop),
+    ]
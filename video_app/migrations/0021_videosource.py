@@ -0,0 +1,29 @@
+# Generated by Django 5.1.7 on 2026-10-18 18:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('video_app', '0020_video_source_sha256'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VideoSource',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('codec', models.CharField(max_length=16)),
+                ('resolution', models.CharField(max_length=8)),
+                ('file', models.FileField(max_length=255, upload_to='videos/')),
+                ('bitrate', models.PositiveIntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('video', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sources', to='video_app.video')),
+            ],
+            options={
+                'unique_together': {('video', 'codec', 'resolution')},
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.7 on 2026-10-18 20:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('video_app', '0021_videosource'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uploadsession',
+            name='error',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='uploadsession',
+            name='status',
+            field=models.CharField(choices=[('uploading', 'uploading'), ('verifying', 'verifying'), ('complete', 'complete'), ('failed', 'failed')], default='uploading', max_length=16),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.7 on 2026-10-18 20:46
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('video_app', '0023_uploadsession_updated_at'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='uservideoprogress',
+            name='last_viewed_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
@@ -1,6 +1,9 @@
+import os
+import uuid
 from datetime import date
+from django.conf import settings
 from django.db import models
-from moviepy import VideoFileClip
+from django.utils import timezone
 from django.core.files.uploadedfile import InMemoryUploadedFile
 import io
 from django.core.files import File
@@ -16,12 +19,26 @@ class Video(models.Model):
         ('documentary', 'documentary'),
         ('comedy', 'comedy'),
     )
+    PROCESSING_STATUS_CHOICES = (
+        ('queued', 'queued'),
+        ('probing', 'probing'),
+        ('encoding', 'encoding'),
+        ('packaging', 'packaging'),
+        ('ready', 'ready'),
+        ('failed', 'failed'),
+    )
 
     title = models.CharField(max_length=80)
     description = models.CharField(max_length=500)
     video_file = models.FileField(upload_to='videos', null=False, blank=False)
     thumbnail = models.ImageField(
         upload_to='thumbnails/', null=True, blank=True)
+    thumbnail_320 = models.ImageField(
+        upload_to='thumbnails/', null=True, blank=True, max_length=255)
+    thumbnail_640 = models.ImageField(
+        upload_to='thumbnails/', null=True, blank=True, max_length=255)
+    thumbnail_webp = models.ImageField(
+        upload_to='thumbnails/', null=True, blank=True, max_length=255)
     category = models.CharField(max_length=255, choices=CATEGORY_CHOICES)
     created_at = models.DateTimeField(auto_now_add=True)
     video_120p = models.FileField(
@@ -32,6 +49,21 @@ class Video(models.Model):
         upload_to='videos/720p/', null=True, blank=True, max_length=255)
     video_1080p = models.FileField(
         upload_to='videos/1080p/', null=True, blank=True, max_length=255)
+    hls_playlist = models.FileField(
+        upload_to='videos/hls/', null=True, blank=True, max_length=255)
+    dash_manifest = models.FileField(
+        upload_to='videos/dash/', null=True, blank=True, max_length=255)
+    trickplay_vtt = models.FileField(
+        upload_to='videos/trickplay/', null=True, blank=True, max_length=255)
+    source_width = models.PositiveIntegerField(null=True, blank=True)
+    source_height = models.PositiveIntegerField(null=True, blank=True)
+    source_bitrate = models.PositiveBigIntegerField(null=True, blank=True)
+    source_codec = models.CharField(max_length=32, blank=True)
+    duration = models.FloatField(null=True, blank=True)
+    source_sha256 = models.CharField(max_length=64, blank=True, db_index=True)
+    processing_status = models.CharField(
+        max_length=16, choices=PROCESSING_STATUS_CHOICES, default='queued')
+    processing_error = models.TextField(blank=True)
 
     def __str__(self):
         return self.title
@@ -44,10 +76,83 @@ class UserVideoProgress(models.Model):
         Video, on_delete=models.CASCADE, related_name='watchers')
     last_viewed_position = models.FloatField(default=0.0)
     viewed = models.BooleanField(default=False)
-    last_viewed_at = models.DateTimeField(auto_now=True)
+    # Not auto_now: flush_progress writes buffered heartbeats with bulk_create
+    # and keeps the time they arrived. save() still stamps the current time.
+    last_viewed_at = models.DateTimeField(default=timezone.now)
 
     class Meta:
         unique_together = ("user", "video")
+        indexes = [
+            models.Index(
+                fields=['user', 'viewed', '-last_viewed_at'],
+                name='progress_continue_watching'),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.last_viewed_at = timezone.now()
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'last_viewed_at'}
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.user.username} - {self.video.title}"
+
+
+class VideoSource(models.Model):
+    """
+    A rendition in an additional codec (``VIDEO_SECONDARY_CODECS``), stored
+    next to the H.264 renditions on ``Video``.
+    """
+    video = models.ForeignKey(
+        Video, on_delete=models.CASCADE, related_name='sources')
+    codec = models.CharField(max_length=16)
+    resolution = models.CharField(max_length=8)
+    file = models.FileField(upload_to='videos/', max_length=255)
+    bitrate = models.PositiveIntegerField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ("video", "codec", "resolution")
+
+    def __str__(self):
+        return f"{self.video_id} - {self.codec} {self.resolution}"
+
+
+class UploadSession(models.Model):
+    """
+    A resumable upload. Chunks are appended to ``temp_path`` until ``offset``
+    reaches ``size``; finalizing hands the upload to a worker that verifies
+    the checksum and creates the Video.
+    """
+    STATUS_CHOICES = (
+        ('uploading', 'uploading'),
+        ('verifying', 'verifying'),
+        ('complete', 'complete'),
+        ('failed', 'failed'),
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        'auth.User', on_delete=models.CASCADE, related_name='upload_sessions')
+    title = models.CharField(max_length=80)
+    description = models.CharField(max_length=500)
+    category = models.CharField(max_length=255, choices=Video.CATEGORY_CHOICES)
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    offset = models.PositiveBigIntegerField(default=0)
+    checksum = models.CharField(max_length=64)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default='uploading')
+    error = models.CharField(max_length=255, blank=True)
+    video = models.OneToOneField(
+        Video, on_delete=models.SET_NULL, null=True, blank=True, related_name='upload_session')
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Last received chunk; idle sessions expire, see expire_upload_sessions.
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @property
+    def temp_path(self):
+        # Outside MEDIA_ROOT, so partial uploads are never served.
+        return os.path.join(settings.UPLOAD_TEMP_DIR, f'{self.id}.part')
+
+    def __str__(self):
+        return f"{self.filename} ({self.offset}/{self.size})"
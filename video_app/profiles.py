@@ -0,0 +1,70 @@
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+# Values used for every key a profile in VIDEO_ENCODER_PROFILES leaves out.
+PROFILE_DEFAULTS = {
+    'codec': 'libx264',
+    'preset': 'medium',
+    'crf': 23,
+    # VBV cap relative to the rendition bitrate of the ladder.
+    'maxrate_factor': 1.0,
+    'bufsize_factor': 2.0,
+    'pixel_format': 'yuv420p',
+    # Keyframe interval in seconds. Keep VIDEO_HLS_SEGMENT_SECONDS a multiple
+    # of it so every segment of every rendition starts on a keyframe.
+    'gop_seconds': 2,
+    # 0 lets ffmpeg pick, which means one thread per core for every job.
+    'threads': 0,
+    'filter_threads': 0,
+    'audio_codec': 'aac',
+    'audio_bitrate': '128k',
+    'extra_args': [],
+}
+
+
+def get_encoder_profile(name=None):
+    """
+    Return the encoder profile ``name`` (default ``VIDEO_ENCODER_PROFILE``)
+    from ``VIDEO_ENCODER_PROFILES``, completed with ``PROFILE_DEFAULTS``.
+    """
+    name = name or settings.VIDEO_ENCODER_PROFILE
+    try:
+        profile = settings.VIDEO_ENCODER_PROFILES[name]
+    except KeyError:
+        raise ImproperlyConfigured(f"Unknown video encoder profile '{name}'")
+    return {**PROFILE_DEFAULTS, **profile, 'name': name}
+
+
+def build_encoder_args(profile, bitrate=None):
+    """
+    ffmpeg output options for one rendition. ``bitrate`` is the ladder
+    bitrate in kbit/s and becomes the VBV cap of the CRF encode.
+    """
+    args = [
+        '-c:v', profile['codec'],
+        '-preset', str(profile['preset']),
+        '-crf', str(profile['crf']),
+        '-pix_fmt', profile['pixel_format'],
+    ]
+    if bitrate and profile['maxrate_factor']:
+        args += [
+            '-maxrate', f"{int(bitrate * profile['maxrate_factor'])}k",
+            '-bufsize', f"{int(bitrate * profile['bufsize_factor'])}k",
+        ]
+    if profile['gop_seconds']:
+        args += ['-force_key_frames', f"expr:gte(t,n_forced*{profile['gop_seconds']})"]
+    if profile['threads']:
+        args += ['-threads', str(profile['threads'])]
+    args += list(profile['extra_args'])
+    args += ['-c:a', profile['audio_codec'], '-b:a', profile['audio_bitrate']]
+    return args
+
+
+def build_global_args(profile):
+    """
+    Options that apply to the whole ffmpeg process, like the thread limit of
+    the shared split/scale filter graph.
+    """
+    if profile['filter_threads']:
+        return ['-filter_complex_threads', str(profile['filter_threads'])]
+    return []
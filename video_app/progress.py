@@ -0,0 +1,106 @@
+import json
+from django.contrib.auth.models import User
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django_redis import get_redis_connection
+from redis.exceptions import ResponseError
+from .cache import invalidate_continue_watching
+from .models import UserVideoProgress, Video
+
+PROGRESS_BUFFER_KEY = 'videoflix:progress:buffer'
+PROGRESS_FLUSHING_KEY = 'videoflix:progress:flushing'
+PROGRESS_FLUSH_LOCK_KEY = 'videoflix:progress:flush_lock'
+# Longer than any flush; an expired lock would let a second flusher in.
+PROGRESS_FLUSH_LOCK_TIMEOUT = 600
+
+
+def buffer_progress(user_id, video_id, last_viewed_position, viewed=None):
+    """
+    Store the latest heartbeat of a user for a video in Redis, with the time
+    it arrived. Later heartbeats overwrite earlier ones, so only the newest
+    state is flushed. ``viewed`` is kept in its own field and only written
+    when the client sent it, so a heartbeat without it keeps the flag.
+    """
+    key = f'{user_id}:{video_id}'
+    pipeline = get_redis_connection('default').pipeline()
+    pipeline.hset(PROGRESS_BUFFER_KEY, key, json.dumps({
+        'last_viewed_position': last_viewed_position,
+        'last_viewed_at': timezone.now().isoformat(),
+    }))
+    if viewed is not None:
+        pipeline.hset(PROGRESS_BUFFER_KEY, f'{key}:viewed', int(viewed))
+    pipeline.execute()
+
+
+def flush_progress_buffer(batch_size=1000):
+    """
+    Upsert all buffered heartbeats into ``UserVideoProgress`` in batches and
+    return the number of rows written.
+
+    The buffer is renamed before it is read, so heartbeats arriving during a
+    flush go into a fresh hash. A flushing hash left behind by a crashed run is
+    written first. Only one flusher runs at a time, e.g. with
+    ``flush_progress --loop`` on several hosts; the others return 0.
+    """
+    connection = get_redis_connection('default')
+    lock = connection.lock(PROGRESS_FLUSH_LOCK_KEY, timeout=PROGRESS_FLUSH_LOCK_TIMEOUT)
+    if not lock.acquire(blocking=False):
+        return 0
+    try:
+        return write_flushing_buffer(connection, batch_size)
+    finally:
+        lock.release()
+
+
+def write_flushing_buffer(connection, batch_size):
+    if not connection.exists(PROGRESS_FLUSHING_KEY):
+        try:
+            connection.rename(PROGRESS_BUFFER_KEY, PROGRESS_FLUSHING_KEY)
+        except ResponseError:
+            return 0
+
+    entries = {}
+    viewed = {}
+    for key, value in connection.hgetall(PROGRESS_FLUSHING_KEY).items():
+        user_id, video_id, *flag = key.decode().split(':')
+        if flag:
+            viewed[(int(user_id), int(video_id))] = value == b'1'
+        else:
+            entries[(int(user_id), int(video_id))] = json.loads(value)
+
+    user_ids = set(User.objects.filter(
+        id__in={user_id for user_id, _ in entries}).values_list('id', flat=True))
+    video_ids = set(Video.objects.filter(
+        id__in={video_id for _, video_id in entries}).values_list('id', flat=True))
+    # Rows of heartbeats without ``viewed`` are upserted separately, so their
+    # flag is left as it is.
+    with_viewed, without_viewed = [], []
+    for (user_id, video_id), values in entries.items():
+        if user_id not in user_ids or video_id not in video_ids:
+            continue
+        entry = UserVideoProgress(
+            user_id=user_id,
+            video_id=video_id,
+            last_viewed_position=values['last_viewed_position'],
+            last_viewed_at=parse_datetime(values['last_viewed_at']),
+        )
+        if (user_id, video_id) in viewed:
+            entry.viewed = viewed[(user_id, video_id)]
+            with_viewed.append(entry)
+        else:
+            without_viewed.append(entry)
+    for progress, update_fields in (
+            (with_viewed, ['last_viewed_position', 'viewed', 'last_viewed_at']),
+            (without_viewed, ['last_viewed_position', 'last_viewed_at'])):
+        if progress:
+            UserVideoProgress.objects.bulk_create(
+                progress,
+                batch_size=batch_size,
+                update_conflicts=True,
+                unique_fields=['user', 'video'],
+                update_fields=update_fields,
+            )
+    progress = with_viewed + without_viewed
+    connection.delete(PROGRESS_FLUSHING_KEY)
+    invalidate_continue_watching(*{entry.user_id for entry in progress})
+    return len(progress)
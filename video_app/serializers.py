@@ -1,58 +1,149 @@
+from django.conf import settings
+from django.db import models
+from django.utils.encoding import filepath_to_uri
 from rest_framework import serializers
-from .models import Video, UserVideoProgress
+from .models import Video, UserVideoProgress, VideoSource
 
-class VideoSerializer(serializers.ModelSerializer):
-    video_120p = serializers.SerializerMethodField()
-    video_360p = serializers.SerializerMethodField()
-    video_720p = serializers.SerializerMethodField()
-    video_1080p = serializers.SerializerMethodField()
+
+class MediaURLResolver:
+    """
+    Turns stored file names into absolute media URLs. The base URL
+    (``MEDIA_CDN_URL`` or the absolute ``MEDIA_URL`` of the request) is built
+    once per serializer tree instead of once per field and row, and names are
+    joined directly without a ``storage.url()`` call.
+    """
+
+    def __init__(self, request=None):
+        if settings.MEDIA_CDN_URL:
+            self.base_url = settings.MEDIA_CDN_URL.rstrip('/') + '/'
+        elif request is not None:
+            self.base_url = request.build_absolute_uri(settings.MEDIA_URL)
+        else:
+            self.base_url = settings.MEDIA_URL
+
+    @classmethod
+    def from_context(cls, context):
+        resolver = context.get('media_url_resolver')
+        if resolver is None:
+            resolver = context['media_url_resolver'] = cls(context.get('request'))
+        return resolver
+
+    def resolve(self, file):
+        if not file:
+            return None
+        return self.base_url + filepath_to_uri(file.name).lstrip('/')
+
+
+class MediaURLFieldMixin:
+    def to_representation(self, value):
+        return MediaURLResolver.from_context(self.context).resolve(value)
+
+
+class MediaFileField(MediaURLFieldMixin, serializers.FileField):
+    pass
+
+
+class MediaImageField(MediaURLFieldMixin, serializers.ImageField):
+    pass
+
+
+class SparseFieldsMixin:
+    """
+    Limit the output of the top-level serializer to the fields named in
+    ``?fields=id,title``. Nested serializers and writes are left untouched.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        if request is None or request.method not in ('GET', 'HEAD'):
+            return fields
+        if getattr(self.root, 'child', self.root) is not self:
+            return fields
+        requested = request.GET.get('fields')
+        if not requested:
+            return fields
+        names = {name.strip() for name in requested.split(',')}
+        return {name: field for name, field in fields.items() if name in names}
+
+
+class MediaModelSerializer(serializers.ModelSerializer):
+    """
+    ModelSerializer whose file and image fields are rendered through the
+    shared ``MediaURLResolver``.
+    """
+    serializer_field_mapping = {
+        **serializers.ModelSerializer.serializer_field_mapping,
+        models.FileField: MediaFileField,
+        models.ImageField: MediaImageField,
+    }
+
+
+class VideoSourceSerializer(MediaModelSerializer):
+    class Meta:
+        model = VideoSource
+        fields = ['resolution', 'file', 'bitrate']
+
+
+class VideoSourcesField(serializers.Field):
+    """
+    Secondary codec renditions grouped by codec, e.g.
+    ``{"hevc": [{"resolution": "720p", ...}]}``. Expects ``sources`` to be
+    prefetched.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, sources):
+        serializer = VideoSourceSerializer(context=self.context)
+        grouped = {}
+        for source in sources.all():
+            grouped.setdefault(source.codec, []).append(serializer.to_representation(source))
+        return grouped
+
+
+class VideoSerializer(SparseFieldsMixin, MediaModelSerializer):
+    """
+    Public video representation. Probe metadata, the source hash and
+    processing errors stay internal.
+    """
+    sources = VideoSourcesField()
 
     class Meta:
         model = Video
         fields = [
             'id', 'title', 'description', 'video_file',
-            'thumbnail', 'category', 'created_at',
-            'video_120p', 'video_360p', 'video_720p', 'video_1080p'
+            'thumbnail', 'thumbnail_320', 'thumbnail_640', 'thumbnail_webp',
+            'category', 'created_at',
+            'video_120p', 'video_360p', 'video_720p', 'video_1080p',
+            'hls_playlist', 'dash_manifest', 'trickplay_vtt', 'duration',
+            'processing_status', 'sources'
         ]
         read_only_fields = [
-            'thumbnail', 'video_120p', 'video_360p',
-            'video_720p', 'video_1080p'
+            'thumbnail', 'thumbnail_320', 'thumbnail_640', 'thumbnail_webp',
+            'video_120p', 'video_360p',
+            'video_720p', 'video_1080p', 'hls_playlist', 'dash_manifest',
+            'trickplay_vtt', 'duration', 'processing_status'
         ]
 
-    def get_video_120p(self, obj):
-        if obj.video_120p:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.video_120p.url)
-            return obj.video_120p.url
-        return None
-
-    def get_video_360p(self, obj):
-        if obj.video_360p:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.video_360p.url)
-            return obj.video_360p.url
-        return None
-
-    def get_video_720p(self, obj):
-        if obj.video_720p:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.video_720p.url)
-            return obj.video_720p.url
-        return None
-
-    def get_video_1080p(self, obj):
-        if obj.video_1080p:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.video_1080p.url)
-            return obj.video_1080p.url
-        return None
-
-class UserVideoProgressSerializer(serializers.ModelSerializer):
-    video = VideoSerializer(read_only=True)
+
+class VideoCompactSerializer(MediaModelSerializer):
+    """
+    Slim video representation for nesting in other resources.
+    """
+    class Meta:
+        model = Video
+        fields = [
+            'id', 'title', 'category', 'thumbnail', 'thumbnail_webp',
+            'duration', 'hls_playlist'
+        ]
+        read_only_fields = fields
+
+
+class UserVideoProgressSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    video = VideoCompactSerializer(read_only=True)
     video_id = serializers.PrimaryKeyRelatedField(
         queryset=Video.objects.all(),
         source='video',
@@ -1,90 +1,564 @@
 import os
+import json
+import hashlib
+import math
 import subprocess
+import tempfile
 import logging
 from django.conf import settings
-from .models import Video
+from .models import Video, VideoSource
 
 logger = logging.getLogger(__name__)
 
-def convert_video_to_qualities(video_instance: Video):
+# Ordered from the lowest to the highest quality, bitrates in kbit/s.
+RENDITION_LADDER = {
+    '120p': {'height': 120, 'bitrate': 400},
+    '360p': {'height': 360, 'bitrate': 1000},
+    '720p': {'height': 720, 'bitrate': 2500},
+    '1080p': {'height': 1080, 'bitrate': 4000},
+}
+RENDITION_QUALITIES = tuple(RENDITION_LADDER)
 
-    input_path = video_instance.video_file.path
-    base_name = os.path.splitext(os.path.basename(input_path))[0]
-    
-    logger.info(f"Starting video conversion for {input_path}")
-    
-    qualities = {
-        '1080p': {'height': 1080, 'bitrate': '4000k'},
-        '720p': {'height': 720, 'bitrate': '2500k'},
-        '360p': {'height': 360, 'bitrate': '1000k'},
-        '120p': {'height': 120, 'bitrate': '400k'}
+# Everything derived from the source file, shared between identical uploads.
+REUSABLE_FIELDS = (
+    'thumbnail', 'thumbnail_320', 'thumbnail_640', 'thumbnail_webp',
+    *(f'video_{quality}' for quality in RENDITION_QUALITIES),
+    'hls_playlist', 'dash_manifest', 'trickplay_vtt',
+    'source_width', 'source_height', 'source_bitrate', 'source_codec', 'duration',
+)
+
+
+def build_rendition_command(input_path, outputs, global_args=()):
+    """
+    Build one ffmpeg command that decodes the input once and writes every
+    rendition through a split filter graph.
+
+    ``outputs`` is a list of ``(height, output_path, encoder_args)`` tuples,
+    ``global_args`` are process-wide options such as filter thread limits.
+    """
+    labels = ''.join(f'[v{index}]' for index in range(len(outputs)))
+    filters = [f'[0:v]split={len(outputs)}{labels}']
+    for index, (height, _, _) in enumerate(outputs):
+        filters.append(f'[v{index}]scale=-2:{height}[out{index}]')
+
+    command = [
+        'ffmpeg',
+        '-y',
+        *global_args,
+        '-i', input_path,
+        '-filter_complex', ';'.join(filters),
+    ]
+    for index, (_, output_path, encoder_args) in enumerate(outputs):
+        command += ['-map', f'[out{index}]', '-map', '0:a?']
+        command += encoder_args
+        command.append(output_path)
+    return command
+
+
+def parse_ffmpeg_progress(lines, duration):
+    """
+    Yield the completion in percent from ffmpeg ``-progress`` output, once
+    per whole percent. ``out_time_ms`` is in microseconds as well, despite
+    its name.
+    """
+    last_percent = None
+    for line in lines:
+        key, _, value = line.strip().partition('=')
+        if key == 'progress' and value == 'end':
+            percent = 100
+        elif key in ('out_time_us', 'out_time_ms') and value.isdigit() and duration:
+            percent = min(int(int(value) / 1000000 / duration * 100), 99)
+        else:
+            continue
+        if percent != last_percent:
+            last_percent = percent
+            yield percent
+
+
+def run_ffmpeg(command, duration=None, on_progress=None):
+    """
+    Run an ffmpeg command and report its progress to ``on_progress(percent)``.
+    Raises ``CalledProcessError`` with the captured stderr on failure.
+    """
+    if on_progress is None:
+        return subprocess.run(command, check=True, capture_output=True, text=True)
+
+    command = [command[0], '-progress', 'pipe:1', '-nostats', *command[1:]]
+    with tempfile.TemporaryFile(mode='w+') as stderr:
+        process = subprocess.Popen(
+            command, stdout=subprocess.PIPE, stderr=stderr, text=True)
+        for percent in parse_ffmpeg_progress(process.stdout, duration):
+            on_progress(percent)
+        returncode = process.wait()
+        if returncode:
+            stderr.seek(0)
+            raise subprocess.CalledProcessError(returncode, command, stderr=stderr.read())
+    return returncode
+
+
+def probe_video(input_path):
+    """
+    Read stream and container metadata of a media file with ffprobe.
+    """
+    command = [
+        'ffprobe',
+        '-v', 'error',
+        '-print_format', 'json',
+        '-show_format',
+        '-show_streams',
+        input_path
+    ]
+    result = subprocess.run(command, check=True, capture_output=True, text=True)
+    return json.loads(result.stdout)
+
+
+def parse_source_metadata(probe):
+    """
+    Extract the source properties stored on ``Video`` from ffprobe output.
+    """
+    video_stream = next(
+        (stream for stream in probe.get('streams', [])
+         if stream.get('codec_type') == 'video'), {})
+    container = probe.get('format', {})
+    bitrate = video_stream.get('bit_rate') or container.get('bit_rate')
+    duration = video_stream.get('duration') or container.get('duration')
+    return {
+        'source_width': video_stream.get('width'),
+        'source_height': video_stream.get('height'),
+        'source_codec': video_stream.get('codec_name', ''),
+        'source_bitrate': int(bitrate) if bitrate else None,
+        'duration': float(duration) if duration else None,
     }
-    
-    for quality, settings in qualities.items():
-        output_dir = os.path.join('media', 'videos', quality)
-        os.makedirs(output_dir, exist_ok=True)
-        
-        output_path = os.path.join(output_dir, f"{base_name}_{quality}.mp4")
-        
-        logger.info(f"Converting to {quality} - Output: {output_path}")
-        
-        command = [
-            'ffmpeg',
-            '-i', input_path,
-            '-vf', f'scale=-2:{settings["height"]}',
-            '-b:v', settings['bitrate'],
-            '-c:v', 'libx264',
-            '-preset', 'medium',
-            '-c:a', 'aac',
-            '-b:a', '128k',
-            '-y',  
-            output_path
-        ]
-        
+
+
+def probe_source(video_instance: Video):
+    """
+    Probe the uploaded source file and store its metadata on the video.
+    """
+    metadata = parse_source_metadata(probe_video(video_instance.video_file.path))
+    for field, value in metadata.items():
+        setattr(video_instance, field, value)
+    video_instance.save(update_fields=list(metadata))
+    logger.info(
+        f"Probed video {video_instance.id}: {metadata['source_width']}x"
+        f"{metadata['source_height']} {metadata['source_codec']}")
+    return video_instance
+
+
+def ensure_source_sha256(video_instance: Video):
+    """
+    Hash the source file for videos that did not get a digest during upload,
+    e.g. ones added through the admin or the management command.
+    """
+    if not video_instance.source_sha256:
+        digest = hashlib.sha256()
+        with video_instance.video_file.open('rb') as source:
+            for chunk in source.chunks():
+                digest.update(chunk)
+        video_instance.source_sha256 = digest.hexdigest()
+        video_instance.save(update_fields=['source_sha256'])
+    return video_instance
+
+
+def has_missing_outputs(video_instance: Video):
+    """
+    Whether a video lacks any output the current pipeline would produce:
+    a rendition of its ladder, a secondary codec source or the HLS (and, if
+    enabled, DASH) package.
+    """
+    if video_instance.processing_status != 'ready' or not video_instance.hls_playlist:
+        return True
+    if settings.VIDEO_DASH_ENABLED and not video_instance.dash_manifest:
+        return True
+    ladder = build_rendition_ladder(video_instance.source_height, video_instance.source_bitrate)
+    if any(not getattr(video_instance, f'video_{resolution}') for resolution in ladder):
+        return True
+    sources = {(source.codec, source.resolution) for source in video_instance.sources.all()}
+    return any(
+        (codec, resolution) not in sources
+        for codec in settings.VIDEO_SECONDARY_CODECS for resolution in ladder)
+
+
+def has_own_outputs(video_instance: Video):
+    return bool(
+        video_instance.hls_playlist
+        or any(getattr(video_instance, f'video_{quality}') for quality in RENDITION_QUALITIES)
+        or video_instance.sources.exists())
+
+
+def reuse_duplicate_outputs(video_instance: Video):
+    """
+    Copy renditions, thumbnails, secondary codec sources and metadata from an
+    already processed video with the same source hash. Returns ``True`` if
+    one was found, in which case the video does not need to be encoded.
+
+    Only a new upload without outputs of its own reuses anything, so a
+    reprocess or backfill always encodes, and only from a duplicate that has
+    every output of the current ladder, codecs and packages.
+    """
+    if has_own_outputs(video_instance):
+        return False
+    candidates = Video.objects.filter(
+        source_sha256=video_instance.source_sha256, processing_status='ready'
+    ).exclude(pk=video_instance.pk).prefetch_related('sources')
+    duplicate = next(
+        (candidate for candidate in candidates if not has_missing_outputs(candidate)), None)
+    if duplicate is None:
+        return False
+    fields = Video.objects.filter(pk=duplicate.pk).values(*REUSABLE_FIELDS).get()
+    Video.objects.filter(pk=video_instance.pk).update(**fields)
+    VideoSource.objects.bulk_create([
+        VideoSource(
+            video=video_instance, codec=source.codec, resolution=source.resolution,
+            file=source.file, bitrate=source.bitrate)
+        for source in duplicate.sources.all()
+    ], ignore_conflicts=True)
+    for field, value in fields.items():
+        setattr(video_instance, field, value)
+    logger.info(f"Video {video_instance.id} reuses the outputs of video {duplicate.id}")
+    return True
+
+
+def build_rendition_ladder(source_height=None, source_bitrate=None):
+    """
+    Return the renditions worth encoding for a source. Renditions above the
+    source height are skipped (the lowest one is always kept) and bitrates are
+    capped so that no rendition spends more bits per pixel than the source.
+    """
+    ladder = {}
+    for quality, rendition in RENDITION_LADDER.items():
+        if source_height and rendition['height'] > source_height and ladder:
+            break
+        bitrate = rendition['bitrate']
+        if source_height and source_bitrate:
+            scale = min(rendition['height'] / source_height, 1) ** 2
+            bitrate = min(bitrate, max(int(source_bitrate / 1000 * scale), 1))
+        ladder[quality] = {'height': rendition['height'], 'bitrate': bitrate}
+    return ladder
+
+
+def has_audio_stream(input_path):
+    streams = probe_video(input_path).get('streams', [])
+    return any(stream.get('codec_type') == 'audio' for stream in streams)
+
+
+def get_rendition_paths(video_instance: Video):
+    """
+    Return ``(quality, absolute_path)`` pairs for every rendition that exists,
+    ordered from the lowest to the highest quality.
+    """
+    renditions = []
+    for quality in RENDITION_QUALITIES:
+        field = getattr(video_instance, f'video_{quality}')
+        if field:
+            renditions.append((quality, field.path))
+    return renditions
+
+
+def build_hls_command(renditions, output_dir, with_audio):
+    """
+    Remux the rendition files into one HLS variant stream each and let ffmpeg
+    write the master playlist. Streams are copied, nothing is re-encoded.
+    """
+    segment_seconds = str(settings.VIDEO_HLS_SEGMENT_SECONDS)
+    command = ['ffmpeg', '-y']
+    for _, path in renditions:
+        command += ['-i', path]
+
+    stream_map = []
+    for index, (quality, _) in enumerate(renditions):
+        command += ['-map', f'{index}:v:0']
+        if with_audio:
+            command += ['-map', f'{index}:a:0']
+            stream_map.append(f'v:{index},a:{index},name:{quality}')
+        else:
+            stream_map.append(f'v:{index},name:{quality}')
+
+    command += [
+        '-c', 'copy',
+        '-f', 'hls',
+        '-hls_time', segment_seconds,
+        '-hls_playlist_type', 'vod',
+        '-hls_segment_filename', os.path.join(output_dir, '%v', 'segment_%05d.ts'),
+        '-master_pl_name', 'master.m3u8',
+        '-var_stream_map', ' '.join(stream_map),
+        os.path.join(output_dir, '%v', 'index.m3u8')
+    ]
+    return command
+
+
+def build_dash_command(renditions, output_dir, with_audio):
+    """
+    Remux the rendition files into a DASH manifest with one video
+    representation per rendition and a single shared audio track.
+    """
+    segment_seconds = str(settings.VIDEO_HLS_SEGMENT_SECONDS)
+    command = ['ffmpeg', '-y']
+    for _, path in renditions:
+        command += ['-i', path]
+    for index in range(len(renditions)):
+        command += ['-map', f'{index}:v:0']
+    adaptation_sets = 'id=0,streams=v'
+    if with_audio:
+        command += ['-map', '0:a:0']
+        adaptation_sets += ' id=1,streams=a'
+
+    command += [
+        '-c', 'copy',
+        '-f', 'dash',
+        '-seg_duration', segment_seconds,
+        '-use_template', '1',
+        '-use_timeline', '1',
+        '-adaptation_sets', adaptation_sets,
+        os.path.join(output_dir, 'manifest.mpd')
+    ]
+    return command
+
+
+def package_adaptive_streams(video_instance: Video):
+    """
+    Package the transcoded renditions for adaptive streaming. HLS is always
+    produced, DASH only when ``VIDEO_DASH_ENABLED`` is set.
+    """
+    renditions = get_rendition_paths(video_instance)
+    if not renditions:
+        logger.warning(f"No renditions to package for video {video_instance.id}")
+        return
+
+    with_audio = has_audio_stream(renditions[0][1])
+    packages = [('hls', 'hls_playlist', 'master.m3u8', build_hls_command)]
+    if settings.VIDEO_DASH_ENABLED:
+        packages.append(('dash', 'dash_manifest', 'manifest.mpd', build_dash_command))
+
+    for package, field_name, manifest_name, build_command in packages:
+        relative_dir = os.path.join('videos', package, str(video_instance.id))
+        output_dir = os.path.join(settings.MEDIA_ROOT, relative_dir)
+        if package == 'hls':
+            for quality, _ in renditions:
+                os.makedirs(os.path.join(output_dir, quality), exist_ok=True)
+        else:
+            os.makedirs(output_dir, exist_ok=True)
+
+        logger.info(f"Packaging {package.upper()} for video {video_instance.id}")
+        command = build_command(renditions, output_dir, with_audio)
         try:
-            result = subprocess.run(command, check=True, capture_output=True, text=True)
-            logger.info(f"Successfully converted to {quality}")
-            
-            relative_path = os.path.join('videos', quality, f"{base_name}_{quality}.mp4")
-            setattr(video_instance, f'video_{quality}', relative_path)
-            logger.info(f"Updated video instance with {quality} path: {relative_path}")
-            
+            subprocess.run(command, check=True, capture_output=True, text=True)
         except subprocess.CalledProcessError as e:
-            logger.error(f"Error converting to {quality}: {e.stderr}")
+            logger.error(f"Error packaging {package.upper()}: {e.stderr}")
             continue
-    
-    video_instance.save()
-    logger.info("Video conversion completed and saved")
+        setattr(video_instance, field_name, os.path.join(relative_dir, manifest_name))
+
+    video_instance.save(update_fields=[package[1] for package in packages])
+    logger.info(f"Adaptive streaming packages ready for video {video_instance.id}")
+
+
+def package_preview_stream(video_instance: Video, quality):
+    """
+    HLS package of the single preview rendition, written to its own
+    ``preview`` directory so it never touches the full package of the same
+    video. Returns the master playlist relative to MEDIA_ROOT, or ``None``.
+    """
+    path = getattr(video_instance, f'video_{quality}').path
+    relative_dir = os.path.join('videos', 'hls', str(video_instance.id), 'preview')
+    output_dir = os.path.join(settings.MEDIA_ROOT, relative_dir)
+    os.makedirs(os.path.join(output_dir, quality), exist_ok=True)
+    command = build_hls_command([(quality, path)], output_dir, has_audio_stream(path))
+    try:
+        subprocess.run(command, check=True, capture_output=True, text=True)
+    except subprocess.CalledProcessError as e:
+        logger.error(f"Error packaging preview of video {video_instance.id}: {e.stderr}")
+        return None
+    return os.path.join(relative_dir, 'master.m3u8')
+
+
+# Field name -> (file suffix, scale filter) of every thumbnail written per video.
+THUMBNAIL_VARIANTS = {
+    'thumbnail': ('thumb.jpg', 'scale=200:150:force_original_aspect_ratio=decrease'),
+    'thumbnail_320': ('thumb_320.jpg', 'scale=320:-2'),
+    'thumbnail_640': ('thumb_640.jpg', 'scale=640:-2'),
+    'thumbnail_webp': ('thumb_640.webp', 'scale=640:-2'),
+}
+
+# Frames darker than this average luma (0-255) are not used as thumbnails.
+THUMBNAIL_MIN_LUMA = 24
+
+
+def get_thumbnail_seek_position(duration):
+    """
+    Seek a few seconds in to skip intros and fades, but stay within the first
+    third of short clips.
+    """
+    if not duration:
+        return 0
+    return min(settings.THUMBNAIL_SEEK_SECONDS, duration / 3)
+
+
+def build_thumbnail_command(input_path, outputs, seek_position, skip_dark_frames=True):
+    """
+    Build one ffmpeg command that seeks on the input side (no decoding up to
+    the seek position), picks the most representative frame of the following
+    window and writes it in every thumbnail size.
+
+    ``outputs`` is a list of ``(scale_filter, output_path)`` tuples.
+    """
+    selection = ['thumbnail=n=50']
+    if skip_dark_frames:
+        selection.insert(0, (
+            'signalstats,metadata=mode=select:key=lavfi.signalstats.YAVG'
+            f':value={THUMBNAIL_MIN_LUMA}:function=greater'))
+    labels = ''.join(f'[t{index}]' for index in range(len(outputs)))
+    filters = ['[0:v]' + ','.join(selection) + f',split={len(outputs)}{labels}']
+    for index, (scale, _) in enumerate(outputs):
+        filters.append(f'[t{index}]{scale}[out{index}]')
+
+    command = [
+        'ffmpeg',
+        '-y',
+        '-ss', f'{seek_position:.3f}',
+        '-t', str(settings.THUMBNAIL_SEARCH_SECONDS),
+        '-i', input_path,
+        '-filter_complex', ';'.join(filters),
+    ]
+    for index, (_, output_path) in enumerate(outputs):
+        command += ['-map', f'[out{index}]', '-frames:v', '1', output_path]
+    return command
+
 
 def generate_thumbnail(video_instance: Video):
     """
-    Generate a thumbnail from the video using FFmpeg.
+    Generate all thumbnail sizes of the video in a single FFmpeg run.
     """
     input_path = video_instance.video_file.path
     base_name = os.path.splitext(os.path.basename(input_path))[0]
     
-    output_dir = os.path.join('media', 'thumbnails')
+    output_dir = os.path.join(settings.MEDIA_ROOT, 'thumbnails')
     os.makedirs(output_dir, exist_ok=True)
     
-    output_path = os.path.join(output_dir, f"{base_name}_thumb.jpg")
+    outputs = [
+        (scale, os.path.join(output_dir, f"{base_name}_{suffix}"))
+        for suffix, scale in THUMBNAIL_VARIANTS.values()
+    ]
+    seek_position = get_thumbnail_seek_position(video_instance.duration)
     
-    logger.info(f"Generating thumbnail for {input_path}")
+    logger.info(f"Generating thumbnails for {input_path} at {seek_position:.1f}s")
     
-    command = [
+    for _, output_path in outputs:
+        if os.path.exists(output_path):
+            os.remove(output_path)
+    
+    try:
+        command = build_thumbnail_command(input_path, outputs, seek_position)
+        subprocess.run(command, check=True, capture_output=True, text=True)
+        if not os.path.exists(outputs[0][1]):
+            logger.info("No bright frame found, falling back to the darker frames")
+            command = build_thumbnail_command(
+                input_path, outputs, seek_position, skip_dark_frames=False)
+            subprocess.run(command, check=True, capture_output=True, text=True)
+    except subprocess.CalledProcessError as e:
+        logger.error(f"Error generating thumbnail: {e.stderr}")
+        return
+    
+    for field_name, (suffix, _) in THUMBNAIL_VARIANTS.items():
+        setattr(video_instance, field_name, os.path.join('thumbnails', f"{base_name}_{suffix}"))
+    video_instance.save(update_fields=list(THUMBNAIL_VARIANTS))
+    logger.info(f"Thumbnails generated successfully for video {video_instance.id}")
+
+
+TRICKPLAY_COLUMNS = 10
+TRICKPLAY_ROWS = 10
+
+
+def get_trickplay_tile_size(source_width, source_height):
+    width = settings.TRICKPLAY_TILE_WIDTH
+    if not source_width or not source_height:
+        return width, int(width * 9 / 16) // 2 * 2
+    return width, max(int(round(width * source_height / source_width / 2)) * 2, 2)
+
+
+def build_sprite_command(input_path, output_pattern, interval, tile_size):
+    """
+    Build one ffmpeg command that samples a frame every ``interval`` seconds
+    and tiles the frames into sprite sheets. Only keyframes are decoded, which
+    is accurate enough for scrub previews and far cheaper than a full decode.
+    """
+    tile_width, tile_height = tile_size
+    return [
         'ffmpeg',
+        '-y',
+        '-skip_frame', 'nokey',
         '-i', input_path,
-        '-ss', '00:00:01',  
-        '-vframes', '1',
-        '-vf', 'scale=320:-1',  
-        '-y',  
-        output_path
+        '-an', '-sn',
+        '-vf', (
+            f'fps=1/{interval},scale={tile_width}:{tile_height},'
+            f'tile={TRICKPLAY_COLUMNS}x{TRICKPLAY_ROWS}'),
+        '-q:v', '5',
+        output_pattern
     ]
-    
+
+
+def format_vtt_timestamp(seconds):
+    hours, remainder = divmod(seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    return f'{int(hours):02d}:{int(minutes):02d}:{seconds:06.3f}'
+
+
+def build_trickplay_vtt(duration, interval, tile_size, sprite_name):
+    """
+    Build the WebVTT index that maps every time range to its tile, using
+    media fragment coordinates (``sprite.jpg#xywh=x,y,w,h``). ``sprite_name``
+    formats the 1-based sprite number into the file name.
+    """
+    tile_width, tile_height = tile_size
+    per_sprite = TRICKPLAY_COLUMNS * TRICKPLAY_ROWS
+    lines = ['WEBVTT', '']
+    for index in range(math.ceil(duration / interval)):
+        start = index * interval
+        end = min(start + interval, duration)
+        sprite, position = divmod(index, per_sprite)
+        row, column = divmod(position, TRICKPLAY_COLUMNS)
+        lines.append(f'{format_vtt_timestamp(start)} --> {format_vtt_timestamp(end)}')
+        lines.append(
+            f'{sprite_name(sprite + 1)}#xywh={column * tile_width},{row * tile_height},'
+            f'{tile_width},{tile_height}')
+        lines.append('')
+    return '\n'.join(lines)
+
+
+def generate_trickplay(video_instance: Video):
+    """
+    Generate sprite sheets and the WebVTT index for seek previews.
+    """
+    if not video_instance.duration:
+        probe_source(video_instance)
+    if not video_instance.duration:
+        logger.warning(f"Unknown duration, skipping trickplay for video {video_instance.id}")
+        return
+
+    relative_dir = os.path.join('videos', 'trickplay', str(video_instance.id))
+    output_dir = os.path.join(settings.MEDIA_ROOT, relative_dir)
+    os.makedirs(output_dir, exist_ok=True)
+
+    interval = settings.TRICKPLAY_INTERVAL_SECONDS
+    tile_size = get_trickplay_tile_size(
+        video_instance.source_width, video_instance.source_height)
+    command = build_sprite_command(
+        video_instance.video_file.path,
+        os.path.join(output_dir, 'sprite_%03d.jpg'),
+        interval,
+        tile_size)
+
+    logger.info(f"Generating trickplay sprites for video {video_instance.id}")
     try:
         subprocess.run(command, check=True, capture_output=True, text=True)
-        relative_path = os.path.join('thumbnails', f"{base_name}_thumb.jpg")
-        video_instance.thumbnail = relative_path
-        video_instance.save()
-        logger.info(f"Thumbnail generated successfully: {relative_path}")
     except subprocess.CalledProcessError as e:
-        logger.error(f"Error generating thumbnail: {e.stderr}") 
\ No newline at end of file
+        logger.error(f"Error generating trickplay sprites: {e.stderr}")
+        return
+
+    vtt = build_trickplay_vtt(
+        video_instance.duration, interval, tile_size, lambda number: f'sprite_{number:03d}.jpg')
+    with open(os.path.join(output_dir, 'thumbnails.vtt'), 'w') as f:
+        f.write(vtt)
+
+    video_instance.trickplay_vtt = os.path.join(relative_dir, 'thumbnails.vtt')
+    video_instance.save(update_fields=['trickplay_vtt'])
+    logger.info(f"Trickplay sprites generated successfully for video {video_instance.id}")
@@ -1,13 +1,24 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
-from .models import Video
-import django_rq
-from .tasks import process_video
+from .models import UserVideoProgress, Video
+from .cache import invalidate_catalogue, invalidate_continue_watching
+from .tasks import enqueue_video_processing
 
 
 @receiver(post_save, sender=Video)
 def video_upload_handler(sender, instance, created, **kwargs):
     if created and instance.video_file:
         instance.refresh_from_db()
-        queue = django_rq.get_queue('default')
-        queue.enqueue(process_video, instance.id)
+        enqueue_video_processing(instance.id)
+
+
+@receiver(post_save, sender=Video)
+@receiver(post_delete, sender=Video)
+def video_catalogue_invalidation_handler(sender, instance, **kwargs):
+    invalidate_catalogue()
+
+
+@receiver(post_save, sender=UserVideoProgress)
+@receiver(post_delete, sender=UserVideoProgress)
+def continue_watching_invalidation_handler(sender, instance, **kwargs):
+    invalidate_continue_watching(instance.user_id)
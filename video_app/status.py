@@ -0,0 +1,92 @@
+from django.conf import settings
+from django_redis import get_redis_connection
+from .cache import invalidate_catalogue
+from .models import Video
+
+QUEUED = 'queued'
+PROBING = 'probing'
+ENCODING = 'encoding'
+PACKAGING = 'packaging'
+READY = 'ready'
+FAILED = 'failed'
+
+RENDITION_PREFIX = 'rendition:'
+
+
+def get_status_key(video_id):
+    return f'videoflix:video_status:{video_id}'
+
+
+def set_processing_status(video_id, status, error='', renditions=()):
+    """
+    Store a pipeline stage on the video and in a Redis hash that the status
+    endpoint reads. ``renditions`` starts a fresh per-rendition progress map.
+    """
+    Video.objects.filter(pk=video_id).update(
+        processing_status=status, processing_error=error)
+    invalidate_catalogue()
+
+    key = get_status_key(video_id)
+    connection = get_redis_connection('default')
+    pipeline = connection.pipeline()
+    pipeline.delete(key)
+    pipeline.hset(key, mapping={
+        'status': status,
+        'error': error,
+        **{RENDITION_PREFIX + resolution: 0 for resolution in renditions},
+    })
+    pipeline.expire(key, settings.VIDEO_JOB_TIMEOUT)
+    pipeline.execute()
+
+
+def set_rendition_progress(video_id, resolution, percent):
+    """
+    Update the progress of one rendition. Each rendition has its own hash
+    field, so parallel rendition jobs do not overwrite each other.
+    """
+    key = get_status_key(video_id)
+    connection = get_redis_connection('default')
+    pipeline = connection.pipeline()
+    pipeline.hset(key, RENDITION_PREFIX + resolution, percent)
+    pipeline.expire(key, settings.VIDEO_JOB_TIMEOUT)
+    pipeline.execute()
+
+
+def get_live_processing_status(video_id):
+    """
+    The status of a running or recently finished pipeline, read from Redis
+    only, or ``None`` if there is none.
+    """
+    values = get_redis_connection('default').hgetall(get_status_key(video_id))
+    if not values:
+        return None
+    values = {key.decode(): value.decode() for key, value in values.items()}
+    return {
+        'id': video_id,
+        'status': values['status'],
+        'error': values.get('error', ''),
+        'renditions': {
+            key[len(RENDITION_PREFIX):]: int(value)
+            for key, value in values.items() if key.startswith(RENDITION_PREFIX)
+        },
+    }
+
+
+def get_processing_status(video_id):
+    """
+    Return the current stage of a video, or ``None`` if it does not exist.
+    Finished or stale pipelines fall back to the stored status.
+    """
+    state = get_live_processing_status(video_id)
+    if state is not None:
+        return state
+    video = Video.objects.filter(pk=video_id).values(
+        'processing_status', 'processing_error').first()
+    if video is None:
+        return None
+    return {
+        'id': video_id,
+        'status': video['processing_status'],
+        'error': video['processing_error'],
+        'renditions': {},
+    }
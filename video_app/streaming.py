@@ -0,0 +1,179 @@
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.http import http_date, parse_etags
+from django.views.decorators.http import require_safe
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+class RangeFile:
+    """
+    Expose ``length`` bytes of an open file, starting at its current position.
+    ``fileno`` is kept so WSGI servers can still hand the range to
+    ``os.sendfile`` (gunicorn sends exactly ``Content-Length`` bytes from the
+    current offset), while plain iteration stops at the end of the range.
+    """
+
+    def __init__(self, file, length):
+        self.file = file
+        self.name = file.name
+        self.remaining = length
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+def parse_range_header(header, size):
+    """
+    Return the inclusive ``(start, end)`` of a single byte range, or ``None``
+    when the header is not a single range we serve partially (the full file is
+    sent instead, which RFC 9110 allows).
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        length = int(last)
+        if length == 0:
+            raise RangeNotSatisfiable()
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise RangeNotSatisfiable()
+    return start, end
+
+
+def get_etag(stat):
+    return f'"{int(stat.st_mtime):x}-{stat.st_size:x}"'
+
+
+def if_none_match_matches(request, etag):
+    """
+    Whether ``If-None-Match`` lists ``etag`` or is ``*``. The comparison is
+    weak (RFC 9110 13.1.2), so ``W/`` prefixes are ignored.
+    """
+    if_none_match = request.headers.get('If-None-Match')
+    if not if_none_match:
+        return False
+    etags = parse_etags(if_none_match)
+    if etags == ['*']:
+        return True
+    return etag in (tag.removeprefix('W/') for tag in etags)
+
+
+def if_range_matches(request, etag, last_modified):
+    if_range = request.headers.get('If-Range')
+    return not if_range or if_range in (etag, last_modified)
+
+
+def get_content_type(path):
+    content_type, _ = mimetypes.guess_type(path)
+    return content_type or 'application/octet-stream'
+
+
+def resolve_media_path(path):
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404
+    if not os.path.isfile(full_path):
+        raise Http404
+    return full_path
+
+
+def get_offload_headers(path, full_path):
+    """
+    Headers that let the front proxy send the file itself. nginx handles
+    ranges on ``X-Accel-Redirect`` responses on its own.
+    """
+    if settings.MEDIA_ACCEL_REDIRECT_PREFIX:
+        return {'X-Accel-Redirect': settings.MEDIA_ACCEL_REDIRECT_PREFIX + quote(path)}
+    if settings.MEDIA_X_SENDFILE:
+        return {'X-Sendfile': full_path}
+    return None
+
+
+def file_response(full_path, start, length, status, content_type):
+    file = open(full_path, 'rb')
+    if status == 206:
+        file.seek(start)
+        return FileResponse(RangeFile(file, length), status=status, content_type=content_type)
+    return FileResponse(file, content_type=content_type)
+
+
+def build_media_response(request, path, respond):
+    """
+    Conditional and range handling shared by the sync and async media views.
+    ``respond(full_path, start, length, status, content_type)`` creates the
+    response carrying the body.
+    """
+    full_path = resolve_media_path(path)
+    stat = os.stat(full_path)
+    etag = get_etag(stat)
+    last_modified = http_date(stat.st_mtime)
+    content_type = get_content_type(full_path)
+
+    if if_none_match_matches(request, etag):
+        return HttpResponseNotModified(headers={'ETag': etag})
+
+    offload_headers = get_offload_headers(path, full_path)
+    if offload_headers:
+        response = HttpResponse(content_type=content_type, headers=offload_headers)
+        response['ETag'] = etag
+        response['Last-Modified'] = last_modified
+        return response
+
+    byte_range = None
+    range_header = request.headers.get('Range')
+    if range_header and if_range_matches(request, etag, last_modified):
+        try:
+            byte_range = parse_range_header(range_header, stat.st_size)
+        except RangeNotSatisfiable:
+            return HttpResponse(status=416, headers={'Content-Range': f'bytes */{stat.st_size}'})
+
+    if byte_range:
+        start, end = byte_range
+        response = respond(full_path, start, end - start + 1, 206, content_type)
+        response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+    else:
+        start, end = 0, stat.st_size - 1
+        response = respond(full_path, 0, stat.st_size, 200, content_type)
+    response['Content-Length'] = end - start + 1
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = last_modified
+    return response
+
+
+@require_safe
+def serve_media(request, path):
+    """
+    Serve a file from MEDIA_ROOT with ``Range``/``If-Range``/``ETag`` support.
+    """
+    return build_media_response(request, path, file_response)
@@ -1,91 +1,582 @@
 from django.conf import settings
 from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
+import hashlib
+import logging
 import os
+import shutil
 import subprocess
+import uuid
+from datetime import timedelta
 import django_rq
-from moviepy import VideoFileClip
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django_redis import get_redis_connection
+from rq.job import Dependency, Job, JobStatus
 from django.core.files import File
-import io
-from PIL import Image
-from .models import Video
-import time
+from .cache import invalidate_catalogue
+from .models import UploadSession, Video, VideoSource
+from .profiles import build_encoder_args, build_global_args, get_encoder_profile
+from .services import (
+    RENDITION_QUALITIES,
+    build_rendition_command,
+    build_rendition_ladder,
+    ensure_source_sha256,
+    generate_thumbnail,
+    generate_trickplay,
+    package_adaptive_streams,
+    package_preview_stream,
+    probe_source,
+    reuse_duplicate_outputs,
+    run_ffmpeg,
+)
+from .status import (
+    ENCODING, FAILED, PACKAGING, PROBING, READY,
+    set_processing_status, set_rendition_progress,
+)
 
+logger = logging.getLogger(__name__)
 
-def process_video(video_id):
+# Part of the job id of process_video. Bump it when the pipeline produces
+# different outputs, so finished jobs of the old version do not count.
+PIPELINE_VERSION = 1
+
+PROCESSING_LOCK_KEY = 'videoflix:video_processing:{}'
+RERUN_KEY = 'videoflix:video_rerun:{}'
+ENQUEUE_LOCK_KEY = 'videoflix:video_enqueue:{}'
+
+IN_FLIGHT_STATUSES = (
+    JobStatus.QUEUED, JobStatus.DEFERRED, JobStatus.SCHEDULED, JobStatus.STARTED)
+
+
+def get_process_job_id(video_id):
+    return f'video-{video_id}-v{PIPELINE_VERSION}'
+
+
+def enqueue_video_processing(video_id):
+    """
+    The single entry point for (re)processing a video. A video that is
+    already queued is not enqueued again; requests for a video that is being
+    processed are coalesced into one rerun after the current pipeline.
+    Returns the queued job, or ``None`` if a rerun was scheduled.
+    """
+    connection = get_redis_connection('default')
+    queue = get_video_queue('process' if settings.VIDEO_TRANSCODE_FANOUT else 'serial')
+    job_id = get_process_job_id(video_id)
+    with connection.lock(ENQUEUE_LOCK_KEY.format(video_id), timeout=30):
+        if connection.exists(PROCESSING_LOCK_KEY.format(video_id)):
+            connection.set(RERUN_KEY.format(video_id), 1, ex=settings.VIDEO_LOCK_TIMEOUT)
+            logger.info(f"Video {video_id} is being processed, rerun scheduled")
+            return None
+        job = queue.fetch_job(job_id)
+        if job is not None:
+            if job.get_status() in IN_FLIGHT_STATUSES:
+                return job
+            job.delete()
+        return queue.enqueue(
+            process_video, video_id, job_id=job_id, job_timeout=settings.VIDEO_JOB_TIMEOUT)
+
+
+def finalize_upload(session_id):
+    """
+    Verify the checksum of a complete resumable upload and create its Video,
+    which starts processing. Runs in a worker, so the finalize request does
+    not read a multi-GB file. Returns the id of the new video, or ``None``
+    if the checksum does not match.
+    """
+    session = UploadSession.objects.get(pk=session_id)
     try:
-        video = Video.objects.get(id=video_id)
-        
-        generate_thumbnail(video)
-        
-        convert_video_to_resolutions(video_id)
-        
-        print(f"Video {video_id} erfolgreich verarbeitet")
-        return True
-    except Exception as e:
-        print(f"Fehler bei der Videoverarbeitung: {str(e)}")
+        digest = hashlib.sha256()
+        with open(session.temp_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        if digest.hexdigest() != session.checksum:
+            os.remove(session.temp_path)
+            UploadSession.objects.filter(pk=session_id).update(status='failed', error="Checksum mismatch.")
+            logger.warning(f"Upload {session_id} does not match its checksum")
+            return None
+
+        name = default_storage.get_available_name(
+            os.path.join('videos', os.path.basename(session.filename)))
+        os.makedirs(os.path.dirname(default_storage.path(name)), exist_ok=True)
+        # Not os.replace: UPLOAD_TEMP_DIR may be on another file system.
+        shutil.move(session.temp_path, default_storage.path(name))
+        video = Video.objects.create(
+            title=session.title,
+            description=session.description,
+            category=session.category,
+            video_file=name,
+            source_sha256=session.checksum,
+        )
+    except Exception:
+        logger.exception(f"Error finalizing upload {session_id}")
+        UploadSession.objects.filter(pk=session_id).update(status='failed', error="Upload could not be stored.")
+        raise
+    UploadSession.objects.filter(pk=session_id).update(status='complete', video=video)
+    return video.id
+
+
+def expire_upload_sessions():
+    """
+    Delete unfinished uploads that received no chunk for
+    ``UPLOAD_SESSION_EXPIRY`` seconds, with their partial files. Completed
+    sessions are kept, they link the upload to its video, and so are
+    sessions a worker is verifying. Returns the number of removed sessions.
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.UPLOAD_SESSION_EXPIRY)
+    expired = UploadSession.objects.filter(
+        updated_at__lt=cutoff, status__in=['uploading', 'failed'])
+    count = 0
+    for session in expired:
+        try:
+            os.remove(session.temp_path)
+        except FileNotFoundError:
+            pass
+        session.delete()
+        count += 1
+    return count
+
+
+def acquire_processing_lock(video_id):
+    """
+    Held from the start of ``process_video`` until the last job of the run
+    is done, so no two runs write to the same output paths. Returns the
+    token of the run, or ``None`` if the video is locked.
+    """
+    token = uuid.uuid4().hex
+    if get_redis_connection('default').set(
+            PROCESSING_LOCK_KEY.format(video_id), token, nx=True, ex=settings.VIDEO_LOCK_TIMEOUT):
+        return token
+    return None
+
+
+def finish_processing(video_id, token, keep_lock=True):
+    """
+    End the pipeline run holding ``token`` and return whether a rerun was
+    requested meanwhile. The lock is released, unless a rerun follows and
+    ``keep_lock`` is set. A run whose lock expired and was taken by a newer
+    run leaves the lock and the rerun request to that run.
+    """
+    connection = get_redis_connection('default')
+    key = PROCESSING_LOCK_KEY.format(video_id)
+    with connection.lock(ENQUEUE_LOCK_KEY.format(video_id), timeout=30):
+        if connection.get(key) != token.encode():
+            logger.warning(f"Processing lock of video {video_id} expired before the run finished")
+            return False
+        rerun = connection.getdel(RERUN_KEY.format(video_id)) is not None
+        if rerun and keep_lock:
+            connection.expire(key, settings.VIDEO_LOCK_TIMEOUT)
+        else:
+            connection.delete(key)
+    return rerun
+
+
+def process_video(video_id, fanout=None):
+    """
+    Parent job of the processing pipeline. With ``VIDEO_TRANSCODE_FANOUT``
+    the renditions are encoded by RQ jobs of ``VIDEO_RENDITIONS_PER_JOB``
+    renditions each and ``finalize_video`` runs once all of them are done;
+    otherwise everything runs in this job from a single decode.
+    Returns ``False`` without doing anything if the video is already being
+    processed. Failures are recorded on the video and re-raised, so RQ marks
+    the job as failed.
+    """
+    if fanout is None:
+        fanout = settings.VIDEO_TRANSCODE_FANOUT
+    token = acquire_processing_lock(video_id)
+    if token is None:
+        logger.info(f"Video {video_id} is already being processed")
         return False
+    
+    while True:
+        try:
+            if run_video_pipeline(video_id, fanout, token):
+                return True
+        except Exception as e:
+            logger.exception(f"Error processing video {video_id}")
+            record_failure(video_id, e)
+            if not finish_processing(video_id, token):
+                raise
+            continue
+        if not finish_processing(video_id, token):
+            return True
 
 
-def generate_thumbnail(video):
-    video_clip = VideoFileClip(video.video_file.path)
-    if video_clip.duration < 2:
-        return
-    frame = video_clip.get_frame(5)
-    pil_image = Image.fromarray(frame).convert("RGB")
-    pil_image.thumbnail((200, 150), Image.Resampling.LANCZOS)
-    thumb_io = io.BytesIO()
-    pil_image.save(thumb_io, 'PNG')
-    thumb_dir = os.path.join(settings.MEDIA_ROOT, 'thumbnails')
-    if not os.path.exists(thumb_dir):
-        os.makedirs(thumb_dir)
-    thumb_file_name = os.path.join(thumb_dir, f"{video.title}_thumb.png")
-    with open(thumb_file_name, 'wb') as f:
-        f.write(thumb_io.getvalue())
-    video.thumbnail = os.path.join(
-        'thumbnails', f"{video.title}_thumb.png")
-    video.save()
-    video_clip.close()
+def get_public_error(error):
+    """
+    A short description of a pipeline error without commands or paths.
+    """
+    if isinstance(error, subprocess.CalledProcessError):
+        command = error.cmd if isinstance(error.cmd, (list, tuple)) else str(error.cmd).split()
+        program = os.path.basename(str(command[0])) if command else 'ffmpeg'
+        return f"{program} exited with status {error.returncode}"
+    return "Processing failed"
 
 
-def convert_video_to_resolutions(video_id):
+def record_failure(video_id, error):
+    """
+    Mark a video as failed. ``processing_error`` can be read by anyone
+    through the status endpoints, so it only gets ``get_public_error``; the
+    output of a failed ffmpeg command goes to the log.
+    """
+    if getattr(error, 'stderr', None):
+        logger.error(f"Output of the failed command for video {video_id}:\n{error.stderr}")
+    set_processing_status(video_id, FAILED, error=get_public_error(error))
+
+
+def run_video_pipeline(video_id, fanout, token):
+    """
+    Run the pipeline once. Returns ``True`` if the work was handed to the
+    rendition jobs, which then own the processing lock.
+    """
+    set_processing_status(video_id, PROBING)
+    video = ensure_source_sha256(Video.objects.get(id=video_id))
+    if reuse_duplicate_outputs(video):
+        set_processing_status(video_id, READY)
+        return False
+    
+    video = probe_source(video)
+    
+    if fanout:
+        set_processing_status(video_id, ENCODING, renditions=get_rendition_ladder(video))
+        enqueue_rendition_jobs(video, token)
+        logger.info(f"Video {video_id} dispatched to the workers")
+        return True
+    
+    generate_thumbnail(video)
+    
+    generate_trickplay(video)
+    
+    convert_video_to_resolutions(video_id)
+    
+    set_processing_status(video_id, PACKAGING)
+    package_adaptive_streams(Video.objects.get(id=video_id))
+    
+    convert_video_to_secondary_codecs(video_id)
+    
+    set_processing_status(video_id, READY)
+    logger.info(f"Video {video_id} processed successfully")
+    return False
+
+
+def get_rendition_ladder(video):
+    return build_rendition_ladder(video.source_height, video.source_bitrate)
+
+
+def get_video_queue(stage):
+    """
+    The RQ queue a pipeline stage runs on, see ``VIDEO_QUEUE_ROUTING``.
+    """
+    return django_rq.get_queue(settings.VIDEO_QUEUE_ROUTING[stage])
+
+
+def enqueue_rendition_jobs(video, token):
+    """
+    Enqueue the pipeline of a probed video. The thumbnail and the lowest
+    rendition go to the preview queue and are published as soon as they are
+    done; everything else runs on the encode queue. The video is ready once
+    ``finalize_video`` has packaged the H.264 renditions; the processing lock
+    of the run (``token``) is held until every job is done.
+    """
+    timeout = settings.VIDEO_JOB_TIMEOUT
+    # The finalizer may run hours after the first renditions are done; keep
+    # their job records as long as the run may hold the lock.
+    rendition_options = {
+        'job_timeout': timeout,
+        'result_ttl': settings.VIDEO_LOCK_TIMEOUT,
+        'failure_ttl': settings.VIDEO_LOCK_TIMEOUT,
+    }
+    preview_queue = get_video_queue('preview')
+    ladder = list(get_rendition_ladder(video))
+    preview_resolution = ladder[0]
+    
+    other_jobs = [preview_queue.enqueue(generate_thumbnail_job, video.id, job_timeout=timeout)]
+    rendition_jobs = {
+        preview_resolution: preview_queue.enqueue(
+            transcode_rendition, video.id, preview_resolution, **rendition_options)
+    }
+    # allow_failure so a failed preview encode does not leave the job
+    # deferred; publish_preview checks the result itself.
+    other_jobs.append(preview_queue.enqueue(
+        publish_preview,
+        video.id,
+        preview_resolution,
+        rendition_jobs[preview_resolution].id,
+        depends_on=Dependency(
+            jobs=[rendition_jobs[preview_resolution].id],
+            allow_failure=True,
+            enqueue_at_front=True),
+        job_timeout=timeout,
+    ))
+    
+    rendition_queue = get_video_queue('rendition')
+    group_size = max(settings.VIDEO_RENDITIONS_PER_JOB, 1)
+    for start in range(1, len(ladder), group_size):
+        group = ladder[start:start + group_size]
+        job = rendition_queue.enqueue(transcode_rendition, video.id, *group, **rendition_options)
+        rendition_jobs.update(dict.fromkeys(group, job))
+    other_jobs.append(
+        get_video_queue('trickplay').enqueue(generate_trickplay_job, video.id, job_timeout=timeout))
+    secondary_queue = get_video_queue('secondary')
+    for codec in settings.VIDEO_SECONDARY_CODECS:
+        for resolution in ladder:
+            other_jobs.append(secondary_queue.enqueue(
+                transcode_secondary_rendition, video.id, codec, resolution, job_timeout=timeout))
+    finalize_queue = get_video_queue('finalize')
+    finalizer = finalize_queue.enqueue(
+        finalize_video,
+        video.id,
+        {resolution: job.id for resolution, job in rendition_jobs.items()},
+        depends_on=Dependency(
+            jobs=list(dict.fromkeys(job.id for job in rendition_jobs.values())),
+            allow_failure=True,
+            enqueue_at_front=True),
+        job_timeout=timeout,
+    )
+    return finalize_queue.enqueue(
+        end_processing_run,
+        video.id,
+        token,
+        depends_on=Dependency(
+            jobs=[finalizer.id, *(job.id for job in other_jobs)],
+            allow_failure=True,
+            enqueue_at_front=True),
+        job_timeout=timeout,
+    )
+
+
+def generate_thumbnail_job(video_id):
+    generate_thumbnail(Video.objects.get(id=video_id))
+
+
+def generate_trickplay_job(video_id):
+    generate_trickplay(Video.objects.get(id=video_id))
+
+
+def transcode_rendition(video_id, *resolutions):
+    """
+    Encode one or more renditions from a single decode of the source and
+    return their paths relative to MEDIA_ROOT by resolution. Errors are
+    raised so that RQ marks the job as failed.
+    """
     video = Video.objects.get(id=video_id)
-    input_path = video.video_file.path
-    base_name = os.path.splitext(os.path.basename(input_path))[0]
+    command, outputs = build_video_rendition_command(video, list(resolutions))
+    
+    def report_progress(percent):
+        for resolution in resolutions:
+            set_rendition_progress(video_id, resolution, percent)
+    
+    run_ffmpeg(command, video.duration, report_progress)
+    
+    logger.info(f"Video {video_id} converted to {', '.join(resolutions)}")
+    return {
+        resolution: os.path.relpath(path, settings.MEDIA_ROOT)
+        for resolution, path in outputs.items()
+    }
+
+
+def transcode_secondary_rendition(video_id, codec, resolution):
+    """
+    Encode one rendition with the encoder profile ``codec`` and store it as
+    a ``VideoSource``. These renditions are optional and not part of the
+    HLS/DASH packages, so the finalizer does not wait for them.
+    """
+    video = Video.objects.get(id=video_id)
+    command, outputs = build_video_rendition_command(video, [resolution], codec)
+    run_ffmpeg(command)
+    save_video_sources(video, codec, outputs)
+    logger.info(f"Video {video_id} converted to {codec} {resolution}")
+
+
+def publish_preview(video_id, resolution, job_id):
+    """
+    Make a new video playable with its first finished rendition while the
+    rest of the ladder is still being encoded. Only the preview rendition is
+    packaged, into its own directory, and only published while the video is
+    encoding and has no package yet, so it never replaces the package of an
+    earlier run or the one ``finalize_video`` writes.
+    """
+    connection = django_rq.get_connection(settings.VIDEO_QUEUE_ROUTING['preview'])
+    video = Video.objects.get(id=video_id)
+    name = get_rendition_name(video.video_file.name, resolution)
+    if not rendition_succeeded(Job.fetch_many([job_id], connection=connection)[0], name):
+        logger.warning(f"Preview rendition {resolution} of video {video_id} failed, nothing to publish")
+        return
+    Video.objects.filter(pk=video_id).update(**{f'video_{resolution}': name})
+    video = Video.objects.get(id=video_id)
+    if video.hls_playlist:
+        return
+    playlist = package_preview_stream(video, resolution)
+    if playlist is None:
+        return
+    published = Video.objects.filter(
+        Q(hls_playlist='') | Q(hls_playlist__isnull=True),
+        pk=video_id, processing_status=ENCODING,
+    ).update(hls_playlist=playlist)
+    if published:
+        invalidate_catalogue()
+        logger.info(f"Preview of video {video_id} playable in {resolution}")
+
+
+def finalize_video(video_id, rendition_job_ids):
+    """
+    Collect the results of the rendition jobs, store them on the video in a
+    single UPDATE and package the finished renditions for streaming. The
+    video only fails when no rendition could be encoded.
+    """
+    store_rendition_results(video_id, rendition_job_ids)
+
+
+def end_processing_run(video_id, token):
+    """
+    Runs after every job of a fanned out run, failed or not. Releases the
+    processing lock and starts a requested rerun.
+    """
+    if finish_processing(video_id, token, keep_lock=False):
+        enqueue_video_processing(video_id)
+
+
+def rendition_succeeded(job, name):
+    """
+    Whether the rendition job ``job`` wrote ``name``. A job whose record
+    expired counts as done if its output exists.
+    """
+    if job is None:
+        return default_storage.exists(name)
+    return job.is_finished
+
+
+def store_rendition_results(video_id, rendition_job_ids):
+    connection = django_rq.get_connection(settings.VIDEO_QUEUE_ROUTING['finalize'])
+    resolutions = list(rendition_job_ids)
+    jobs = Job.fetch_many(
+        [rendition_job_ids[resolution] for resolution in resolutions],
+        connection=connection)
+    source_name = Video.objects.values_list('video_file', flat=True).get(pk=video_id)
     
-    resolutions = {
-        '120p': 120,
-        '360p': 360,
-        '720p': 720,
-        '1080p': 1080
+    fields = {
+        f'video_{resolution}': None
+        for resolution in RENDITION_QUALITIES if resolution not in resolutions
     }
+    for resolution, job in zip(resolutions, jobs):
+        name = get_rendition_name(source_name, resolution)
+        if rendition_succeeded(job, name):
+            fields[f'video_{resolution}'] = name
+        else:
+            logger.error(f"Converting video {video_id} to {resolution} failed")
+    
+    with transaction.atomic():
+        Video.objects.filter(pk=video_id).update(**fields)
+    invalidate_catalogue()
+    
+    if not any(fields.values()):
+        set_processing_status(video_id, FAILED, error="All renditions failed to encode")
+        return
     
-    for resolution, height in resolutions.items():
-        output_path = os.path.join(settings.MEDIA_ROOT, f'videos/{resolution}', f'{base_name}_{resolution}.mp4')
-        
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        
-        command = [
-            'ffmpeg',
-            '-i', input_path,
-            '-vf', f'scale=-2:{height}',
-            '-c:v', 'libx264',
-            '-crf', '23',
-            '-preset', 'medium',
-            '-c:a', 'aac',
-            '-b:a', '128k',
-            output_path
-        ]
-        
+    try:
+        set_processing_status(video_id, PACKAGING)
+        package_adaptive_streams(Video.objects.get(id=video_id))
+    except Exception as e:
+        logger.exception(f"Error packaging video {video_id}")
+        record_failure(video_id, e)
+        raise
+    set_processing_status(video_id, READY)
+    logger.info(f"Video {video_id} processed successfully")
+
+
+def get_rendition_name(input_path, resolution, codec=None):
+    """
+    Path of a rendition relative to MEDIA_ROOT. Depends only on the source
+    file, so the finalizer does not need the results of the encode jobs.
+    """
+    base_name = os.path.splitext(os.path.basename(input_path))[0]
+    directory = f'videos/{codec}/{resolution}' if codec else f'videos/{resolution}'
+    return f'{directory}/{base_name}_{resolution}.mp4'
+
+
+def get_rendition_output_path(input_path, resolution, codec=None):
+    output_path = os.path.join(settings.MEDIA_ROOT, get_rendition_name(input_path, resolution, codec))
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    return output_path
+
+
+def build_video_rendition_command(video, resolutions, codec=None):
+    """
+    Build the encode command for ``resolutions`` of the ladder with the
+    encoder profile ``codec`` (default profile if ``None``). Returns the
+    command and the output path of every resolution.
+    """
+    input_path = video.video_file.path
+    ladder = get_rendition_ladder(video)
+    profile = get_encoder_profile(codec)
+    outputs = {
+        resolution: get_rendition_output_path(input_path, resolution, codec)
+        for resolution in resolutions
+    }
+    command = build_rendition_command(
+        input_path,
+        [
+            (
+                ladder[resolution]['height'],
+                output_path,
+                build_encoder_args(profile, ladder[resolution]['bitrate']),
+            )
+            for resolution, output_path in outputs.items()
+        ],
+        build_global_args(profile))
+    return command, outputs
+
+
+def save_video_sources(video, codec, outputs):
+    ladder = get_rendition_ladder(video)
+    maxrate_factor = get_encoder_profile(codec)['maxrate_factor']
+    for resolution, output_path in outputs.items():
+        VideoSource.objects.update_or_create(
+            video=video, codec=codec, resolution=resolution,
+            defaults={
+                'file': os.path.relpath(output_path, settings.MEDIA_ROOT),
+                'bitrate': int(ladder[resolution]['bitrate'] * maxrate_factor) if maxrate_factor else None,
+            })
+    invalidate_catalogue()
+
+
+def convert_video_to_secondary_codecs(video_id):
+    """
+    Serial counterpart of ``transcode_secondary_rendition``: one pass per
+    codec for the whole ladder. Failures are logged, the H.264 renditions
+    stay usable.
+    """
+    video = Video.objects.get(id=video_id)
+    for codec in settings.VIDEO_SECONDARY_CODECS:
+        command, outputs = build_video_rendition_command(
+            video, list(get_rendition_ladder(video)), codec)
         try:
-            subprocess.run(command, check=True, capture_output=True)
-            
-            relative_path = os.path.relpath(output_path, settings.MEDIA_ROOT)
-            setattr(video, f'video_{resolution}', relative_path)
-            video.save()
-            
-            print(f"Video erfolgreich in {resolution} konvertiert")
-            
-        except subprocess.CalledProcessError as e:
-            print(f"Fehler bei der Konvertierung zu {resolution}: {e.stderr.decode()}")
+            run_ffmpeg(command)
+        except Exception:
+            logger.exception(f"Converting video {video_id} to {codec} failed")
             continue
+        save_video_sources(video, codec, outputs)
+
+
+def convert_video_to_resolutions(video_id):
+    video = Video.objects.get(id=video_id)
+    ladder = get_rendition_ladder(video)
+    command, outputs = build_video_rendition_command(video, list(ladder))
+    
+    set_processing_status(video_id, ENCODING, renditions=ladder)
+    
+    def report_progress(percent):
+        for resolution in ladder:
+            set_rendition_progress(video_id, resolution, percent)
+    
+    run_ffmpeg(command, video.duration, report_progress)
+    
+    for resolution in RENDITION_QUALITIES:
+        setattr(video, f'video_{resolution}', None)
+    for resolution, output_path in outputs.items():
+        relative_path = os.path.relpath(output_path, settings.MEDIA_ROOT)
+        setattr(video, f'video_{resolution}', relative_path)
+    video.save(update_fields=[f'video_{resolution}' for resolution in RENDITION_QUALITIES])
+    
+    logger.info(f"Video {video_id} converted to {', '.join(ladder)}")
@@ -0,0 +1,184 @@
+import asyncio
+import itertools
+import json
+import os
+import shutil
+import tempfile
+import threading
+from unittest.mock import patch
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.test import AsyncClient, TestCase, override_settings
+from django.urls import reverse
+from django_redis import get_redis_connection
+from rest_framework.authtoken.models import Token
+from video_app.models import Video
+from video_app.progress import PROGRESS_BUFFER_KEY, PROGRESS_FLUSHING_KEY
+from video_app.status import get_status_key, set_processing_status
+
+
+class AsyncMediaStreamingTestCase(TestCase):
+    def setUp(self):
+        """Vorbereitungen für die Tests"""
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        override = override_settings(
+            MEDIA_ROOT=self.media_root, MEDIA_ACCEL_REDIRECT_PREFIX='', MEDIA_X_SENDFILE=False)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.content = bytes(range(100))
+        with open(f"{self.media_root}/clip.mp4", 'wb') as f:
+            f.write(self.content)
+        self.client = AsyncClient()
+        self.url = reverse('stream-media', kwargs={'path': 'clip.mp4'})
+
+    async def read(self, response):
+        return b''.join([chunk async for chunk in response.streaming_content])
+
+    async def test_full_file(self):
+        """Test für das asynchrone Ausliefern der ganzen Datei"""
+        response = await self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Length'], '100')
+        self.assertEqual(await self.read(response), self.content)
+
+    async def test_range(self):
+        """Test für das asynchrone Ausliefern eines Bereichs"""
+        with patch('video_app.async_views.STREAM_CHUNK_SIZE', 4):
+            response = await self.client.get(self.url, headers={'Range': 'bytes=10-19'})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 10-19/100')
+        self.assertEqual(await self.read(response), self.content[10:20])
+
+    async def test_not_modified(self):
+        """Test für die Antwort 304 bei unveränderter Datei"""
+        response = await self.client.get(self.url)
+        response = await self.client.get(self.url, headers={'If-None-Match': response['ETag']})
+        self.assertEqual(response.status_code, 304)
+
+    async def test_missing_file(self):
+        """Test für eine nicht vorhandene Datei"""
+        response = await self.client.get(reverse('stream-media', kwargs={'path': 'missing.mp4'}))
+        self.assertEqual(response.status_code, 404)
+
+    async def test_stat_off_event_loop(self):
+        """Test, dass die Datei nicht im Thread der Event-Loop geprüft wird"""
+        loop_thread = threading.current_thread()
+        stat_threads = []
+        stat = os.stat
+
+        def tracking_stat(*args, **kwargs):
+            stat_threads.append(threading.current_thread())
+            return stat(*args, **kwargs)
+
+        with patch('video_app.streaming.os.stat', side_effect=tracking_stat):
+            response = await self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(stat_threads)
+        self.assertNotIn(loop_thread, stat_threads)
+
+
+class AsyncProgressHeartbeatTestCase(TestCase):
+    def setUp(self):
+        """Vorbereitungen für die Tests"""
+        self.connection = get_redis_connection('default')
+        self.connection.delete(PROGRESS_BUFFER_KEY, PROGRESS_FLUSHING_KEY)
+        self.user = User.objects.create_user(username="testuser", password="password123")
+        self.token = Token.objects.create(user=self.user)
+        self.video = Video.objects.create(
+            title="Test Video", description="Beschreibung", category="action", video_file="path/to/video.mp4")
+        self.client = AsyncClient()
+        self.url = reverse('stream-progress-heartbeat')
+
+    def send_heartbeat(self, data, token=None):
+        headers = {'Authorization': f'Token {token}'} if token else {}
+        return self.client.post(
+            self.url, json.dumps(data), content_type='application/json', headers=headers)
+
+    async def test_heartbeat(self):
+        """Test für einen asynchronen Heartbeat"""
+        response = await self.send_heartbeat(
+            {"video": self.video.id, "last_viewed_position": 12.5}, token=self.token.key)
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(self.connection.hlen(PROGRESS_BUFFER_KEY), 1)
+
+    async def test_heartbeat_unauthenticated(self):
+        """Test für einen Heartbeat ohne gültiges Token"""
+        response = await self.send_heartbeat({"video": self.video.id, "last_viewed_position": 1})
+        self.assertEqual(response.status_code, 401)
+        response = await self.send_heartbeat(
+            {"video": self.video.id, "last_viewed_position": 1}, token="invalid")
+        self.assertEqual(response.status_code, 401)
+
+    async def test_heartbeat_invalid(self):
+        """Test für einen Heartbeat mit ungültigen Daten"""
+        response = await self.send_heartbeat(
+            {"video": self.video.id, "last_viewed_position": -1}, token=self.token.key)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('last_viewed_position', json.loads(response.content))
+
+
+class VideoStatusStreamTestCase(TestCase):
+    def setUp(self):
+        """Vorbereitungen für die Tests"""
+        self.video = Video.objects.create(
+            title="Test Video", description="Beschreibung", category="action", video_file="path/to/video.mp4")
+        get_redis_connection('default').delete(get_status_key(self.video.pk))
+        self.client = AsyncClient()
+
+    async def read_events(self, response):
+        return [chunk.decode() async for chunk in response.streaming_content]
+
+    async def test_terminal_status(self):
+        """Test, dass der Stream nach einem abgeschlossenen Status endet"""
+        await sync_to_async(set_processing_status)(self.video.pk, 'ready')
+        response = await self.client.get(reverse('stream-video-status', kwargs={'pk': self.video.pk}))
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        events = await self.read_events(response)
+        self.assertEqual(len(events), 1)
+        self.assertEqual(json.loads(events[0][len('data: '):])['status'], 'ready')
+
+    async def test_status_changes(self):
+        """Test für die Events bei Statusänderungen"""
+        states = iter([
+            {'id': self.video.pk, 'status': 'encoding', 'error': '', 'renditions': {}},
+            {'id': self.video.pk, 'status': 'ready', 'error': '', 'renditions': {}},
+        ])
+        with patch('video_app.async_views.STATUS_POLL_SECONDS', 0), \
+                patch('video_app.async_views.get_processing_status', side_effect=lambda pk: next(states)):
+            response = await self.client.get(
+                reverse('stream-video-status', kwargs={'pk': self.video.pk}))
+            events = await self.read_events(response)
+        self.assertEqual(
+            [json.loads(event[len('data: '):])['status'] for event in events],
+            ['encoding', 'ready'])
+
+    async def test_concurrent_streams(self):
+        """Test, dass viele gleichzeitige Streams ihre Redis-Abfragen nicht nacheinander ausführen"""
+        threads = set()
+        calls = itertools.count()
+        # The first two lookups only return once both are running; one after
+        # another, the barrier times out and breaks.
+        barrier = threading.Barrier(2, timeout=5)
+
+        def slow_status(pk):
+            threads.add(threading.current_thread().name)
+            if next(calls) < 2:
+                try:
+                    barrier.wait()
+                except threading.BrokenBarrierError:
+                    pass
+            return {'id': pk, 'status': 'ready', 'error': '', 'renditions': {}}
+
+        url = reverse('stream-video-status', kwargs={'pk': self.video.pk})
+        with patch('video_app.async_views.get_live_processing_status', side_effect=slow_status):
+            responses = await asyncio.gather(*(self.client.get(url) for _ in range(20)))
+        self.assertTrue(all(response.status_code == 200 for response in responses))
+        self.assertFalse(barrier.broken)
+        self.assertGreater(len(threads), 1)
+
+    async def test_unknown_video(self):
+        """Test für den Stream eines nicht vorhandenen Videos"""
+        response = await self.client.get(reverse('stream-video-status', kwargs={'pk': 9999}))
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,89 @@
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+import django
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from video_app.models import Video, VideoSource
+
+
+@override_settings(VIDEO_SECONDARY_CODECS=[])
+@mock.patch('video_app.management.commands.process_videos.enqueue_video_processing')
+class ProcessVideosCommandTestCase(TestCase):
+    def setUp(self):
+        """Vorbereitungen für die Tests"""
+        self.done = Video.objects.create(
+            title="Fertig", description="Beschreibung", category="action", video_file="videos/done.mp4",
+            processing_status='ready', source_height=360, video_120p="videos/120p/done_120p.mp4",
+            video_360p="videos/360p/done_360p.mp4", hls_playlist="videos/hls/1/master.m3u8")
+        self.missing = Video.objects.create(
+            title="Unvollständig", description="Beschreibung", category="action", video_file="videos/missing.mp4",
+            processing_status='ready', source_height=360, video_120p="videos/120p/missing_120p.mp4",
+            hls_playlist="videos/hls/2/master.m3u8")
+
+    def call(self, *args):
+        out = StringIO()
+        call_command('process_videos', *args, stdout=out)
+        return out.getvalue()
+
+    def test_dry_run(self, enqueue):
+        """Test, dass beim Probelauf nichts verarbeitet wird"""
+        with mock.patch('video_app.management.commands.process_videos.process_video') as process_video:
+            output = self.call('--dry-run')
+        process_video.assert_not_called()
+        self.assertIn(f"Would process video {self.done.id}", output)
+        self.assertIn(f"Would process video {self.missing.id}", output)
+
+    def test_only_missing(self, enqueue):
+        """Test, dass nur Videos mit fehlenden Auflösungen ausgewählt werden"""
+        output = self.call('--only-missing', '--dry-run')
+        self.assertNotIn(f"Would process video {self.done.id}", output)
+        self.assertIn(f"Would process video {self.missing.id}", output)
+
+    @override_settings(VIDEO_SECONDARY_CODECS=['hevc'])
+    def test_only_missing_secondary_codec(self, enqueue):
+        """Test, dass ein neu aktivierter Codec als fehlend gilt"""
+        for resolution in ('120p', '360p'):
+            VideoSource.objects.create(
+                video=self.missing, codec='hevc', resolution=resolution, file=f"videos/hevc/{resolution}/x.mp4")
+        output = self.call('--only-missing', '--dry-run')
+        self.assertIn(f"Would process video {self.done.id}", output)
+
+    def test_ids_and_enqueue(self, enqueue):
+        """Test für das Einreihen ausgewählter Videos in die Worker-Queue"""
+        self.call('--ids', str(self.missing.id), '--enqueue')
+        enqueue.assert_called_once_with(self.missing.id)
+
+    def test_since(self, enqueue):
+        """Test für die Auswahl nach Erstellungsdatum"""
+        Video.objects.filter(pk=self.done.pk).update(created_at="2020-01-01T00:00:00Z")
+        output = self.call('--since', '2024-01-01', '--dry-run')
+        self.assertNotIn(f"Would process video {self.done.id}", output)
+        self.assertIn(f"Would process video {self.missing.id}", output)
+
+    def test_checkpoint_resume(self, enqueue):
+        """Test, dass ein abgebrochener Lauf an der gespeicherten Stelle fortgesetzt wird"""
+        checkpoint = os.path.join(tempfile.mkdtemp(), 'checkpoint.txt')
+        with open(checkpoint, 'w') as f:
+            f.write(f"{self.done.id}\n")
+        with mock.patch(
+                'video_app.management.commands.process_videos.process_video',
+                return_value=True) as process_video:
+            output = self.call('--checkpoint', checkpoint)
+        process_video.assert_called_once_with(self.missing.id, fanout=False)
+        self.assertIn("[1/1", output)
+        with open(checkpoint) as f:
+            self.assertEqual(f.read().split(), [str(self.done.id), str(self.missing.id)])
+
+    @mock.patch('video_app.management.commands.process_videos.ProcessPoolExecutor')
+    def test_workers_set_up_django(self, executor, enqueue):
+        """Test, dass Worker-Prozesse Django auch ohne fork initialisieren"""
+        pool = executor.return_value.__enter__.return_value
+        future = pool.submit.return_value
+        future.result.return_value = (self.missing.id, True, None)
+        with mock.patch(
+                'video_app.management.commands.process_videos.as_completed',
+                side_effect=lambda futures: futures):
+            self.call('--ids', str(self.missing.id), '--workers', '2')
+        executor.assert_called_once_with(max_workers=2, initializer=django.setup)
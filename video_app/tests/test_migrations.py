@@ -0,0 +1,31 @@
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+
+
+class ProcessingStatusBackfillTestCase(TransactionTestCase):
+    before = [('video_app', '0018_uservideoprogress_continue_watching_index')]
+    after = [('video_app', '0019_video_processing_status')]
+
+    def setUp(self):
+        """Vorbereitungen für die Tests"""
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.before)
+        Video = executor.loader.project_state(self.before).apps.get_model('video_app', 'Video')
+        self.processed = Video.objects.create(
+            title="Verarbeitet", description="Beschreibung", category="action", video_file="videos/done.mp4",
+            video_360p="videos/360p/done_360p.mp4").id
+        self.unprocessed = Video.objects.create(
+            title="Unverarbeitet", description="Beschreibung", category="action", video_file="videos/new.mp4").id
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_existing_videos_backfilled(self):
+        """Test, dass vorhandene Videos nicht als eingereiht gelten"""
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.after)
+        Video = executor.loader.project_state(self.after).apps.get_model('video_app', 'Video')
+        self.assertEqual(Video.objects.get(pk=self.processed).processing_status, 'ready')
+        self.assertEqual(Video.objects.get(pk=self.unprocessed).processing_status, 'failed')
@@ -1,8 +1,14 @@
+import shutil
+import tempfile
+from unittest import mock
 from django.contrib.auth.models import User
+from django.test import override_settings
 from rest_framework.test import APITestCase, APIRequestFactory
 from rest_framework import status
-from video_app.models import Video, UserVideoProgress
+from video_app.models import Video, UserVideoProgress, VideoSource
 from video_app.api.serializers import VideoSerializer, UserVideoProgressSerializer
+from video_app.serializers import VideoSerializer as MediaVideoSerializer
+from video_app.serializers import UserVideoProgressSerializer as MediaUserVideoProgressSerializer
 from datetime import datetime
 from django.core.files.uploadedfile import SimpleUploadedFile
 
@@ -13,6 +19,11 @@ dummy_file = SimpleUploadedFile(
 class VideoSerializerTestCase(APITestCase):
     def setUp(self):
         """Vorbereitungen für die Tests"""
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        override = override_settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
         self.valid_data = {
             "title": "Test Video",
             "description": "Dies ist ein Testvideo",
@@ -52,6 +63,46 @@ class VideoSerializerTestCase(APITestCase):
         self.assertNotIn("thumbnail", serializer.validated_data)
         self.assertNotIn("video_720p", serializer.validated_data)
 
+    def test_manifest_fields_read_only(self):
+        """Test, dass die Streaming-Manifeste schreibgeschützt sind"""
+        data = self.valid_data.copy()
+        data["hls_playlist"] = "path/to/master.m3u8"
+        data["dash_manifest"] = "path/to/manifest.mpd"
+        serializer = VideoSerializer(data=data)
+        self.assertTrue(serializer.is_valid())
+        self.assertNotIn("hls_playlist", serializer.validated_data)
+        self.assertNotIn("dash_manifest", serializer.validated_data)
+
+    def test_manifest_url_in_output(self):
+        """Test, dass die HLS-Playlist ausgegeben wird"""
+        self.video.hls_playlist = "videos/hls/1/master.m3u8"
+        data = VideoSerializer(self.video).data
+        self.assertEqual(data["hls_playlist"], "/media/videos/hls/1/master.m3u8")
+        self.assertIsNone(data["dash_manifest"])
+
+    def test_sources_grouped_by_codec(self):
+        """Test, dass zusätzliche Codecs nach Codec gruppiert ausgegeben werden"""
+        VideoSource.objects.create(
+            video=self.video, codec="hevc", resolution="720p",
+            file="videos/hevc/720p/video_720p.mp4", bitrate=1750)
+        VideoSource.objects.create(
+            video=self.video, codec="av1", resolution="720p", file="videos/av1/720p/video_720p.mp4")
+        data = VideoSerializer(self.video).data
+        self.assertEqual(data["sources"]["hevc"], [{
+            "resolution": "720p", "file": "/media/videos/hevc/720p/video_720p.mp4", "bitrate": 1750}])
+        self.assertEqual(data["sources"]["av1"][0]["bitrate"], None)
+
+    def test_sources_prefetched(self):
+        """Test, dass die Quellen aller Videos mit einer Abfrage geladen werden"""
+        other = Video.objects.create(**self.valid_data)
+        for video in (self.video, other):
+            VideoSource.objects.create(
+                video=video, codec="hevc", resolution="120p", file="videos/hevc/120p/video_120p.mp4")
+        with self.assertNumQueries(2):
+            data = VideoSerializer(
+                Video.objects.prefetch_related('sources'), many=True).data
+        self.assertTrue(all(video["sources"]["hevc"] for video in data))
+
     def test_create_video(self):
         """Test für das Erstellen eines neuen Videos"""
         serializer = VideoSerializer(data=self.valid_data)
@@ -64,6 +115,11 @@ class VideoSerializerTestCase(APITestCase):
 class UserVideoProgressSerializerTestCase(APITestCase):
     def setUp(self):
         """Vorbereitungen für die Tests"""
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        override = override_settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
         self.user = User.objects.create_user(
             username="testuser", password="password123")
         self.video = Video.objects.create(
@@ -123,3 +179,56 @@ class UserVideoProgressSerializerTestCase(APITestCase):
         self.assertEqual(updated_progress.last_viewed_position, 20.0)
         self.assertTrue(updated_progress.viewed)
         self.assertEqual(updated_progress.user, self.user)
+
+
+class MediaURLResolverTestCase(APITestCase):
+    def setUp(self):
+        """Vorbereitungen für die Tests"""
+        self.user = User.objects.create_user(
+            username="testuser", password="password123")
+        self.video = Video.objects.create(
+            title="Test Video",
+            description="Test Video Beschreibung",
+            category="action",
+            video_file="videos/clip.mp4",
+            video_720p="videos/720p/clip 720p.mp4",
+            hls_playlist="videos/hls/1/master.m3u8",
+        )
+        self.request = APIRequestFactory().get("/api/videos/")
+
+    def test_absolute_urls(self):
+        """Test für absolute URLs aller Auflösungen"""
+        data = MediaVideoSerializer(
+            self.video, context={"request": self.request}).data
+        self.assertEqual(
+            data["video_720p"], "http://testserver/media/videos/720p/clip%20720p.mp4")
+        self.assertEqual(
+            data["hls_playlist"], "http://testserver/media/videos/hls/1/master.m3u8")
+        self.assertIsNone(data["video_1080p"])
+
+    @override_settings(MEDIA_CDN_URL="https://cdn.example.com/media")
+    def test_cdn_base_url(self):
+        """Test für die Basis-URL eines CDN"""
+        data = MediaVideoSerializer(
+            self.video, context={"request": self.request}).data
+        self.assertEqual(
+            data["video_file"], "https://cdn.example.com/media/videos/clip.mp4")
+
+    def test_base_url_built_once(self):
+        """Test, dass die Basis-URL nur einmal pro Anfrage berechnet wird"""
+        videos = [self.video] * 5
+        with mock.patch.object(
+                self.request, "build_absolute_uri", wraps=self.request.build_absolute_uri) as build:
+            MediaVideoSerializer(
+                videos, many=True, context={"request": self.request}).data
+        self.assertEqual(build.call_count, 1)
+
+    def test_compact_nested_video(self):
+        """Test für die kompakte Darstellung im Fortschritt"""
+        progress = UserVideoProgress.objects.create(user=self.user, video=self.video)
+        data = MediaUserVideoProgressSerializer(
+            progress, context={"request": self.request}).data
+        self.assertEqual(data["video"]["title"], "Test Video")
+        self.assertNotIn("video_720p", data["video"])
+        self.assertEqual(
+            data["video"]["hls_playlist"], "http://testserver/media/videos/hls/1/master.m3u8")
@@ -0,0 +1,275 @@
+import tempfile
+from unittest import mock
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, override_settings
+from video_app.profiles import build_encoder_args, build_global_args, get_encoder_profile
+from video_app.services import (
+    build_dash_command,
+    build_hls_command,
+    build_rendition_command,
+    build_rendition_ladder,
+    build_sprite_command,
+    build_thumbnail_command,
+    build_trickplay_vtt,
+    get_trickplay_tile_size,
+    get_thumbnail_seek_position,
+    package_preview_stream,
+    parse_ffmpeg_progress,
+    parse_source_metadata,
+)
+
+
+class BuildRenditionCommandTestCase(SimpleTestCase):
+    def setUp(self):
+        """Vorbereitungen für die Tests"""
+        self.outputs = [
+            (120, 'out_120p.mp4', ['-c:v', 'libx264']),
+            (720, 'out_720p.mp4', ['-c:v', 'libx264']),
+        ]
+
+    def test_single_input(self):
+        """Test, dass die Quelle nur einmal eingelesen wird"""
+        command = build_rendition_command('source.mp4', self.outputs)
+        self.assertEqual(command.count('-i'), 1)
+        self.assertEqual(command[command.index('-i') + 1], 'source.mp4')
+
+    def test_split_filter_graph(self):
+        """Test für den Split-Filter mit einer Skalierung pro Auflösung"""
+        command = build_rendition_command('source.mp4', self.outputs)
+        graph = command[command.index('-filter_complex') + 1]
+        self.assertTrue(graph.startswith('[0:v]split=2[v0][v1]'))
+        self.assertIn('[v0]scale=-2:120[out0]', graph)
+        self.assertIn('[v1]scale=-2:720[out1]', graph)
+
+    def test_global_args_before_input(self):
+        """Test, dass globale Optionen vor der Eingabe stehen"""
+        command = build_rendition_command(
+            'source.mp4', self.outputs, ['-filter_complex_threads', '2'])
+        self.assertLess(command.index('-filter_complex_threads'), command.index('-i'))
+
+    def test_one_output_per_rendition(self):
+        """Test, dass jede Auflösung ihre eigene Ausgabedatei bekommt"""
+        command = build_rendition_command('source.mp4', self.outputs)
+        self.assertEqual(command[-1], 'out_720p.mp4')
+        self.assertIn('out_120p.mp4', command)
+        self.assertIn('[out0]', command)
+        self.assertIn('[out1]', command)
+
+
+class BuildPackagingCommandTestCase(SimpleTestCase):
+    def setUp(self):
+        """Vorbereitungen für die Tests"""
+        self.renditions = [
+            ('120p', '/media/videos/120p/clip_120p.mp4'),
+            ('720p', '/media/videos/720p/clip_720p.mp4'),
+        ]
+
+    def test_hls_copies_streams(self):
+        """Test, dass beim HLS-Packaging nicht neu kodiert wird"""
+        command = build_hls_command(self.renditions, '/out', with_audio=True)
+        self.assertEqual(command[command.index('-c') + 1], 'copy')
+        self.assertEqual(command.count('-i'), 2)
+
+    def test_hls_master_playlist(self):
+        """Test für die Master-Playlist mit einer Variante pro Auflösung"""
+        command = build_hls_command(self.renditions, '/out', with_audio=True)
+        self.assertEqual(command[command.index('-master_pl_name') + 1], 'master.m3u8')
+        self.assertEqual(
+            command[command.index('-var_stream_map') + 1],
+            'v:0,a:0,name:120p v:1,a:1,name:720p')
+
+    def test_hls_without_audio(self):
+        """Test für Videos ohne Tonspur"""
+        command = build_hls_command(self.renditions, '/out', with_audio=False)
+        self.assertEqual(
+            command[command.index('-var_stream_map') + 1],
+            'v:0,name:120p v:1,name:720p')
+        self.assertNotIn('0:a:0', command)
+
+    def test_dash_shared_audio(self):
+        """Test, dass DASH nur eine gemeinsame Tonspur verwendet"""
+        command = build_dash_command(self.renditions, '/out', with_audio=True)
+        self.assertEqual(command.count('0:a:0'), 1)
+        self.assertNotIn('1:a:0', command)
+        self.assertEqual(command[-1], '/out/manifest.mpd')
+
+    @mock.patch('video_app.services.has_audio_stream', return_value=True)
+    @mock.patch('video_app.services.subprocess.run')
+    def test_preview_package(self, run, has_audio_stream):
+        """Test, dass die Vorschau nur die erste Auflösung in ein eigenes Verzeichnis verpackt"""
+        video = mock.Mock(id=7, video_120p=mock.Mock(path=self.renditions[0][1]))
+        with tempfile.TemporaryDirectory() as media_root, override_settings(MEDIA_ROOT=media_root):
+            playlist = package_preview_stream(video, '120p')
+        self.assertEqual(playlist, 'videos/hls/7/preview/master.m3u8')
+        command = run.call_args.args[0]
+        self.assertEqual(command.count('-i'), 1)
+        self.assertEqual(command[command.index('-i') + 1], self.renditions[0][1])
+        self.assertEqual(command[-1], f'{media_root}/videos/hls/7/preview/%v/index.m3u8')
+
+
+class BuildRenditionLadderTestCase(SimpleTestCase):
+    def test_full_ladder_without_metadata(self):
+        """Test für die volle Leiter ohne Quelldaten"""
+        ladder = build_rendition_ladder()
+        self.assertEqual(list(ladder), ['120p', '360p', '720p', '1080p'])
+
+    def test_no_upscaling(self):
+        """Test, dass nicht über die Quellauflösung hinaus skaliert wird"""
+        ladder = build_rendition_ladder(source_height=480)
+        self.assertEqual(list(ladder), ['120p', '360p'])
+
+    def test_keeps_lowest_rendition(self):
+        """Test, dass sehr kleine Quellen trotzdem eine Auflösung bekommen"""
+        ladder = build_rendition_ladder(source_height=90)
+        self.assertEqual(list(ladder), ['120p'])
+
+    def test_bitrate_capped_by_source(self):
+        """Test, dass die Bitrate nicht über der Quelle liegt"""
+        ladder = build_rendition_ladder(source_height=720, source_bitrate=1200000)
+        self.assertEqual(ladder['720p']['bitrate'], 1200)
+        self.assertEqual(ladder['360p']['bitrate'], 300)
+        self.assertEqual(ladder['120p']['bitrate'], 33)
+
+
+class ParseSourceMetadataTestCase(SimpleTestCase):
+    def test_video_stream_metadata(self):
+        """Test für das Auslesen der Quelldaten aus ffprobe"""
+        probe = {
+            'streams': [
+                {'codec_type': 'audio', 'codec_name': 'aac'},
+                {'codec_type': 'video', 'codec_name': 'h264', 'width': 1280, 'height': 720},
+            ],
+            'format': {'duration': '12.5', 'bit_rate': '2500000'},
+        }
+        self.assertEqual(parse_source_metadata(probe), {
+            'source_width': 1280,
+            'source_height': 720,
+            'source_codec': 'h264',
+            'source_bitrate': 2500000,
+            'duration': 12.5,
+        })
+
+
+class BuildThumbnailCommandTestCase(SimpleTestCase):
+    def setUp(self):
+        """Vorbereitungen für die Tests"""
+        self.outputs = [
+            ('scale=200:150:force_original_aspect_ratio=decrease', 'clip_thumb.jpg'),
+            ('scale=640:-2', 'clip_thumb_640.webp'),
+        ]
+
+    def test_seek_before_input(self):
+        """Test, dass vor dem Öffnen der Datei gesprungen wird"""
+        command = build_thumbnail_command('source.mp4', self.outputs, 5)
+        self.assertLess(command.index('-ss'), command.index('-i'))
+        self.assertEqual(command[command.index('-ss') + 1], '5.000')
+
+    def test_all_sizes_in_one_pass(self):
+        """Test, dass alle Größen aus einem Durchlauf entstehen"""
+        command = build_thumbnail_command('source.mp4', self.outputs, 5)
+        graph = command[command.index('-filter_complex') + 1]
+        self.assertIn('thumbnail=n=50,split=2[t0][t1]', graph)
+        self.assertEqual(command.count('-frames:v'), 2)
+        self.assertEqual(command[-1], 'clip_thumb_640.webp')
+
+    def test_dark_frames_skipped(self):
+        """Test für das Überspringen dunkler Frames"""
+        command = build_thumbnail_command('source.mp4', self.outputs, 5)
+        self.assertIn('signalstats', command[command.index('-filter_complex') + 1])
+        command = build_thumbnail_command(
+            'source.mp4', self.outputs, 5, skip_dark_frames=False)
+        self.assertNotIn('signalstats', command[command.index('-filter_complex') + 1])
+
+    def test_seek_position_short_clip(self):
+        """Test, dass bei kurzen Clips im ersten Drittel gesucht wird"""
+        self.assertEqual(get_thumbnail_seek_position(30), 5)
+        self.assertEqual(get_thumbnail_seek_position(1.5), 0.5)
+        self.assertEqual(get_thumbnail_seek_position(None), 0)
+
+
+class TrickplayTestCase(SimpleTestCase):
+    def test_tile_size_keeps_aspect_ratio(self):
+        """Test, dass die Kacheln das Seitenverhältnis der Quelle behalten"""
+        self.assertEqual(get_trickplay_tile_size(1920, 1080), (160, 90))
+        self.assertEqual(get_trickplay_tile_size(1080, 1920), (160, 284))
+        self.assertEqual(get_trickplay_tile_size(None, None), (160, 90))
+
+    def test_sprite_command(self):
+        """Test für das Kacheln der Frames in einem Durchlauf"""
+        command = build_sprite_command('source.mp4', 'sprite_%03d.jpg', 10, (160, 90))
+        self.assertEqual(command.count('-i'), 1)
+        self.assertLess(command.index('-skip_frame'), command.index('-i'))
+        self.assertEqual(
+            command[command.index('-vf') + 1], 'fps=1/10,scale=160:90,tile=10x10')
+
+    def test_vtt_cues(self):
+        """Test für die WebVTT-Einträge mit Kachelkoordinaten"""
+        vtt = build_trickplay_vtt(
+            25, 10, (160, 90), lambda number: f'sprite_{number:03d}.jpg')
+        lines = vtt.split('\n')
+        self.assertEqual(lines[0], 'WEBVTT')
+        self.assertEqual(lines[2], '00:00:00.000 --> 00:00:10.000')
+        self.assertEqual(lines[3], 'sprite_001.jpg#xywh=0,0,160,90')
+        self.assertEqual(lines[8], '00:00:20.000 --> 00:00:25.000')
+        self.assertEqual(lines[9], 'sprite_001.jpg#xywh=320,0,160,90')
+
+    def test_vtt_next_sprite(self):
+        """Test, dass nach 100 Kacheln das nächste Sprite beginnt"""
+        vtt = build_trickplay_vtt(
+            1010, 10, (160, 90), lambda number: f'sprite_{number:03d}.jpg')
+        self.assertIn('sprite_001.jpg#xywh=1440,810,160,90', vtt)
+        self.assertIn('sprite_002.jpg#xywh=0,0,160,90', vtt)
+
+
+class ParseFfmpegProgressTestCase(SimpleTestCase):
+    def test_percent_from_out_time(self):
+        """Test für die Prozentangabe aus der ffmpeg-Fortschrittsausgabe"""
+        lines = [
+            'frame=10\n', 'out_time_us=2500000\n', 'progress=continue\n',
+            'out_time_us=2600000\n', 'out_time_us=5000000\n', 'progress=end\n',
+        ]
+        self.assertEqual(list(parse_ffmpeg_progress(lines, 10)), [25, 26, 50, 100])
+
+    def test_unknown_duration(self):
+        """Test, dass ohne Laufzeit nur das Ende gemeldet wird"""
+        lines = ['out_time_us=2500000\n', 'out_time=N/A\n', 'progress=end\n']
+        self.assertEqual(list(parse_ffmpeg_progress(lines, None)), [100])
+
+
+@override_settings(
+    VIDEO_ENCODER_PROFILE='h264',
+    VIDEO_ENCODER_PROFILES={
+        'h264': {'codec': 'libx264', 'crf': 21, 'threads': 4, 'filter_threads': 2},
+        'fast': {'preset': 'veryfast', 'gop_seconds': 0},
+    },
+)
+class EncoderProfileTestCase(SimpleTestCase):
+    def test_defaults_filled_in(self):
+        """Test, dass fehlende Werte aus den Standardwerten ergänzt werden"""
+        profile = get_encoder_profile()
+        self.assertEqual(profile['crf'], 21)
+        self.assertEqual(profile['preset'], 'medium')
+        self.assertEqual(get_encoder_profile('fast')['codec'], 'libx264')
+
+    def test_unknown_profile(self):
+        """Test für ein nicht konfiguriertes Profil"""
+        with self.assertRaises(ImproperlyConfigured):
+            get_encoder_profile('av1')
+
+    def test_encoder_args(self):
+        """Test für Codec, VBV-Grenze, GOP und Threads aus dem Profil"""
+        args = build_encoder_args(get_encoder_profile(), 1000)
+        self.assertEqual(args[args.index('-crf') + 1], '21')
+        self.assertEqual(args[args.index('-maxrate') + 1], '1000k')
+        self.assertEqual(args[args.index('-bufsize') + 1], '2000k')
+        self.assertEqual(args[args.index('-force_key_frames') + 1], 'expr:gte(t,n_forced*2)')
+        self.assertEqual(args[args.index('-threads') + 1], '4')
+
+    def test_thread_defaults(self):
+        """Test, dass ohne Limit ffmpeg die Threads selbst wählt"""
+        profile = get_encoder_profile('fast')
+        self.assertNotIn('-threads', build_encoder_args(profile))
+        self.assertNotIn('-force_key_frames', build_encoder_args(profile))
+        self.assertEqual(build_global_args(profile), [])
+        self.assertEqual(
+            build_global_args(get_encoder_profile()), ['-filter_complex_threads', '2'])
@@ -0,0 +1,558 @@
+import os
+import shutil
+import subprocess
+import tempfile
+from unittest import mock
+from django.conf import settings
+import django_rq
+from django.test import TestCase, override_settings
+from django_redis import get_redis_connection
+from rq import Queue, SimpleWorker
+from video_app.models import Video, VideoSource
+from video_app.status import get_processing_status
+from video_app.tasks import (
+    PIPELINE_VERSION,
+    PROCESSING_LOCK_KEY,
+    RERUN_KEY,
+    acquire_processing_lock,
+    end_processing_run,
+    enqueue_video_processing,
+    finalize_video,
+    finish_processing,
+    generate_thumbnail_job,
+    process_video,
+    publish_preview,
+    transcode_rendition,
+    transcode_secondary_rendition,
+)
+
+
+def fake_enqueue(func, *args, **kwargs):
+    return mock.Mock(id=f"{func.__name__}-{'-'.join(map(str, args))}")
+
+
+def get_enqueue_call(queue, func):
+    return next(call for call in queue.enqueue.call_args_list if call.args[0] is func)
+
+
+def use_temporary_media_root(test_case):
+    media_root = tempfile.mkdtemp()
+    test_case.addCleanup(shutil.rmtree, media_root)
+    override = override_settings(MEDIA_ROOT=media_root)
+    override.enable()
+    test_case.addCleanup(override.disable)
+
+
+def create_media_file(name):
+    path = os.path.join(settings.MEDIA_ROOT, name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, 'wb').close()
+
+
+@mock.patch('video_app.tasks.probe_source', side_effect=lambda video: video)
+class ProcessVideoFanOutTestCase(TestCase):
+    def setUp(self):
+        """Vorbereitungen für die Tests"""
+        self.video = Video.objects.create(
+            title="Test Video", description="Beschreibung", category="action", video_file="videos/clip.mp4",
+            source_height=720, source_bitrate=3000000, source_sha256="a" * 64)
+        get_redis_connection('default').delete(
+            PROCESSING_LOCK_KEY.format(self.video.id), RERUN_KEY.format(self.video.id))
+
+    @override_settings(VIDEO_TRANSCODE_FANOUT=True)
+    @mock.patch('video_app.tasks.django_rq.get_queue')
+    def test_one_job_per_rendition(self, get_queue, probe_source):
+        """Test, dass pro Auflösung ein eigener Job eingereiht wird"""
+        queue = get_queue.return_value
+        queue.enqueue.side_effect = fake_enqueue
+        self.assertTrue(process_video(self.video.id))
+        transcode_calls = [
+            call for call in queue.enqueue.call_args_list
+            if call.args[0] is transcode_rendition]
+        self.assertEqual(
+            [call.args[2] for call in transcode_calls], ['120p', '360p', '720p'])
+
+    @override_settings(VIDEO_TRANSCODE_FANOUT=True)
+    @mock.patch('video_app.tasks.django_rq.get_queue')
+    def test_finalizer_depends_on_renditions(self, get_queue, probe_source):
+        """Test, dass der Abschluss-Job auf alle Auflösungen wartet"""
+        queue = get_queue.return_value
+        queue.enqueue.side_effect = fake_enqueue
+        process_video(self.video.id)
+        dependency = get_enqueue_call(queue, finalize_video).kwargs['depends_on']
+        video_id = self.video.id
+        self.assertEqual(
+            dependency.dependencies,
+            [f'transcode_rendition-{video_id}-{resolution}' for resolution in ['120p', '360p', '720p']])
+        self.assertTrue(dependency.allow_failure)
+        self.assertTrue(dependency.enqueue_at_front)
+
+    @override_settings(VIDEO_TRANSCODE_FANOUT=True, VIDEO_RENDITIONS_PER_JOB=2)
+    @mock.patch('video_app.tasks.django_rq.get_queue')
+    def test_renditions_grouped_per_job(self, get_queue, probe_source):
+        """Test, dass mehrere Auflösungen aus einem Dekodiervorgang in einem Job kodiert werden"""
+        queue = get_queue.return_value
+        queue.enqueue.side_effect = fake_enqueue
+        process_video(self.video.id)
+        transcode_calls = [
+            call for call in queue.enqueue.call_args_list
+            if call.args[0] is transcode_rendition]
+        self.assertEqual(
+            [call.args[2:] for call in transcode_calls], [('120p',), ('360p', '720p')])
+        finalize_call = get_enqueue_call(queue, finalize_video)
+        video_id = self.video.id
+        self.assertEqual(finalize_call.args[2], {
+            '120p': f'transcode_rendition-{video_id}-120p',
+            '360p': f'transcode_rendition-{video_id}-360p-720p',
+            '720p': f'transcode_rendition-{video_id}-360p-720p',
+        })
+        self.assertEqual(
+            finalize_call.kwargs['depends_on'].dependencies,
+            [f'transcode_rendition-{video_id}-120p', f'transcode_rendition-{video_id}-360p-720p'])
+
+    @mock.patch('video_app.tasks.run_ffmpeg')
+    def test_grouped_renditions_single_decode(self, run_ffmpeg, probe_source):
+        """Test, dass ein Job mit mehreren Auflösungen ffmpeg nur einmal aufruft"""
+        use_temporary_media_root(self)
+        paths = transcode_rendition(self.video.id, '360p', '720p')
+        run_ffmpeg.assert_called_once()
+        command = run_ffmpeg.call_args.args[0]
+        self.assertEqual(command.count('-i'), 1)
+        self.assertEqual(set(paths), {'360p', '720p'})
+
+    @override_settings(VIDEO_TRANSCODE_FANOUT=True, VIDEO_LOCK_TIMEOUT=21600)
+    @mock.patch('video_app.tasks.django_rq.get_queue')
+    def test_rendition_results_kept_for_the_run(self, get_queue, probe_source):
+        """Test, dass die Ergebnisse der Auflösungen so lange wie die Sperre aufbewahrt werden"""
+        queue = get_queue.return_value
+        queue.enqueue.side_effect = fake_enqueue
+        process_video(self.video.id)
+        for call in queue.enqueue.call_args_list:
+            if call.args[0] is transcode_rendition:
+                self.assertEqual(call.kwargs['result_ttl'], 21600)
+                self.assertEqual(call.kwargs['failure_ttl'], 21600)
+
+    @override_settings(VIDEO_TRANSCODE_FANOUT=True)
+    @mock.patch('video_app.tasks.django_rq.get_queue')
+    def test_preview_on_high_queue(self, get_queue, probe_source):
+        """Test, dass Thumbnail und kleinste Auflösung zuerst über die schnelle Queue laufen"""
+        queues = {'high': mock.Mock(), 'low': mock.Mock()}
+        for queue in queues.values():
+            queue.enqueue.side_effect = fake_enqueue
+        get_queue.side_effect = queues.__getitem__
+        process_video(self.video.id)
+
+        high_calls = queues['high'].enqueue.call_args_list
+        self.assertEqual(
+            [call.args[0] for call in high_calls],
+            [generate_thumbnail_job, transcode_rendition, publish_preview])
+        self.assertEqual(high_calls[1].args[2], '120p')
+        low_calls = queues['low'].enqueue.call_args_list
+        self.assertEqual(
+            [call.args[2] for call in low_calls if call.args[0] is transcode_rendition],
+            ['360p', '720p'])
+        self.assertEqual([call.args[0] for call in low_calls[-2:]], [finalize_video, end_processing_run])
+
+    @override_settings(VIDEO_TRANSCODE_FANOUT=True, VIDEO_SECONDARY_CODECS=['hevc'])
+    @mock.patch('video_app.tasks.django_rq.get_queue')
+    def test_secondary_codec_jobs(self, get_queue, probe_source):
+        """Test, dass zusätzliche Codecs eigene Jobs bekommen, auf die nicht gewartet wird"""
+        queue = get_queue.return_value
+        queue.enqueue.side_effect = fake_enqueue
+        process_video(self.video.id)
+        secondary_calls = [
+            call for call in queue.enqueue.call_args_list
+            if call.args[0] is transcode_secondary_rendition]
+        self.assertEqual(
+            [call.args[2:] for call in secondary_calls],
+            [('hevc', '120p'), ('hevc', '360p'), ('hevc', '720p')])
+        dependency = get_enqueue_call(queue, finalize_video).kwargs['depends_on']
+        self.assertEqual(len(dependency.dependencies), 3)
+
+    @override_settings(VIDEO_TRANSCODE_FANOUT=True, VIDEO_SECONDARY_CODECS=['hevc'])
+    @mock.patch('video_app.tasks.django_rq.get_queue')
+    def test_lock_held_until_all_jobs_done(self, get_queue, probe_source):
+        """Test, dass die Sperre erst nach allen Jobs des Durchlaufs freigegeben wird"""
+        queue = get_queue.return_value
+        queue.enqueue.side_effect = fake_enqueue
+        process_video(self.video.id)
+        release_call = queue.enqueue.call_args_list[-1]
+        self.assertIs(release_call.args[0], end_processing_run)
+        video_id = self.video.id
+        token = get_redis_connection('default').get(PROCESSING_LOCK_KEY.format(video_id)).decode()
+        self.assertEqual(release_call.args[2], token)
+        dependency = release_call.kwargs['depends_on']
+        self.assertTrue(dependency.allow_failure)
+        self.assertEqual(set(dependency.dependencies), {
+            f'finalize_video-{video_id}-'
+            + str({resolution: f'transcode_rendition-{video_id}-{resolution}'
+                   for resolution in ['120p', '360p', '720p']}),
+            f'generate_thumbnail_job-{video_id}',
+            f'publish_preview-{video_id}-120p-transcode_rendition-{video_id}-120p',
+            f'generate_trickplay_job-{video_id}',
+            *(f'transcode_secondary_rendition-{video_id}-hevc-{resolution}'
+              for resolution in ['120p', '360p', '720p']),
+        })
+
+    @override_settings(VIDEO_TRANSCODE_FANOUT=True)
+    @mock.patch('video_app.tasks.django_rq.get_queue')
+    def test_encoding_status(self, get_queue, probe_source):
+        """Test, dass der Status mit allen Auflösungen auf encoding wechselt"""
+        get_queue.return_value.enqueue.side_effect = fake_enqueue
+        process_video(self.video.id)
+        state = get_processing_status(self.video.id)
+        self.assertEqual(state['status'], 'encoding')
+        self.assertEqual(state['renditions'], {'120p': 0, '360p': 0, '720p': 0})
+
+    @override_settings(VIDEO_TRANSCODE_FANOUT=True)
+    @mock.patch('video_app.tasks.enqueue_rendition_jobs', side_effect=RuntimeError("Redis weg"))
+    def test_failure_recorded(self, enqueue, probe_source):
+        """Test, dass Fehler am Video gespeichert und weitergegeben werden"""
+        with self.assertRaises(RuntimeError):
+            process_video(self.video.id)
+        self.video.refresh_from_db()
+        self.assertEqual(self.video.processing_status, 'failed')
+        self.assertEqual(self.video.processing_error, "Processing failed")
+
+    @override_settings(VIDEO_TRANSCODE_FANOUT=False)
+    @mock.patch('video_app.tasks.generate_thumbnail', side_effect=subprocess.CalledProcessError(
+        1, ['/usr/bin/ffmpeg', '-i', '/srv/videoflix/media/videos/clip.mp4'], stderr="clip.mp4: Invalid data"))
+    def test_failure_without_paths(self, generate_thumbnail, probe_source):
+        """Test, dass der öffentliche Fehler keine Befehle oder Serverpfade enthält"""
+        with self.assertLogs('video_app.tasks', level='ERROR') as logs, self.assertRaises(subprocess.CalledProcessError):
+            process_video(self.video.id)
+        state = get_processing_status(self.video.id)
+        self.assertEqual(state['error'], "ffmpeg exited with status 1")
+        self.video.refresh_from_db()
+        self.assertEqual(self.video.processing_error, "ffmpeg exited with status 1")
+        self.assertTrue(any("clip.mp4: Invalid data" in line for line in logs.output))
+
+    def create_duplicate(self, **fields):
+        return Video.objects.create(
+            title="Original", description="Beschreibung", category="action", video_file="videos/master.mp4",
+            source_sha256="a" * 64, processing_status='ready', duration=12.5,
+            source_height=720, source_bitrate=3000000,
+            video_120p="videos/120p/master_120p.mp4", video_360p="videos/360p/master_360p.mp4",
+            video_720p="videos/720p/master_720p.mp4", hls_playlist="videos/hls/1/master.m3u8", **fields)
+
+    @override_settings(VIDEO_SECONDARY_CODECS=[])
+    @mock.patch('video_app.tasks.django_rq.get_queue')
+    def test_duplicate_reuses_outputs(self, get_queue, probe_source):
+        """Test, dass ein identisches Video nicht erneut konvertiert wird"""
+        self.create_duplicate()
+        get_queue.reset_mock()
+        self.assertTrue(process_video(self.video.id))
+        get_queue.return_value.enqueue.assert_not_called()
+        probe_source.assert_not_called()
+        self.video.refresh_from_db()
+        self.assertEqual(self.video.processing_status, 'ready')
+        self.assertEqual(self.video.video_720p.name, "videos/720p/master_720p.mp4")
+        self.assertEqual(self.video.hls_playlist.name, "videos/hls/1/master.m3u8")
+        self.assertEqual(self.video.duration, 12.5)
+        self.assertEqual(self.video.video_file.name, "videos/clip.mp4")
+
+    @override_settings(VIDEO_TRANSCODE_FANOUT=True, VIDEO_SECONDARY_CODECS=['hevc'])
+    @mock.patch('video_app.tasks.django_rq.get_queue')
+    def test_incomplete_duplicate_encoded(self, get_queue, probe_source):
+        """Test, dass ein Duplikat ohne alle aktuellen Ausgaben nicht übernommen wird"""
+        self.create_duplicate()
+        get_queue.return_value.enqueue.side_effect = fake_enqueue
+        self.assertTrue(process_video(self.video.id))
+        probe_source.assert_called_once()
+        self.video.refresh_from_db()
+        self.assertEqual(self.video.processing_status, 'encoding')
+        self.assertFalse(self.video.hls_playlist)
+
+    @override_settings(VIDEO_TRANSCODE_FANOUT=True, VIDEO_SECONDARY_CODECS=[])
+    @mock.patch('video_app.tasks.django_rq.get_queue')
+    def test_reprocess_not_reused(self, get_queue, probe_source):
+        """Test, dass ein bereits verarbeitetes Video beim erneuten Verarbeiten konvertiert wird"""
+        self.create_duplicate()
+        Video.objects.filter(pk=self.video.pk).update(video_120p="videos/120p/clip_120p.mp4")
+        get_queue.return_value.enqueue.side_effect = fake_enqueue
+        self.assertTrue(process_video(self.video.id))
+        probe_source.assert_called_once()
+        self.video.refresh_from_db()
+        self.assertFalse(self.video.video_720p)
+
+
+class FinalizeVideoTestCase(TestCase):
+    def setUp(self):
+        """Vorbereitungen für die Tests"""
+        use_temporary_media_root(self)
+        self.video = Video.objects.create(
+            title="Test Video", description="Beschreibung", category="action", video_file="videos/clip.mp4")
+
+    @mock.patch('video_app.tasks.package_adaptive_streams')
+    @mock.patch('video_app.tasks.django_rq.get_connection')
+    @mock.patch('video_app.tasks.Job.fetch_many')
+    def test_updates_finished_renditions(self, fetch_many, get_connection, package):
+        """Test, dass nur erfolgreiche Auflösungen gespeichert werden"""
+        finished = mock.Mock(is_finished=True)
+        finished.return_value.return_value = 'videos/120p/clip_120p.mp4'
+        failed = mock.Mock(is_finished=False)
+        fetch_many.return_value = [finished, failed]
+
+        finalize_video(self.video.id, {'120p': 'job-120p', '360p': 'job-360p'})
+
+        self.video.refresh_from_db()
+        self.assertEqual(self.video.video_120p.name, 'videos/120p/clip_120p.mp4')
+        self.assertFalse(self.video.video_360p)
+        self.assertEqual(self.video.processing_status, 'ready')
+        package.assert_called_once()
+
+    @mock.patch('video_app.tasks.package_adaptive_streams')
+    @mock.patch('video_app.tasks.django_rq.get_connection')
+    @mock.patch('video_app.tasks.Job.fetch_many')
+    def test_expired_rendition_result(self, fetch_many, get_connection, package):
+        """Test, dass eine fertige Auflösung nach Ablauf ihres Job-Ergebnisses nicht als fehlgeschlagen gilt"""
+        expired = mock.Mock(is_finished=True)
+        expired.return_value.return_value = None
+        fetch_many.return_value = [expired, None, None]
+        create_media_file('videos/360p/clip_360p.mp4')
+
+        finalize_video(
+            self.video.id, {'120p': 'job-120p', '360p': 'job-360p', '720p': 'job-720p'})
+
+        self.video.refresh_from_db()
+        self.assertEqual(self.video.video_120p.name, 'videos/120p/clip_120p.mp4')
+        self.assertEqual(self.video.video_360p.name, 'videos/360p/clip_360p.mp4')
+        self.assertFalse(self.video.video_720p)
+        self.assertEqual(self.video.processing_status, 'ready')
+
+    @mock.patch('video_app.tasks.package_adaptive_streams')
+    @mock.patch('video_app.tasks.django_rq.get_connection')
+    @mock.patch('video_app.tasks.Job.fetch_many')
+    def test_all_renditions_failed(self, fetch_many, get_connection, package):
+        """Test, dass das Video ohne erfolgreiche Auflösung als fehlgeschlagen gilt"""
+        fetch_many.return_value = [mock.Mock(is_finished=False)]
+
+        finalize_video(self.video.id, {'120p': 'job-120p'})
+
+        self.video.refresh_from_db()
+        self.assertEqual(self.video.processing_status, 'failed')
+        package.assert_not_called()
+
+
+class PublishPreviewTestCase(TestCase):
+    def setUp(self):
+        """Vorbereitungen für die Tests"""
+        use_temporary_media_root(self)
+        self.video = Video.objects.create(
+            title="Test Video", description="Beschreibung", category="action", video_file="videos/clip.mp4",
+            processing_status='encoding')
+        fetch_many = mock.patch('video_app.tasks.Job.fetch_many')
+        self.fetch_many = fetch_many.start()
+        self.job = mock.Mock(is_finished=True)
+        self.fetch_many.return_value = [self.job]
+        self.addCleanup(fetch_many.stop)
+        get_connection = mock.patch('video_app.tasks.django_rq.get_connection')
+        get_connection.start()
+        self.addCleanup(get_connection.stop)
+
+    @mock.patch('video_app.tasks.package_preview_stream', return_value='videos/hls/1/preview/master.m3u8')
+    def test_preview_playable(self, package):
+        """Test, dass nur die erste Auflösung sofort verpackt wird"""
+        publish_preview(self.video.id, '120p', 'job-120p')
+        self.video.refresh_from_db()
+        self.assertEqual(self.video.video_120p.name, 'videos/120p/clip_120p.mp4')
+        self.assertEqual(package.call_args.args[1], '120p')
+        self.assertEqual(self.video.hls_playlist.name, 'videos/hls/1/preview/master.m3u8')
+
+    @mock.patch('video_app.tasks.package_preview_stream')
+    def test_failed_preview_rendition(self, package):
+        """Test, dass eine fehlgeschlagene Vorschau nichts veröffentlicht"""
+        self.job.is_finished = False
+        publish_preview(self.video.id, '120p', 'job-120p')
+        package.assert_not_called()
+        self.video.refresh_from_db()
+        self.assertFalse(self.video.video_120p)
+
+    @mock.patch('video_app.tasks.package_preview_stream', return_value='videos/hls/1/preview/master.m3u8')
+    def test_expired_preview_job(self, package):
+        """Test, dass eine fertige Vorschau auch nach Ablauf des Job-Ergebnisses veröffentlicht wird"""
+        self.fetch_many.return_value = [None]
+        publish_preview(self.video.id, '120p', 'job-120p')
+        package.assert_not_called()
+
+        create_media_file('videos/120p/clip_120p.mp4')
+        publish_preview(self.video.id, '120p', 'job-120p')
+        self.video.refresh_from_db()
+        self.assertEqual(self.video.video_120p.name, 'videos/120p/clip_120p.mp4')
+        self.assertEqual(self.video.hls_playlist.name, 'videos/hls/1/preview/master.m3u8')
+
+    @mock.patch('video_app.tasks.package_preview_stream')
+    def test_existing_package_kept(self, package):
+        """Test, dass ein vorhandenes Paket beim erneuten Verarbeiten nicht ersetzt wird"""
+        Video.objects.filter(pk=self.video.pk).update(hls_playlist='videos/hls/1/master.m3u8')
+        publish_preview(self.video.id, '120p', 'job-120p')
+        package.assert_not_called()
+        self.video.refresh_from_db()
+        self.assertEqual(self.video.hls_playlist.name, 'videos/hls/1/master.m3u8')
+
+    @mock.patch('video_app.tasks.package_preview_stream', return_value='videos/hls/1/preview/master.m3u8')
+    def test_finalized_video_kept(self, package):
+        """Test, dass eine verspätete Vorschau das fertige Paket nicht überschreibt"""
+        Video.objects.filter(pk=self.video.pk).update(processing_status='packaging')
+        publish_preview(self.video.id, '120p', 'job-120p')
+        self.video.refresh_from_db()
+        self.assertFalse(self.video.hls_playlist)
+
+
+class RenditionPipelineTestCase(TestCase):
+    def setUp(self):
+        """Vorbereitungen für die Tests"""
+        self.video = Video.objects.create(
+            title="Test Video", description="Beschreibung", category="action", video_file="videos/clip.mp4",
+            source_height=720, source_bitrate=3000000, source_sha256="a" * 64)
+        self.connection = django_rq.get_connection('high')
+        self.queue = Queue('video-pipeline-test', connection=self.connection)
+        self.queue.empty()
+        get_redis_connection('default').delete(
+            PROCESSING_LOCK_KEY.format(self.video.id), RERUN_KEY.format(self.video.id))
+
+    @override_settings(VIDEO_TRANSCODE_FANOUT=True)
+    @mock.patch('video_app.tasks.package_adaptive_streams')
+    @mock.patch('video_app.tasks.generate_trickplay')
+    @mock.patch('video_app.tasks.generate_thumbnail')
+    @mock.patch('video_app.tasks.probe_source', side_effect=lambda video: video)
+    def test_failed_preview_rendition(self, probe_source, thumbnail, trickplay, package):
+        """Test, dass der Abschluss auch bei fehlgeschlagener Vorschau-Auflösung läuft"""
+        def build_command(video, resolutions, codec=None):
+            resolution = resolutions[0]
+            return [resolution], {resolution: f'{settings.MEDIA_ROOT}/videos/{resolution}/clip_{resolution}.mp4'}
+
+        def encode(command, *args):
+            if command == ['120p']:
+                raise subprocess.CalledProcessError(1, 'ffmpeg')
+
+        with mock.patch('video_app.tasks.get_video_queue', return_value=self.queue), \
+                mock.patch('video_app.tasks.build_video_rendition_command', side_effect=build_command), \
+                mock.patch('video_app.tasks.run_ffmpeg', side_effect=encode):
+            process_video(self.video.id)
+            SimpleWorker([self.queue], connection=self.connection).work(burst=True)
+
+        self.video.refresh_from_db()
+        self.assertEqual(self.video.processing_status, 'ready')
+        self.assertFalse(self.video.video_120p)
+        self.assertEqual(self.video.video_720p.name, 'videos/720p/clip_720p.mp4')
+        package.assert_called_once()
+        self.assertFalse(get_redis_connection('default').exists(PROCESSING_LOCK_KEY.format(self.video.id)))
+
+
+class TranscodeSecondaryRenditionTestCase(TestCase):
+    def setUp(self):
+        """Vorbereitungen für die Tests"""
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        override = override_settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.video = Video.objects.create(
+            title="Test Video", description="Beschreibung", category="action", video_file="videos/clip.mp4",
+            source_height=720, source_bitrate=3000000)
+
+    @mock.patch('video_app.tasks.run_ffmpeg')
+    def test_hevc_source_saved(self, run_ffmpeg):
+        """Test, dass eine HEVC-Auflösung als zusätzliche Quelle gespeichert wird"""
+        transcode_secondary_rendition(self.video.id, 'hevc', '720p')
+        command = run_ffmpeg.call_args.args[0]
+        self.assertEqual(command[command.index('-c:v') + 1], 'libx265')
+        self.assertEqual(command[command.index('-tag:v') + 1], 'hvc1')
+        source = VideoSource.objects.get(video=self.video)
+        self.assertEqual(source.codec, 'hevc')
+        self.assertEqual(source.file.name, 'videos/hevc/720p/clip_720p.mp4')
+        self.assertEqual(source.bitrate, 1750)
+
+    @mock.patch('video_app.tasks.run_ffmpeg')
+    def test_av1_without_vbv(self, run_ffmpeg):
+        """Test, dass AV1 mit SVT-AV1 ohne VBV-Grenze kodiert wird"""
+        transcode_secondary_rendition(self.video.id, 'av1', '360p')
+        command = run_ffmpeg.call_args.args[0]
+        self.assertEqual(command[command.index('-c:v') + 1], 'libsvtav1')
+        self.assertNotIn('-maxrate', command)
+        self.assertIsNone(VideoSource.objects.get(video=self.video).bitrate)
+
+
+class EnqueueVideoProcessingTestCase(TestCase):
+    def setUp(self):
+        """Vorbereitungen für die Tests"""
+        self.queue = Queue('video-enqueue-test', connection=django_rq.get_connection('high'))
+        self.queue.empty()
+        get_video_queue = mock.patch('video_app.tasks.get_video_queue', return_value=self.queue)
+        self.get_video_queue = get_video_queue.start()
+        self.addCleanup(get_video_queue.stop)
+        self.video = Video.objects.create(
+            title="Test Video", description="Beschreibung", category="action", video_file="videos/clip.mp4")
+        self.connection = get_redis_connection('default')
+        self.connection.delete(
+            PROCESSING_LOCK_KEY.format(self.video.id), RERUN_KEY.format(self.video.id))
+
+    def tearDown(self):
+        self.queue.empty()
+
+    def test_deterministic_job_id(self):
+        """Test, dass ein Video nur einmal eingereiht wird"""
+        job = enqueue_video_processing(self.video.id)
+        self.assertEqual(job.id, f'video-{self.video.id}-v{PIPELINE_VERSION}')
+        self.assertEqual(enqueue_video_processing(self.video.id).id, job.id)
+        self.assertEqual(self.queue.job_ids.count(job.id), 1)
+
+    @override_settings(VIDEO_TRANSCODE_FANOUT=False)
+    def test_serial_pipeline_on_encode_queue(self):
+        """Test, dass die serielle Verarbeitung nicht über die Vorschau-Queue läuft"""
+        self.get_video_queue.reset_mock()
+        enqueue_video_processing(self.video.id)
+        self.get_video_queue.assert_called_once_with('serial')
+        self.assertEqual(settings.VIDEO_QUEUE_ROUTING['serial'], settings.VIDEO_QUEUE_ROUTING['rendition'])
+
+    def test_rerun_coalesced(self):
+        """Test, dass Anfragen während der Verarbeitung zu einem Durchlauf zusammengefasst werden"""
+        token = acquire_processing_lock(self.video.id)
+        self.assertIsNotNone(token)
+        self.assertIsNone(enqueue_video_processing(self.video.id))
+        self.assertIsNone(enqueue_video_processing(self.video.id))
+        self.assertTrue(finish_processing(self.video.id, token))
+        self.assertTrue(self.connection.exists(PROCESSING_LOCK_KEY.format(self.video.id)))
+        self.assertFalse(finish_processing(self.video.id, token))
+        self.assertFalse(self.connection.exists(PROCESSING_LOCK_KEY.format(self.video.id)))
+
+    @mock.patch('video_app.tasks.run_video_pipeline')
+    def test_locked_video_skipped(self, run_video_pipeline):
+        """Test, dass ein bereits laufendes Video nicht doppelt verarbeitet wird"""
+        acquire_processing_lock(self.video.id)
+        self.assertFalse(process_video(self.video.id))
+        run_video_pipeline.assert_not_called()
+
+    @mock.patch('video_app.tasks.run_video_pipeline', return_value=False)
+    def test_serial_rerun(self, run_video_pipeline):
+        """Test, dass eine Anfrage während der Verarbeitung genau einen weiteren Durchlauf auslöst"""
+        def request_rerun(video_id, fanout, token):
+            if run_video_pipeline.call_count == 1:
+                enqueue_video_processing(video_id)
+            return False
+        run_video_pipeline.side_effect = request_rerun
+        self.assertTrue(process_video(self.video.id, fanout=False))
+        self.assertEqual(run_video_pipeline.call_count, 2)
+        self.assertFalse(self.connection.exists(PROCESSING_LOCK_KEY.format(self.video.id)))
+
+    def test_end_of_run_starts_rerun(self):
+        """Test, dass das Ende des Durchlaufs die Sperre freigibt und eine angefragte Wiederholung einreiht"""
+        self.queue.empty()
+        token = acquire_processing_lock(self.video.id)
+        enqueue_video_processing(self.video.id)
+        end_processing_run(self.video.id, token)
+        self.assertIn(f'video-{self.video.id}-v{PIPELINE_VERSION}', self.queue.job_ids)
+        self.assertFalse(self.connection.exists(RERUN_KEY.format(self.video.id)))
+
+    def test_expired_lock_of_newer_run_kept(self):
+        """Test, dass ein verspäteter Durchlauf die Sperre eines neueren Durchlaufs nicht freigibt"""
+        self.queue.empty()
+        stale_token = acquire_processing_lock(self.video.id)
+        self.connection.delete(PROCESSING_LOCK_KEY.format(self.video.id))
+        token = acquire_processing_lock(self.video.id)
+        enqueue_video_processing(self.video.id)
+        end_processing_run(self.video.id, stale_token)
+        self.assertEqual(self.connection.get(PROCESSING_LOCK_KEY.format(self.video.id)).decode(), token)
+        self.assertTrue(self.connection.exists(RERUN_KEY.format(self.video.id)))
+        self.assertNotIn(f'video-{self.video.id}-v{PIPELINE_VERSION}', self.queue.job_ids)
@@ -1,8 +1,25 @@
+import hashlib
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
+from django.conf import settings
+from django.test import override_settings
 from django.urls import reverse
-from rest_framework.test import APITestCase, APIClient
+from django.utils import timezone
+from django_redis import get_redis_connection
+from rest_framework.test import APITestCase, APIClient, APIRequestFactory, force_authenticate
 from rest_framework import status
 from django.contrib.auth.models import User
-from video_app.models import Video, UserVideoProgress
+from video_app.cache import invalidate_continue_watching
+from video_app.models import Video, UserVideoProgress, UploadSession
+from video_app.status import get_status_key, set_processing_status, set_rendition_progress
+from video_app.tasks import expire_upload_sessions
+from video_app.views import UserVideoProgressViewSet
+from video_app.progress import (
+    PROGRESS_BUFFER_KEY, PROGRESS_FLUSH_LOCK_KEY, PROGRESS_FLUSHING_KEY, flush_progress_buffer,
+)
 from django.core.files.uploadedfile import SimpleUploadedFile
 
 
@@ -21,10 +38,64 @@ class VideoListViewTestCase(APITestCase):
         """Test für das Abrufen der Videoliste"""
         response = self.client.get(reverse('video-list'))
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(response.data['results']), 2)
+
+    def test_internal_fields_hidden(self):
+        """Test, dass interne Felder nicht in der öffentlichen Videoliste erscheinen"""
+        Video.objects.filter(pk=self.video1.pk).update(
+            source_sha256="a" * 64, processing_error="ffmpeg exited with status 1", source_height=720)
+        response = self.client.get(reverse('video-list'))
+        for video in response.data['results']:
+            for field in ('source_sha256', 'processing_error', 'source_width',
+                          'source_height', 'source_bitrate', 'source_codec'):
+                self.assertNotIn(field, video)
+        response = self.client.get(reverse('video-detail', kwargs={'pk': self.video1.pk}))
+        self.assertNotIn('processing_error', response.data)
+        self.assertNotIn('source_sha256', response.data)
+
+    def test_video_list_newest_first(self):
+        """Test, dass die neuesten Videos zuerst kommen"""
+        response = self.client.get(reverse('video-list'))
+        titles = [video['title'] for video in response.data['results']]
+        self.assertEqual(titles, ["Video 2", "Video 1"])
+
+    def test_video_list_cursor_pagination(self):
+        """Test für das Blättern mit Cursor"""
+        response = self.client.get(reverse('video-list'), {'page_size': 1})
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertIsNotNone(response.data['next'])
+        response = self.client.get(response.data['next'])
+        self.assertEqual(response.data['results'][0]['title'], "Video 1")
+        self.assertIsNone(response.data['next'])
+
+    def test_video_list_filtered_by_category(self):
+        """Test für das Filtern nach Kategorie"""
+        response = self.client.get(reverse('video-list'), {'category': 'comedy'})
+        self.assertEqual(
+            [video['title'] for video in response.data['results']], ["Video 2"])
+
+    def test_video_list_cached(self):
+        """Test, dass wiederholte Abrufe aus dem Cache kommen"""
+        self.client.get(reverse('video-list'))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('video-list'))
+        self.assertEqual(len(response.data['results']), 2)
+
+    def test_video_list_cache_invalidated(self):
+        """Test, dass der Cache nach Änderungen verworfen wird"""
+        self.client.get(reverse('video-list'))
+        self.video1.title = "Geändert"
+        self.video1.save()
+        response = self.client.get(reverse('video-list'))
+        self.assertIn("Geändert", [video['title'] for video in response.data['results']])
+        self.video2.delete()
+        response = self.client.get(reverse('video-list'))
+        self.assertEqual(len(response.data['results']), 1)
 
     def test_create_video_authenticated(self):
         self.client.force_authenticate(user=self.user)
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
         video_file = SimpleUploadedFile(
             "video.mp4", b"file_content", content_type="video/mp4")
         data = {
@@ -33,9 +104,43 @@ class VideoListViewTestCase(APITestCase):
             "category": "action",
             "video_file": video_file
         }
-        response = self.client.post(
-            reverse('video-list'), data, format='multipart')
+        with override_settings(MEDIA_ROOT=media_root):
+            response = self.client.post(
+                reverse('video-list'), data, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            Video.objects.get(pk=response.data['id']).source_sha256,
+            hashlib.sha256(b"file_content").hexdigest())
+
+    @override_settings(FILE_UPLOAD_MAX_MEMORY_SIZE=4)
+    def test_create_large_video_hashed_once(self):
+        """Test, dass große Uploads nur vom Handler gehasht werden, der sie speichert"""
+        self.client.force_authenticate(user=self.user)
+        hashed = []
+        sha256 = hashlib.sha256
+
+        def tracking_sha256(*args):
+            digest = sha256(*args)
+            return mock.Mock(
+                update=lambda data: (hashed.append(data), digest.update(data)),
+                hexdigest=digest.hexdigest)
+
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        video_file = SimpleUploadedFile("video.mp4", b"file_content", content_type="video/mp4")
+        with override_settings(MEDIA_ROOT=media_root), \
+                mock.patch('video_app.uploadhandlers.hashlib.sha256', side_effect=tracking_sha256):
+            response = self.client.post(reverse('video-list'), {
+                "title": "Neues Video",
+                "description": "Neue Beschreibung",
+                "category": "action",
+                "video_file": video_file,
+            }, format='multipart')
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(b"".join(hashed), b"file_content")
+        self.assertEqual(
+            Video.objects.get(pk=response.data['id']).source_sha256,
+            sha256(b"file_content").hexdigest())
 
     def test_create_video_unauthenticated(self):
         """Test für das Erstellen eines Videos ohne Authentifizierung"""
@@ -153,6 +258,69 @@ class UserVideoProgressListViewTestCase(APITestCase):
         response = self.client.get(reverse('progress-list'))
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
 
+    def test_get_progress_list_sparse_fields(self):
+        """Test für die Auswahl einzelner Felder über ?fields="""
+        UserVideoProgress.objects.create(
+            user=self.user, video=self.video, last_viewed_position=10.5)
+        response = self.client.get(
+            reverse('progress-list'), {'fields': 'video,last_viewed_position'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data[0], {'video': self.video.id, 'last_viewed_position': 10.5})
+
+
+class UserVideoProgressViewSetTestCase(APITestCase):
+    def setUp(self):
+        """Vorbereitungen für die Tests"""
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(
+            username="testuser", password="password123")
+        for index in range(10):
+            video = Video.objects.create(
+                title=f"Video {index}", description="Beschreibung", category="action", video_file="path/to/video.mp4")
+            UserVideoProgress.objects.create(
+                user=self.user, video=video, last_viewed_position=index)
+        self.view = UserVideoProgressViewSet.as_view({'get': 'list'})
+
+    def get(self, params=None):
+        request = self.factory.get('/progress/', params)
+        force_authenticate(request, user=self.user)
+        return self.view(request)
+
+    def test_list_sparse_fields(self):
+        """Test, dass über ?fields= nur die gewünschten Felder geliefert werden"""
+        response = self.get({'fields': 'id,viewed'})
+        self.assertEqual(set(response.data[0]), {'id', 'viewed'})
+
+
+class UserVideoProgressQueryCountTestCase(APITestCase):
+    def setUp(self):
+        """Vorbereitungen für die Tests"""
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="testuser", password="password123")
+        for index in range(10):
+            video = Video.objects.create(
+                title=f"Video {index}", description="Beschreibung", category="action", video_file="path/to/video.mp4")
+            self.progress = UserVideoProgress.objects.create(
+                user=self.user, video=video, last_viewed_position=index)
+        self.client.force_authenticate(user=self.user)
+
+    def test_list_constant_query_count(self):
+        """Test, dass die Liste unabhängig von der Anzahl der Einträge eine Abfrage braucht"""
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('progress-list'))
+        self.assertEqual(len(response.data), 10)
+
+    def test_detail_query_count(self):
+        """Test, dass Abruf und Änderung eines Eintrags den Benutzer nicht nachladen"""
+        url = reverse('progress-detail', kwargs={'pk': self.progress.pk})
+        with self.assertNumQueries(1):
+            self.client.get(url)
+        with self.assertNumQueries(2):
+            response = self.client.patch(url, {"last_viewed_position": 42.0}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
 
 class UserVideoProgressDetailViewTestCase(APITestCase):
     def setUp(self):
@@ -208,3 +376,456 @@ class UserVideoProgressDetailViewTestCase(APITestCase):
         response = self.client.get(
             reverse('progress-detail', kwargs={'pk': self.progress.pk}))
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class UploadSessionViewTestCase(APITestCase):
+    def setUp(self):
+        """Vorbereitungen für die Tests"""
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        self.upload_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.upload_dir)
+        override = override_settings(MEDIA_ROOT=self.media_root, UPLOAD_TEMP_DIR=self.upload_dir)
+        override.enable()
+        self.addCleanup(override.disable)
+        get_queue = mock.patch('video_app.api.views.get_video_queue')
+        self.queue = get_queue.start().return_value
+        self.addCleanup(get_queue.stop)
+
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="testuser", password="password123")
+        self.client.force_authenticate(user=self.user)
+        self.content = b"0123456789" * 10
+        response = self.client.post(reverse('upload-list'), {
+            "title": "Upload Video",
+            "description": "Beschreibung",
+            "category": "action",
+            "filename": "upload.mp4",
+            "size": len(self.content),
+            "checksum": hashlib.sha256(self.content).hexdigest(),
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.session_id = response.data['id']
+        self.detail_url = reverse('upload-detail', kwargs={'pk': self.session_id})
+
+    def send_chunk(self, chunk, offset):
+        return self.client.generic(
+            'PATCH', self.detail_url, chunk,
+            content_type='application/offset+octet-stream',
+            HTTP_UPLOAD_OFFSET=str(offset))
+
+    def finalize(self):
+        return self.client.post(reverse('upload-finalize', kwargs={'pk': self.session_id}))
+
+    def run_finalize_job(self):
+        func, *args = self.queue.enqueue.call_args.args
+        return func(*args)
+
+    def test_upload_in_chunks(self):
+        """Test für das Hochladen in mehreren Teilen und das Abschließen"""
+        response = self.send_chunk(self.content[:40], 0)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(response['Upload-Offset'], '40')
+        response = self.send_chunk(self.content[40:], 40)
+        self.assertEqual(response['Upload-Offset'], '100')
+
+        response = self.finalize()
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['status'], 'verifying')
+        self.assertFalse(Video.objects.exists())
+        video_id = self.run_finalize_job()
+
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.data['status'], 'complete')
+        self.assertEqual(response.data['video'], video_id)
+        video = Video.objects.get(pk=video_id)
+        self.assertEqual(video.title, "Upload Video")
+        with open(video.video_file.path, 'rb') as f:
+            self.assertEqual(f.read(), self.content)
+        self.assertEqual(video.source_sha256, hashlib.sha256(self.content).hexdigest())
+        self.assertEqual(os.listdir(self.upload_dir), [])
+
+    def test_partial_upload_outside_media_root(self):
+        """Test, dass unvollständige Uploads nicht unter MEDIA_ROOT liegen"""
+        self.send_chunk(self.content[:40], 0)
+        self.assertEqual(os.listdir(self.upload_dir), [f"{self.session_id}.part"])
+        for _, _, files in os.walk(self.media_root):
+            self.assertEqual(files, [])
+
+    def test_finalize_once(self):
+        """Test, dass ein Upload nur einmal abgeschlossen wird"""
+        self.send_chunk(self.content, 0)
+        self.assertEqual(self.finalize().status_code, status.HTTP_202_ACCEPTED)
+        response = self.finalize()
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data['status'], 'verifying')
+        self.queue.enqueue.assert_called_once()
+        self.assertEqual(self.send_chunk(b"x", 100).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_resume_reports_offset(self):
+        """Test, dass der aktuelle Offset zum Fortsetzen abgefragt werden kann"""
+        self.send_chunk(self.content[:30], 0)
+        response = self.client.head(self.detail_url)
+        self.assertEqual(response['Upload-Offset'], '30')
+
+    def test_wrong_offset(self):
+        """Test für einen Teil mit falschem Offset"""
+        response = self.send_chunk(self.content[:10], 50)
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+    def test_chunk_too_large(self):
+        """Test für einen Teil, der die angekündigte Größe überschreitet"""
+        response = self.send_chunk(self.content + b"extra", 0)
+        self.assertEqual(response.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+    def test_invalid_content_length(self):
+        """Test für einen Teil mit ungültigem Content-Length-Header"""
+        response = self.client.generic(
+            'PATCH', self.detail_url, self.content[:10],
+            content_type='application/offset+octet-stream',
+            HTTP_UPLOAD_OFFSET='0', CONTENT_LENGTH='ten')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_idle_upload_expires(self):
+        """Test, dass liegengebliebene Uploads samt Teildatei entfernt werden"""
+        self.send_chunk(self.content[:40], 0)
+        self.assertEqual(expire_upload_sessions(), 0)
+        UploadSession.objects.filter(pk=self.session_id).update(
+            updated_at=timezone.now() - timedelta(seconds=settings.UPLOAD_SESSION_EXPIRY + 1))
+        self.assertEqual(expire_upload_sessions(), 1)
+        self.assertFalse(UploadSession.objects.exists())
+        self.assertEqual(os.listdir(self.upload_dir), [])
+
+    def test_verifying_upload_not_expired(self):
+        """Test, dass ein Upload während der Prüfung nicht entfernt wird"""
+        self.send_chunk(self.content, 0)
+        self.finalize()
+        UploadSession.objects.filter(pk=self.session_id).update(
+            updated_at=timezone.now() - timedelta(seconds=settings.UPLOAD_SESSION_EXPIRY + 1))
+        self.assertEqual(expire_upload_sessions(), 0)
+        self.assertEqual(os.listdir(self.upload_dir), [f"{self.session_id}.part"])
+        self.assertIsNotNone(self.run_finalize_job())
+
+    @override_settings(VIDEO_MAX_SIZE=50)
+    def test_size_limit(self):
+        """Test, dass keine Uploads über der maximalen Größe angelegt werden"""
+        response = self.client.post(reverse('upload-list'), {
+            "title": "Upload Video",
+            "description": "Beschreibung",
+            "category": "action",
+            "filename": "upload.mp4",
+            "size": len(self.content),
+            "checksum": hashlib.sha256(self.content).hexdigest(),
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('size', response.data)
+
+    def test_finalize_incomplete(self):
+        """Test für das Abschließen eines unvollständigen Uploads"""
+        self.send_chunk(self.content[:10], 0)
+        response = self.finalize()
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.queue.enqueue.assert_not_called()
+
+    def test_checksum_mismatch(self):
+        """Test für eine falsche Prüfsumme"""
+        self.send_chunk(b"x" * len(self.content), 0)
+        self.finalize()
+        self.assertIsNone(self.run_finalize_job())
+        self.assertFalse(Video.objects.exists())
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.data['status'], 'failed')
+        self.assertEqual(response.data['error'], "Checksum mismatch.")
+
+    def test_other_user_session(self):
+        """Test, dass fremde Upload-Sitzungen nicht sichtbar sind"""
+        other_user = User.objects.create_user(
+            username="otheruser", password="password123")
+        self.client.force_authenticate(user=other_user)
+        response = self.send_chunk(self.content[:10], 0)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class MediaStreamingViewTestCase(APITestCase):
+    def setUp(self):
+        """Vorbereitungen für die Tests"""
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        override = override_settings(
+            MEDIA_ROOT=self.media_root, MEDIA_ACCEL_REDIRECT_PREFIX='', MEDIA_X_SENDFILE=False)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.content = bytes(range(100))
+        with open(f"{self.media_root}/clip.mp4", 'wb') as f:
+            f.write(self.content)
+        self.url = reverse('media', kwargs={'path': 'clip.mp4'})
+
+    def read(self, response):
+        return b''.join(response.streaming_content)
+
+    def test_full_file(self):
+        """Test für das Ausliefern der ganzen Datei"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(response['Content-Type'], 'video/mp4')
+        self.assertIn('ETag', response)
+        self.assertEqual(self.read(response), self.content)
+
+    def test_byte_range(self):
+        """Test für eine Teilanfrage mit Start und Ende"""
+        response = self.client.get(self.url, HTTP_RANGE='bytes=10-19')
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(response['Content-Range'], 'bytes 10-19/100')
+        self.assertEqual(response['Content-Length'], '10')
+        self.assertEqual(self.read(response), self.content[10:20])
+
+    def test_open_and_suffix_ranges(self):
+        """Test für offene Bereiche und Bereiche vom Dateiende"""
+        response = self.client.get(self.url, HTTP_RANGE='bytes=90-')
+        self.assertEqual(self.read(response), self.content[90:])
+        response = self.client.get(self.url, HTTP_RANGE='bytes=-5')
+        self.assertEqual(response['Content-Range'], 'bytes 95-99/100')
+        self.assertEqual(self.read(response), self.content[95:])
+
+    def test_unsatisfiable_range(self):
+        """Test für einen Bereich außerhalb der Datei"""
+        response = self.client.get(self.url, HTTP_RANGE='bytes=200-300')
+        self.assertEqual(response.status_code, status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+        self.assertEqual(response['Content-Range'], 'bytes */100')
+
+    def test_if_range_mismatch(self):
+        """Test, dass bei geänderter Datei die ganze Datei gesendet wird"""
+        response = self.client.get(
+            self.url, HTTP_RANGE='bytes=10-19', HTTP_IF_RANGE='"outdated"')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.read(response), self.content)
+
+    def test_not_modified(self):
+        """Test für eine bedingte Anfrage mit passendem ETag"""
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_not_modified_etag_list(self):
+        """Test für bedingte Anfragen mit ETag-Liste, schwachem ETag und *"""
+        etag = self.client.get(self.url)['ETag']
+        for header in [f'"other", {etag}', f'W/{etag}', '*']:
+            with self.subTest(header=header):
+                response = self.client.get(self.url, HTTP_IF_NONE_MATCH=header)
+                self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH='"other", W/"outdated"')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_accel_redirect(self):
+        """Test für die Übergabe an den Proxy per X-Accel-Redirect"""
+        with override_settings(MEDIA_ACCEL_REDIRECT_PREFIX='/protected-media/'):
+            response = self.client.get(self.url)
+        self.assertEqual(response['X-Accel-Redirect'], '/protected-media/clip.mp4')
+        self.assertEqual(response.content, b'')
+
+    def test_path_traversal(self):
+        """Test, dass keine Dateien außerhalb von MEDIA_ROOT ausgeliefert werden"""
+        response = self.client.get(reverse('media', kwargs={'path': '../etc/passwd'}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ProgressHeartbeatViewTestCase(APITestCase):
+    def setUp(self):
+        """Vorbereitungen für die Tests"""
+        self.connection = get_redis_connection('default')
+        self.connection.delete(PROGRESS_BUFFER_KEY, PROGRESS_FLUSHING_KEY, PROGRESS_FLUSH_LOCK_KEY)
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="testuser", password="password123")
+        self.video = Video.objects.create(
+            title="Test Video", description="Beschreibung", category="action", video_file="path/to/video.mp4")
+        self.client.force_authenticate(user=self.user)
+
+    def send_heartbeat(self, position, viewed=None, video=None):
+        data = {"video": video or self.video.id, "last_viewed_position": position}
+        if viewed is not None:
+            data["viewed"] = viewed
+        return self.client.post(reverse('progress-heartbeat'), data, format='json')
+
+    def test_heartbeat_without_database(self):
+        """Test, dass ein Heartbeat keine Datenbankabfrage auslöst"""
+        with self.assertNumQueries(0):
+            response = self.send_heartbeat(12.5)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertFalse(UserVideoProgress.objects.exists())
+
+    def test_flush_creates_and_updates(self):
+        """Test für das gesammelte Schreiben der Fortschritte"""
+        self.send_heartbeat(5.0)
+        self.send_heartbeat(12.5)
+        self.assertEqual(flush_progress_buffer(), 1)
+        progress = UserVideoProgress.objects.get(user=self.user, video=self.video)
+        self.assertEqual(progress.last_viewed_position, 12.5)
+
+        self.send_heartbeat(30.0, viewed=True)
+        flush_progress_buffer()
+        progress.refresh_from_db()
+        self.assertEqual(progress.last_viewed_position, 30.0)
+        self.assertTrue(progress.viewed)
+        self.assertEqual(UserVideoProgress.objects.count(), 1)
+
+    def test_heartbeat_without_viewed_keeps_flag(self):
+        """Test, dass ein Heartbeat ohne viewed ein gesehenes Video nicht zurücksetzt"""
+        self.send_heartbeat(30.0, viewed=True)
+        self.send_heartbeat(31.0)
+        flush_progress_buffer()
+        progress = UserVideoProgress.objects.get(user=self.user, video=self.video)
+        self.assertTrue(progress.viewed)
+
+        self.send_heartbeat(2.0)
+        flush_progress_buffer()
+        progress.refresh_from_db()
+        self.assertEqual(progress.last_viewed_position, 2.0)
+        self.assertTrue(progress.viewed)
+
+        self.send_heartbeat(0.0, viewed=False)
+        flush_progress_buffer()
+        progress.refresh_from_db()
+        self.assertFalse(progress.viewed)
+
+    def test_heartbeat_time_recorded_on_arrival(self):
+        """Test, dass der Zeitpunkt des Heartbeats und nicht der des Flushs gespeichert wird"""
+        sent_at = timezone.now() - timedelta(minutes=5)
+        with mock.patch('video_app.progress.timezone.now', return_value=sent_at):
+            self.send_heartbeat(5.0)
+        flush_progress_buffer()
+        progress = UserVideoProgress.objects.get(user=self.user, video=self.video)
+        self.assertEqual(progress.last_viewed_at, sent_at)
+
+    def test_flush_query_count(self):
+        """Test, dass viele Fortschritte in konstant vielen Abfragen geschrieben werden"""
+        videos = [
+            Video.objects.create(
+                title=f"Video {index}", description="Beschreibung", category="action", video_file="path/to/video.mp4")
+            for index in range(5)
+        ]
+        for video in videos:
+            self.send_heartbeat(1.0, video=video.id)
+        with self.assertNumQueries(3):
+            self.assertEqual(flush_progress_buffer(), 5)
+
+    def test_flush_skips_unknown_video(self):
+        """Test, dass Fortschritte zu gelöschten Videos verworfen werden"""
+        self.send_heartbeat(5.0, video=9999)
+        self.assertEqual(flush_progress_buffer(), 0)
+        self.assertFalse(UserVideoProgress.objects.exists())
+
+    def test_concurrent_flush_skipped(self):
+        """Test, dass ein zweiter Flush den laufenden nicht stört"""
+        self.send_heartbeat(5.0)
+        with self.connection.lock(PROGRESS_FLUSH_LOCK_KEY, timeout=10):
+            self.assertEqual(flush_progress_buffer(), 0)
+        self.assertEqual(self.connection.hlen(PROGRESS_BUFFER_KEY), 1)
+        self.assertEqual(flush_progress_buffer(), 1)
+
+    def test_flush_empty_buffer(self):
+        """Test für einen leeren Puffer"""
+        self.assertEqual(flush_progress_buffer(), 0)
+
+    def test_heartbeat_unauthenticated(self):
+        """Test für einen Heartbeat ohne Authentifizierung"""
+        self.client.force_authenticate(user=None)
+        response = self.send_heartbeat(5.0)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class ContinueWatchingViewTestCase(APITestCase):
+    def setUp(self):
+        """Vorbereitungen für die Tests"""
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="testuser", password="password123")
+        invalidate_continue_watching(self.user.id)
+        self.started = Video.objects.create(
+            title="Angefangen", description="Beschreibung", category="action", video_file="path/to/video.mp4")
+        self.finished = Video.objects.create(
+            title="Fertig", description="Beschreibung", category="action", video_file="path/to/video.mp4")
+        UserVideoProgress.objects.create(
+            user=self.user, video=self.started, last_viewed_position=42.0)
+        UserVideoProgress.objects.create(
+            user=self.user, video=self.finished, last_viewed_position=90.0, viewed=True)
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('continue-watching')
+
+    def test_only_unfinished_videos(self):
+        """Test, dass nur angefangene Videos geliefert werden"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]['video']['title'], "Angefangen")
+        self.assertEqual(response.data[0]['last_viewed_position'], 42.0)
+
+    def test_single_query_then_cached(self):
+        """Test, dass die Liste mit einer Abfrage geladen und danach gecacht wird"""
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+
+    def test_invalidated_on_progress_change(self):
+        """Test, dass der Cache bei neuem Fortschritt verworfen wird"""
+        self.client.get(self.url)
+        UserVideoProgress.objects.filter(video=self.finished).delete()
+        UserVideoProgress.objects.create(
+            user=self.user, video=self.finished, last_viewed_position=10.0)
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.data), 2)
+
+    def test_invalidated_on_flush(self):
+        """Test, dass gesammelte Heartbeats den Cache verwerfen"""
+        get_redis_connection('default').delete(PROGRESS_BUFFER_KEY, PROGRESS_FLUSHING_KEY)
+        self.client.get(self.url)
+        self.client.post(reverse('progress-heartbeat'), {
+            "video": self.started.id, "last_viewed_position": 50.0, "viewed": False}, format='json')
+        flush_progress_buffer()
+        response = self.client.get(self.url)
+        self.assertEqual(response.data[0]['last_viewed_position'], 50.0)
+
+
+class VideoStatusViewTestCase(APITestCase):
+    def setUp(self):
+        """Vorbereitungen für die Tests"""
+        self.client = APIClient()
+        self.video = Video.objects.create(
+            title="Test Video", description="Beschreibung", category="action", video_file="path/to/video.mp4")
+        self.url = reverse('video-status', kwargs={'pk': self.video.pk})
+        get_redis_connection('default').delete(get_status_key(self.video.pk))
+
+    def test_stored_status(self):
+        """Test für den gespeicherten Status ohne laufende Verarbeitung"""
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], 'queued')
+        self.assertEqual(response.data['renditions'], {})
+
+    def test_live_rendition_progress(self):
+        """Test für den Fortschritt pro Auflösung während der Konvertierung"""
+        set_processing_status(self.video.pk, 'encoding', renditions=['120p', '360p'])
+        set_rendition_progress(self.video.pk, '120p', 42)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response.data['status'], 'encoding')
+        self.assertEqual(response.data['renditions'], {'120p': 42, '360p': 0})
+
+    def test_failed_status(self):
+        """Test für die Fehlermeldung einer fehlgeschlagenen Verarbeitung"""
+        set_processing_status(self.video.pk, 'failed', error="ffmpeg exited with 1")
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['status'], 'failed')
+        self.assertEqual(response.data['error'], "ffmpeg exited with 1")
+        self.video.refresh_from_db()
+        self.assertEqual(self.video.processing_status, 'failed')
+
+    def test_unknown_video(self):
+        """Test für den Status eines nicht vorhandenen Videos"""
+        response = self.client.get(reverse('video-status', kwargs={'pk': 9999}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,34 @@
+import hashlib
+from django.core.files.uploadhandler import MemoryFileUploadHandler, TemporaryFileUploadHandler
+
+
+class SHA256UploadHandlerMixin:
+    """
+    Hash uploaded files while they are streamed in and expose the hex digest
+    as ``file.sha256``, so the source never has to be read a second time.
+    """
+
+    def new_file(self, *args, **kwargs):
+        self.sha256 = hashlib.sha256()
+        return super().new_file(*args, **kwargs)
+
+    def receive_data_chunk(self, raw_data, start):
+        # An inactive memory handler only passes the chunk on to the next
+        # handler, which hashes it itself.
+        if getattr(self, 'activated', True):
+            self.sha256.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        file = super().file_complete(file_size)
+        if file is not None:
+            file.sha256 = self.sha256.hexdigest()
+        return file
+
+
+class SHA256MemoryFileUploadHandler(SHA256UploadHandlerMixin, MemoryFileUploadHandler):
+    pass
+
+
+class SHA256TemporaryFileUploadHandler(SHA256UploadHandlerMixin, TemporaryFileUploadHandler):
+    pass
@@ -205,27 +205,152 @@ RQ = {
     }
 }
 
+RQ_QUEUE_CONNECTION = {
+    'HOST': os.getenv('LOCAL_HOST', 'localhost'),
+    'PORT': int(os.getenv('REDIS_PORT', 6379)),
+    'DB': int(os.getenv('REDIS_DB', 0)),
+    'PASSWORD': os.getenv('RQ_PASSWORD', None),
+    'USERNAME': os.getenv('REDIS_USERNAME', 'default'),
+    'DEFAULT_TIMEOUT': int(os.getenv('RQ_DEFAULT_TIMEOUT', 360)),
+    'SSL': os.getenv('REDIS_USE_SSL', 'False').lower() == 'true',
+}
+# Workers should listen on 'high mail default low' so previews are never
+# stuck behind full-resolution encodes.
 RQ_QUEUES = {
-    'default': {
-        'HOST': os.getenv('LOCAL_HOST', 'localhost'),
-        'PORT': int(os.getenv('REDIS_PORT', 6379)),
-        'DB': int(os.getenv('REDIS_DB', 0)),
-        'PASSWORD': os.getenv('RQ_PASSWORD', None),
-        'USERNAME': os.getenv('REDIS_USERNAME', 'default'),
-        'DEFAULT_TIMEOUT': int(os.getenv('RQ_DEFAULT_TIMEOUT', 360)),
-        'SSL': os.getenv('REDIS_USE_SSL', 'False').lower() == 'true',
-    }
+    'high': {**RQ_QUEUE_CONNECTION},
+    'default': {**RQ_QUEUE_CONNECTION},
+    'low': {**RQ_QUEUE_CONNECTION},
+    'mail': {**RQ_QUEUE_CONNECTION},
 }
 
+# Transactional mail is sent by the 'mail' workers, see user_auth_app/tasks.py.
+# Retries wait MAIL_RETRY_INTERVALS seconds, which needs a worker started
+# with --with-scheduler.
+MAIL_BATCH_SIZE = int(os.getenv('MAIL_BATCH_SIZE', 50))
+MAIL_RETRY_INTERVALS = [
+    int(seconds) for seconds in os.getenv('MAIL_RETRY_INTERVALS', '10,60,300').split(',') if seconds]
+
+API_PAGE_SIZE = int(os.getenv('API_PAGE_SIZE', 10))
+API_MAX_PAGE_SIZE = int(os.getenv('API_MAX_PAGE_SIZE', 100))
+
 REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework.authentication.TokenAuthentication',
+        'user_auth_app.api.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ),
+    # Sliding window limits of the auth endpoints, keyed
+    # '<throttle_scope>_ip' and '<throttle_scope>_email', see
+    # user_auth_app/api/throttling.py.
+    'DEFAULT_THROTTLE_RATES': {
+        'login_ip': os.getenv('THROTTLE_LOGIN_IP', '20/min'),
+        'login_email': os.getenv('THROTTLE_LOGIN_EMAIL', '5/min'),
+        'registration_ip': os.getenv('THROTTLE_REGISTRATION_IP', '10/hour'),
+        'password_reset_ip': os.getenv('THROTTLE_PASSWORD_RESET_IP', '10/hour'),
+        'password_reset_email': os.getenv('THROTTLE_PASSWORD_RESET_EMAIL', '3/hour'),
+    },
+    # Reverse proxies in front of the app (e.g. 1 behind nginx). The client IP
+    # of the IP throttles is taken that many entries from the end of
+    # X-Forwarded-For; with 0 the header is ignored, so clients cannot pick
+    # their own throttle bucket.
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', 0)),
 }
+# Seconds a resolved API token stays cached, and how long a token is valid
+# after login (0 = until logout).
+AUTH_TOKEN_CACHE_TIMEOUT = int(os.getenv('AUTH_TOKEN_CACHE_TIMEOUT', 300))
+AUTH_TOKEN_LIFETIME = int(os.getenv('AUTH_TOKEN_LIFETIME', 0))
 
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 MEDIA_URL = '/media/'
+# Partial resumable uploads, outside MEDIA_ROOT so they are never served.
+UPLOAD_TEMP_DIR = os.getenv('UPLOAD_TEMP_DIR') or os.path.join(BASE_DIR, 'uploads')
+# Largest source file a resumable upload may announce, in bytes.
+VIDEO_MAX_SIZE = int(os.getenv('VIDEO_MAX_SIZE', 100 * 1024 * 1024))
+# Seconds after the last chunk until an unfinished upload and its partial
+# file are removed by the expire_uploads command.
+UPLOAD_SESSION_EXPIRY = int(os.getenv('UPLOAD_SESSION_EXPIRY', 24 * 3600))
+# Hash uploads while they stream in, used to detect re-uploaded sources.
+FILE_UPLOAD_HANDLERS = [
+    'video_app.uploadhandlers.SHA256MemoryFileUploadHandler',
+    'video_app.uploadhandlers.SHA256TemporaryFileUploadHandler',
+]
+# Absolute base URL of a CDN in front of MEDIA_ROOT, used for media URLs in API responses.
+MEDIA_CDN_URL = os.getenv('MEDIA_CDN_URL', '')
+# Let the front proxy send media files: nginx internal location prefix for
+# X-Accel-Redirect (e.g. '/protected-media/'), or X-Sendfile for Apache/lighttpd.
+MEDIA_ACCEL_REDIRECT_PREFIX = os.getenv('MEDIA_ACCEL_REDIRECT_PREFIX', '')
+MEDIA_X_SENDFILE = os.getenv('MEDIA_X_SENDFILE', 'False').lower() == 'true'
+
+PROGRESS_FLUSH_INTERVAL = float(os.getenv('PROGRESS_FLUSH_INTERVAL', 5))
+# Threads per ASGI process for the Redis calls of the async /stream/ views.
+STREAM_REDIS_THREADS = int(os.getenv('STREAM_REDIS_THREADS', 16))
+
+VIDEO_HLS_SEGMENT_SECONDS = int(os.getenv('VIDEO_HLS_SEGMENT_SECONDS', 6))
+VIDEO_DASH_ENABLED = os.getenv('VIDEO_DASH_ENABLED', 'False').lower() == 'true'
+THUMBNAIL_SEEK_SECONDS = float(os.getenv('THUMBNAIL_SEEK_SECONDS', 5))
+THUMBNAIL_SEARCH_SECONDS = float(os.getenv('THUMBNAIL_SEARCH_SECONDS', 10))
+TRICKPLAY_INTERVAL_SECONDS = int(os.getenv('TRICKPLAY_INTERVAL_SECONDS', 10))
+TRICKPLAY_TILE_WIDTH = int(os.getenv('TRICKPLAY_TILE_WIDTH', 160))
+VIDEO_TRANSCODE_FANOUT = os.getenv('VIDEO_TRANSCODE_FANOUT', 'True').lower() == 'true'
+# Every fanned out rendition job decodes the source again. Grouping
+# renditions into one job decodes the source fewer times at the cost of
+# spreading them over fewer workers.
+VIDEO_RENDITIONS_PER_JOB = int(os.getenv('VIDEO_RENDITIONS_PER_JOB', 1))
+VIDEO_JOB_TIMEOUT = int(os.getenv('VIDEO_JOB_TIMEOUT', 3600))
+# Upper bound for a whole pipeline run; a crashed run blocks reprocessing
+# of its video for at most this long.
+VIDEO_LOCK_TIMEOUT = int(os.getenv('VIDEO_LOCK_TIMEOUT', 6 * 3600))
+# Which RQ_QUEUES entry each pipeline stage runs on. 'preview' covers the
+# thumbnail and the lowest rendition that make a new upload playable.
+# 'process' only probes and dispatches; without fan-out the whole pipeline
+# runs in one job on 'serial'.
+VIDEO_QUEUE_ROUTING = {
+    'process': os.getenv('VIDEO_PREVIEW_QUEUE', 'high'),
+    'serial': os.getenv('VIDEO_ENCODE_QUEUE', 'low'),
+    'upload': os.getenv('VIDEO_PREVIEW_QUEUE', 'high'),
+    'preview': os.getenv('VIDEO_PREVIEW_QUEUE', 'high'),
+    'rendition': os.getenv('VIDEO_ENCODE_QUEUE', 'low'),
+    'trickplay': os.getenv('VIDEO_ENCODE_QUEUE', 'low'),
+    'secondary': os.getenv('VIDEO_ENCODE_QUEUE', 'low'),
+    'finalize': os.getenv('VIDEO_ENCODE_QUEUE', 'low'),
+}
+# Encoder profiles, see video_app/profiles.py for all keys and their defaults.
+# Limit threads per job when several workers share one machine.
+VIDEO_ENCODER_PROFILE = os.getenv('VIDEO_ENCODER_PROFILE', 'h264')
+VIDEO_ENCODER_PROFILES = {
+    'h264': {
+        'codec': 'libx264',
+        'preset': os.getenv('VIDEO_H264_PRESET', 'medium'),
+        'crf': int(os.getenv('VIDEO_H264_CRF', 23)),
+        'gop_seconds': int(os.getenv('VIDEO_GOP_SECONDS', 2)),
+        'threads': int(os.getenv('VIDEO_ENCODER_THREADS', 0)),
+        'filter_threads': int(os.getenv('VIDEO_FILTER_THREADS', 0)),
+        'extra_args': ['-sc_threshold', '0'],
+    },
+    'hevc': {
+        'codec': 'libx265',
+        'preset': os.getenv('VIDEO_HEVC_PRESET', 'medium'),
+        'crf': int(os.getenv('VIDEO_HEVC_CRF', 28)),
+        'maxrate_factor': 0.7,
+        'bufsize_factor': 1.4,
+        'gop_seconds': int(os.getenv('VIDEO_GOP_SECONDS', 2)),
+        'threads': int(os.getenv('VIDEO_ENCODER_THREADS', 0)),
+        'filter_threads': int(os.getenv('VIDEO_FILTER_THREADS', 0)),
+        'extra_args': ['-tag:v', 'hvc1', '-x265-params', 'log-level=error'],
+    },
+    'av1': {
+        'codec': 'libsvtav1',
+        'preset': int(os.getenv('VIDEO_AV1_PRESET', 8)),
+        'crf': int(os.getenv('VIDEO_AV1_CRF', 35)),
+        # SVT-AV1 has no VBV cap in CRF mode.
+        'maxrate_factor': None,
+        'gop_seconds': int(os.getenv('VIDEO_GOP_SECONDS', 2)),
+        'threads': int(os.getenv('VIDEO_ENCODER_THREADS', 0)),
+        'filter_threads': int(os.getenv('VIDEO_FILTER_THREADS', 0)),
+    },
+}
+# Extra renditions next to H.264, e.g. 'hevc,av1'. Names are encoder profiles.
+VIDEO_SECONDARY_CODECS = [
+    codec for codec in os.getenv('VIDEO_SECONDARY_CODECS', '').split(',') if codec]